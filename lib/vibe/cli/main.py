@@ -1113,7 +1113,8 @@ def retrofit(
 
     # Step 3: Show analysis summary
     click.echo()
-    click.echo(analyzer.generate_summary(plan))
+    # Through click.echo so the status markers survive a non-UTF-8 terminal
+    analyzer.stream_summary(plan, lambda text: click.echo(text, nl=False))
 
     if analyze_only:
         click.echo(
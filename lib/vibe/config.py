@@ -72,7 +72,8 @@ def load_config(base_path: Path | None = None) -> dict[str, Any]:
     if not config_file.exists():
         return copy.deepcopy(DEFAULT_CONFIG)
 
-    with open(config_file) as f:
+    # Binary read: config is written as UTF-8 JSON, whatever the locale encoding
+    with open(config_file, "rb") as f:
         config: dict[str, Any] = json.load(f)
 
     # Auto-migrate if needed
@@ -2,9 +2,21 @@
 
 import re
 import subprocess
+from typing import Any
 
 from lib.vibe.config import load_config
 
+# Maps every ASCII non-alphanumeric character to "-" (titles are lowercased first)
+_TITLE_TRANSLATION = str.maketrans({chr(c): "-" for c in range(128) if not chr(c).isalnum()})
+_DASH_RUN_RE = re.compile(r"-+")
+_NON_ALNUM_RUN_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+
+def _branching() -> dict[str, Any]:
+    """Return the ``branching`` section of the current config."""
+    branching: dict[str, Any] = load_config().get("branching", {})
+    return branching
+
 
 def format_branch_name(ticket_id: str, title: str | None = None) -> str:
     """
@@ -17,8 +29,7 @@ def format_branch_name(ticket_id: str, title: str | None = None) -> str:
     Returns:
         Formatted branch name
     """
-    config = load_config()
-    pattern: str = config.get("branching", {}).get("pattern", "{PROJ}-{num}")
+    pattern: str = _branching().get("pattern", "{PROJ}-{num}")
 
     # Extract project prefix and number from ticket_id
     match = re.match(r"([A-Z]+)-(\d+)", ticket_id)
@@ -31,8 +42,13 @@ def format_branch_name(ticket_id: str, title: str | None = None) -> str:
 
     # Optionally append sanitized title
     if title:
-        # Sanitize title for branch name
-        sanitized = re.sub(r"[^a-zA-Z0-9]+", "-", title.lower())
+        # Sanitize title for branch name; str.translate handles the common
+        # ASCII case in C, non-ASCII titles fall back to the regex.
+        lowered = title.lower()
+        if lowered.isascii():
+            sanitized = _DASH_RUN_RE.sub("-", lowered.translate(_TITLE_TRANSLATION))
+        else:
+            sanitized = _NON_ALNUM_RUN_RE.sub("-", lowered)
         sanitized = sanitized.strip("-")[:30]  # Limit length
         branch_name = f"{branch_name}-{sanitized}"
 
@@ -53,8 +69,7 @@ def current_branch() -> str:
 
 def get_main_branch() -> str:
     """Get the main branch name from config."""
-    config = load_config()
-    main: str = config.get("branching", {}).get("main_branch", "main")
+    main: str = _branching().get("main_branch", "main")
     return main
 
 
@@ -76,7 +91,8 @@ def create_branch(branch_name: str, base_branch: str | None = None) -> bool:
         subprocess.run(
             ["git", "checkout", "-b", branch_name, base_branch],
             check=True,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         return True
     except subprocess.CalledProcessError:
@@ -99,7 +115,8 @@ def delete_branch(branch_name: str, force: bool = False) -> bool:
         subprocess.run(
             ["git", "branch", flag, branch_name],
             check=True,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         return True
     except subprocess.CalledProcessError:
@@ -113,8 +130,7 @@ def rebase_onto_main() -> tuple[bool, str]:
     Returns:
         Tuple of (success, message)
     """
-    config = load_config()
-    if not config.get("branching", {}).get("always_rebase", True):
+    if not _branching().get("always_rebase", True):
         return True, "Rebasing disabled in config"
 
     main_branch = get_main_branch()
@@ -123,25 +139,32 @@ def rebase_onto_main() -> tuple[bool, str]:
     if current == main_branch:
         return True, f"Already on {main_branch}"
 
+    # Only stderr is read (for the failure message); discard stdout.
     try:
         # Fetch latest main
         subprocess.run(
             ["git", "fetch", "origin", main_branch],
             check=True,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
 
         # Rebase onto main
         subprocess.run(
             ["git", "rebase", f"origin/{main_branch}"],
             check=True,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
 
         return True, f"Successfully rebased onto {main_branch}"
     except subprocess.CalledProcessError as e:
         # Check if rebase is in progress
-        subprocess.run(["git", "rebase", "--abort"], capture_output=True)
+        subprocess.run(
+            ["git", "rebase", "--abort"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
         return False, f"Rebase failed: {e.stderr.decode() if e.stderr else 'Unknown error'}"
 
 
@@ -152,8 +175,7 @@ def validate_branch_naming(branch_name: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_valid, message)
     """
-    config = load_config()
-    pattern = config.get("branching", {}).get("pattern", "{PROJ}-{num}")
+    pattern = _branching().get("pattern", "{PROJ}-{num}")
 
     # Convert pattern to regex
     regex_pattern = pattern.replace("{PROJ}", r"[A-Z]+").replace("{num}", r"\d+")
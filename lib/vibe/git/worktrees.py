@@ -1,11 +1,23 @@
 """Git worktree management."""
 
+import functools
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
-from lib.vibe.config import load_config
-from lib.vibe.state import add_worktree, load_state, remove_worktree
+from lib.vibe.config import get_config_path, load_config
+from lib.vibe.state import add_worktree, load_state, remove_worktree, remove_worktrees
+
+__all__ = [
+    "Worktree",
+    "get_primary_repo_root",
+    "get_worktree_base_path",
+    "create_worktree",
+    "cleanup_worktree",
+    "list_worktrees",
+    "cleanup_stale_worktrees",
+]
 
 
 @dataclass
@@ -24,13 +36,21 @@ def get_primary_repo_root() -> Path:
 
     This ensures worktree base paths use a consistent repo name (e.g. vibe-code-boilerplate)
     instead of the current worktree directory name (e.g. 21).
+
+    The result is cached per working directory for the lifetime of the process.
     """
+    return _primary_repo_root(Path.cwd())
+
+
+@functools.lru_cache(maxsize=1)
+def _primary_repo_root(cwd: Path) -> Path:
+    """Resolve the primary repository root for *cwd* (cached)."""
     result = subprocess.run(
         ["git", "rev-parse", "--git-dir"],
         capture_output=True,
         text=True,
         check=True,
-        cwd=Path.cwd(),
+        cwd=cwd,
     )
     git_dir = Path(result.stdout.strip()).resolve()
     if "worktrees" in str(git_dir):
@@ -41,8 +61,30 @@ def get_primary_repo_root() -> Path:
 
 
 def get_worktree_base_path() -> Path:
-    """Get the base path for worktrees from config."""
-    config = load_config()
+    """
+    Get the base path for worktrees from config.
+
+    Cached per working directory and version of .vibe/config.json, so a
+    chdir or an edit to ``worktrees.base_path`` is picked up.
+    """
+    cwd = Path.cwd()
+    try:
+        st = os.stat(get_config_path(cwd))
+        config_stamp: tuple[int, int, int, int] | None = (
+            st.st_dev,
+            st.st_ino,
+            st.st_mtime_ns,
+            st.st_size,
+        )
+    except OSError:
+        config_stamp = None
+    return _worktree_base_path(cwd, config_stamp)
+
+
+@functools.lru_cache(maxsize=1)
+def _worktree_base_path(cwd: Path, config_stamp: tuple[int, int, int, int] | None) -> Path:
+    """Resolve the worktree base path for *cwd* (cached; the stamp only keys the cache)."""
+    config = load_config(cwd)
     base_path: str = config.get("worktrees", {}).get("base_path", "../{repo}-worktrees")
 
     # Use primary repo name so path is correct when running from a worktree
@@ -54,6 +96,31 @@ def get_worktree_base_path() -> Path:
     return (repo_root / base_path_str).resolve()
 
 
+def _reset_caches() -> None:
+    """Clear the cached repo root and worktree base path (used by tests)."""
+    _primary_repo_root.cache_clear()
+    _worktree_base_path.cache_clear()
+
+
+def _rev_parse_many(repo_root: Path, *revs: str) -> list[str | None]:
+    """
+    Resolve several revisions to commit hashes with a single git process.
+
+    Returns one entry per revision, None for revisions that don't exist.
+    """
+    result = subprocess.run(
+        ["git", "cat-file", "--batch-check=%(objectname)"],
+        input="".join(f"{rev}^{{commit}}\n" for rev in revs),
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=repo_root,
+    )
+    # Unresolvable revisions come back as "<rev> missing" / "<rev> ambiguous"
+    lines = result.stdout.splitlines()
+    return [lines[i] if i < len(lines) and " " not in lines[i] else None for i in range(len(revs))]
+
+
 def create_worktree(branch_name: str, base_branch: str = "main") -> Worktree:
     """
     Create a new git worktree for the given branch.
@@ -72,35 +139,23 @@ def create_worktree(branch_name: str, base_branch: str = "main") -> Worktree:
     # Ensure base directory exists
     worktree_base.mkdir(parents=True, exist_ok=True)
 
-    # All git commands run from primary repo root for consistent behavior
-    def git(*args: str, check: bool = True) -> subprocess.CompletedProcess:
-        return subprocess.run(
-            ["git"] + list(args),
-            capture_output=True,
-            text=True,
-            check=check,
-            cwd=repo_root,
-        )
-
-    # Check if branch exists
-    result = git("rev-parse", "--verify", f"refs/heads/{branch_name}", check=False)
-    branch_exists = result.returncode == 0
+    # Resolve the branch and the base ref in one git process. An existing
+    # branch is checked out as-is; a new one starts at base_branch, so the
+    # worktree's HEAD commit is known before it is created.
+    branch_commit, base_commit = _rev_parse_many(
+        repo_root, f"refs/heads/{branch_name}", base_branch
+    )
 
-    if branch_exists:
+    # All git commands run from primary repo root for consistent behavior
+    if branch_commit is not None:
         # Checkout existing branch
-        git("worktree", "add", str(worktree_path), branch_name)
+        cmd = ["git", "worktree", "add", str(worktree_path), branch_name]
     else:
         # Create new branch from base (e.g. origin/main for latest)
-        git("worktree", "add", "-b", branch_name, str(worktree_path), base_branch)
+        cmd = ["git", "worktree", "add", "-b", branch_name, str(worktree_path), base_branch]
+    subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=repo_root)
 
-    # Get commit hash
-    result = subprocess.run(
-        ["git", "-C", str(worktree_path), "rev-parse", "HEAD"],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    commit = result.stdout.strip()
+    commit = branch_commit or base_commit or ""
 
     # Track in primary repo's state so main checkout sees it
     add_worktree(str(worktree_path), base_path=repo_root)
@@ -129,7 +184,7 @@ def cleanup_worktree(worktree_path: str, force: bool = False) -> bool:
         cmd.append("--force")
 
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         remove_worktree(worktree_path)
         return True
     except subprocess.CalledProcessError:
@@ -138,45 +193,46 @@ def cleanup_worktree(worktree_path: str, force: bool = False) -> bool:
 
 def list_worktrees() -> list[Worktree]:
     """List all git worktrees."""
-    result = subprocess.run(
-        ["git", "worktree", "list", "--porcelain"],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
+    # -z terminates every field with NUL and every record with an extra NUL,
+    # so records and fields can be split directly on the raw bytes. It needs
+    # git >= 2.36; older git rejects it, so fall back to newline porcelain.
+    try:
+        result = subprocess.run(
+            ["git", "worktree", "list", "--porcelain", "-z"],
+            capture_output=True,
+            check=True,
+        )
+        separator = b"\0"
+    except subprocess.CalledProcessError:
+        result = subprocess.run(
+            ["git", "worktree", "list", "--porcelain"],
+            capture_output=True,
+            check=True,
+        )
+        separator = b"\n"
 
     worktrees = []
-    current: dict[str, str] = {}
-
-    for line in result.stdout.strip().split("\n"):
-        if not line:
-            if current:
-                worktrees.append(
-                    Worktree(
-                        path=current.get("worktree", ""),
-                        branch=current.get("branch", "").replace("refs/heads/", ""),
-                        commit=current.get("HEAD", ""),
-                        is_main="bare" in current,
-                    )
-                )
-                current = {}
-        elif line.startswith("worktree "):
-            current["worktree"] = line[9:]
-        elif line.startswith("HEAD "):
-            current["HEAD"] = line[5:]
-        elif line.startswith("branch "):
-            current["branch"] = line[7:]
-        elif line == "bare":
-            current["bare"] = "true"
-
-    # Don't forget the last one
-    if current:
+    for record in result.stdout.split(separator * 2):
+        if not record.strip(separator):
+            continue
+        path = head = branch = b""
+        is_bare = False
+        for field in record.split(separator):
+            key, _, value = field.partition(b" ")
+            if key == b"worktree":
+                path = value
+            elif key == b"HEAD":
+                head = value
+            elif key == b"branch":
+                branch = value
+            elif key == b"bare":
+                is_bare = True
         worktrees.append(
             Worktree(
-                path=current.get("worktree", ""),
-                branch=current.get("branch", "").replace("refs/heads/", ""),
-                commit=current.get("HEAD", ""),
-                is_main="bare" in current,
+                path=path.decode(),
+                branch=branch.decode().replace("refs/heads/", ""),
+                commit=head.decode(),
+                is_main=is_bare,
             )
         )
 
@@ -192,11 +248,31 @@ def cleanup_stale_worktrees() -> list[str]:
     """
     state = load_state()
     active = state.get("active_worktrees", [])
-    cleaned = []
+    cleaned: list[str] = []
+    if not active:
+        return cleaned
+
+    # Worktrees normally live directly under the base path, so one directory
+    # read answers existence for all of them instead of a stat per entry.
+    base: Path | None
+    present: set[str] = set()
+    try:
+        base = get_worktree_base_path()
+        with os.scandir(base) as entries:
+            present = {entry.name for entry in entries}
+    except (subprocess.CalledProcessError, OSError):
+        base = None
 
     for worktree_path in active:
-        if not Path(worktree_path).exists():
-            remove_worktree(worktree_path)
+        path = Path(worktree_path)
+        if base is not None and path.parent == base:
+            exists = path.name in present
+        else:
+            exists = path.exists()
+        if not exists:
             cleaned.append(worktree_path)
 
+    # One state write for all stale entries
+    if cleaned:
+        remove_worktrees(cleaned)
     return cleaned
@@ -1,9 +1,17 @@
 """GitHub Actions initialization utilities."""
 
+import os
 import shutil
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
+from urllib.parse import quote, urlparse
+
+import requests
+
+from lib.vibe.utils.fast_json import loads
+
+GITHUB_API_URL = "https://api.github.com"
 
 
 @dataclass
@@ -53,19 +61,26 @@ REQUIRED_LABELS = [
     ("HUMAN", "b60205", "Requires human decision or action"),
 ]
 
+_GH_LABEL_ARGV_PREFIX = ("gh", "label", "create")
 
-def get_boilerplate_workflows_dir() -> Path | None:
-    """Get the path to boilerplate workflows directory."""
-    # Try to find workflows relative to this file
-    current_file = Path(__file__)
-    boilerplate_root = current_file.parent.parent.parent
-    workflows_dir = boilerplate_root / ".github" / "workflows"
 
+def _find_boilerplate_workflows_dir() -> Path | None:
+    """Locate the boilerplate workflows directory relative to this file."""
+    workflows_dir = Path(__file__).resolve().parent.parent.parent / ".github" / "workflows"
     if workflows_dir.exists():
         return workflows_dir
     return None
 
 
+# Resolved once at import; the boilerplate checkout doesn't move mid-process
+_BOILERPLATE_WORKFLOWS_DIR = _find_boilerplate_workflows_dir()
+
+
+def get_boilerplate_workflows_dir() -> Path | None:
+    """Get the path to boilerplate workflows directory."""
+    return _BOILERPLATE_WORKFLOWS_DIR
+
+
 def copy_workflows(
     target_dir: Path,
     workflows: list[str] | None = None,
@@ -90,17 +105,25 @@ def copy_workflows(
     copied = []
     errors = []
 
-    target_dir.mkdir(parents=True, exist_ok=True)
+    # One directory read per side instead of two stats per workflow
+    with os.scandir(source_dir) as entries:
+        source_present = {entry.name for entry in entries}
+    try:
+        with os.scandir(target_dir) as entries:
+            target_present = {entry.name for entry in entries}
+    except FileNotFoundError:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target_present = set()
 
     for workflow in workflows:
         source_file = source_dir / workflow
         target_file = target_dir / workflow
 
-        if not source_file.exists():
+        if workflow not in source_present:
             errors.append(f"Workflow not found: {workflow}")
             continue
 
-        if target_file.exists():
+        if workflow in target_present:
             # Skip if already exists (don't overwrite)
             continue
 
@@ -108,7 +131,8 @@ def copy_workflows(
             copied.append(workflow)
         else:
             try:
-                shutil.copy2(source_file, target_file)
+                # Content only: workflow YAML doesn't need copied metadata
+                shutil.copyfile(source_file, target_file)
                 copied.append(workflow)
             except OSError as e:
                 errors.append(f"Failed to copy {workflow}: {e}")
@@ -134,28 +158,144 @@ def set_github_secret(name: str, value: str, dry_run: bool = False) -> bool:
         return False
 
 
-def create_github_label(name: str, color: str, description: str, dry_run: bool = False) -> bool:
-    """Create a GitHub label using gh CLI."""
-    if dry_run:
-        return True
+@dataclass
+class GitHubAPI:
+    """An authenticated GitHub REST session for one repository."""
+
+    session: requests.Session
+    repo: str  # "owner/repo"
+    host: str = "github.com"
+
+    @property
+    def api_url(self) -> str:
+        """REST root for the host: api.github.com, or /api/v3 on GitHub Enterprise."""
+        if self.host == "github.com":
+            return GITHUB_API_URL
+        return f"https://{self.host}/api/v3"
+
+    def close(self) -> None:
+        self.session.close()
+
 
+def github_api_session(cwd: Path | None = None) -> GitHubAPI | None:
+    """
+    Build an authenticated GitHub REST session for the repository at cwd.
+
+    Reuses the gh CLI's credentials (``gh auth token``) so one keep-alive
+    HTTPS connection can serve many requests instead of one ``gh`` process
+    each. The API host comes from the repository's URL, so GitHub
+    Enterprise repositories talk to their own server. Returns None if gh
+    can't provide the repository or a token.
+    """
     try:
-        result = subprocess.run(
-            [
-                "gh",
-                "label",
-                "create",
-                name,
-                "--color",
-                color,
-                "--description",
-                description,
-                "--force",  # Update if exists
-            ],
+        repo = subprocess.run(
+            ["gh", "repo", "view", "--json", "nameWithOwner,url"],
             capture_output=True,
             text=True,
             timeout=30,
+            cwd=cwd,
         )
+        if repo.returncode != 0:
+            return None
+        info = loads(repo.stdout)
+        name_with_owner = info.get("nameWithOwner", "")
+        host = urlparse(info.get("url", "")).hostname or "github.com"
+        token = subprocess.run(
+            ["gh", "auth", "token", "--hostname", host],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, ValueError, AttributeError):
+        return None
+
+    if token.returncode != 0 or not token.stdout.strip() or not name_with_owner:
+        return None
+
+    session = requests.Session()
+    session.headers.update(
+        {
+            "Authorization": f"Bearer {token.stdout.strip()}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+    )
+    return GitHubAPI(session, name_with_owner, host)
+
+
+def fetch_label_names(api: GitHubAPI) -> set[str]:
+    """Get the lower-cased names of the repository's existing labels."""
+    names: set[str] = set()
+    url: str | None = f"{api.api_url}/repos/{api.repo}/labels?per_page=100"
+    try:
+        while url:
+            response = api.session.get(url, timeout=30)
+            if not response.ok:
+                break
+            names.update(label["name"].lower() for label in response.json())
+            url = response.links.get("next", {}).get("url")
+    except (requests.RequestException, ValueError):
+        pass
+    return names
+
+
+def _upsert_label(api: GitHubAPI, name: str, color: str, description: str) -> bool:
+    """Create a label via the REST API, updating it if it already exists."""
+    labels_url = f"{api.api_url}/repos/{api.repo}/labels"
+    try:
+        response = api.session.post(
+            labels_url,
+            json={"name": name, "color": color, "description": description},
+            timeout=30,
+        )
+        if response.status_code == 422:
+            # Already exists: match `gh label create --force` and update it
+            response = api.session.patch(
+                f"{labels_url}/{quote(name, safe='')}",
+                json={"color": color, "description": description},
+                timeout=30,
+            )
+        return response.ok
+    except requests.RequestException:
+        return False
+
+
+def create_github_label(
+    name: str,
+    color: str,
+    description: str,
+    dry_run: bool = False,
+    api: GitHubAPI | None = None,
+    cwd: Path | None = None,
+) -> bool:
+    """
+    Create a GitHub label.
+
+    Uses the REST session from ``github_api_session()`` when given, and
+    falls back to the gh CLI (run from ``cwd``) without one or when the
+    REST call fails.
+    """
+    if dry_run:
+        return True
+
+    argv = [
+        *_GH_LABEL_ARGV_PREFIX,
+        name,
+        "--color",
+        color,
+        "--description",
+        description,
+        # --force updates the label if it already exists
+        "--force",
+    ]
+    if api is not None:
+        if _upsert_label(api, name, color, description):
+            return True
+        # Target the same repository as the session, wherever gh runs from
+        argv += ["-R", f"{api.host}/{api.repo}"]
+
+    try:
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=30, cwd=cwd)
         return result.returncode == 0
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return False
@@ -201,12 +341,17 @@ def init_github_actions(
         else:
             errors.append("Failed to set LINEAR_API_KEY secret")
 
-    # Create labels
-    for name, color, description in REQUIRED_LABELS:
-        if create_github_label(name, color, description, dry_run):
-            labels_created.append(name)
-        else:
-            errors.append(f"Failed to create label: {name}")
+    # Create labels, sharing one authenticated connection across all of them
+    api = None if dry_run else github_api_session()
+    try:
+        for name, color, description in REQUIRED_LABELS:
+            if create_github_label(name, color, description, dry_run, api=api):
+                labels_created.append(name)
+            else:
+                errors.append(f"Failed to create label: {name}")
+    finally:
+        if api is not None:
+            api.close()
 
     success = len(errors) == 0 or (len(copied) > 0 and len(errors) < len(workflows_to_copy))
 
@@ -1,6 +1,9 @@
 """Analyze detected project profile and recommend retrofit actions."""
 
-from dataclasses import dataclass, field
+import io
+import operator
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from typing import Any
 
@@ -24,7 +27,28 @@ class ActionPriority(Enum):
     OPTIONAL = "optional"  # Nice to have
 
 
-@dataclass
+# Action types that represent work to apply (enum members are singletons,
+# so membership here is a cheap identity/hash check)
+_ADOPT_OR_CONFIGURE = frozenset({ActionType.ADOPT, ActionType.CONFIGURE})
+
+# Workflow names (stems) the boilerplate ships
+_BOILERPLATE_WORKFLOWS: tuple[str, ...] = (
+    "security",
+    "pr-policy",
+    "pr-opened",
+    "pr-merged",
+    "tests",
+)
+
+# Summary section rules
+_RULE = "=" * 60
+_SUBRULE = "-" * 30
+
+# Summary status tags, indexed by RetrofitAction.auto_applicable
+_STATUS = ("[MANUAL]", "[AUTO]")
+
+
+@dataclass(slots=True)
 class RetrofitAction:
     """A single retrofit action recommendation."""
 
@@ -38,52 +62,157 @@ class RetrofitAction:
     details: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrofitPlan:
     """Complete retrofit plan for a project."""
 
-    actions: list[RetrofitAction] = field(default_factory=list)
+    # Always stored as a tuple, so the only ways to change the actions are
+    # add() and assignment, both of which drop the buckets below.
+    actions: Sequence[RetrofitAction] = ()
     profile: ProjectProfile | None = None
 
+    # Actions bucketed by priority/type in one pass on first access after a
+    # change; the views return these tuples directly.
+    _by_priority: dict[ActionPriority, tuple[RetrofitAction, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _by_type: dict[ActionType, tuple[RetrofitAction, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _auto: tuple[RetrofitAction, ...] = field(default=(), init=False, repr=False, compare=False)
+    _indexed: bool = field(default=False, init=False, repr=False, compare=False)
+    _frozen: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "actions":
+            # getattr: __init__ assigns actions before _frozen exists
+            if getattr(self, "_frozen", False):
+                raise TypeError("Cannot change the actions of a frozen RetrofitPlan")
+            value = tuple(value)
+            object.__setattr__(self, "_indexed", False)
+        object.__setattr__(self, name, value)
+
+    def add(self, action: RetrofitAction) -> None:
+        """Append an action to the plan."""
+        self.actions = (*self.actions, action)
+
+    def freeze(self) -> None:
+        """Reject further changes once the plan is complete.
+
+        analyze() shares one plan between callers, so nobody may extend it.
+        """
+        self._index()
+        self._frozen = True
+
+    def _index(self) -> None:
+        """Bucket the actions if they changed since the last access."""
+        if self._indexed:
+            return
+        by_priority: dict[ActionPriority, list[RetrofitAction]] = {p: [] for p in ActionPriority}
+        by_type: dict[ActionType, list[RetrofitAction]] = {t: [] for t in ActionType}
+        auto = []
+        for action in self.actions:
+            by_priority[action.priority].append(action)
+            by_type[action.action_type].append(action)
+            if action.auto_applicable and action.action_type in _ADOPT_OR_CONFIGURE:
+                auto.append(action)
+        self._by_priority = {p: tuple(bucket) for p, bucket in by_priority.items()}
+        self._by_type = {t: tuple(bucket) for t, bucket in by_type.items()}
+        self._auto = tuple(auto)
+        self._indexed = True
+
     @property
-    def required_actions(self) -> list[RetrofitAction]:
+    def required_actions(self) -> tuple[RetrofitAction, ...]:
         """Get required actions."""
-        return [a for a in self.actions if a.priority == ActionPriority.REQUIRED]
+        self._index()
+        return self._by_priority[ActionPriority.REQUIRED]
 
     @property
-    def recommended_actions(self) -> list[RetrofitAction]:
+    def recommended_actions(self) -> tuple[RetrofitAction, ...]:
         """Get recommended actions."""
-        return [a for a in self.actions if a.priority == ActionPriority.RECOMMENDED]
+        self._index()
+        return self._by_priority[ActionPriority.RECOMMENDED]
 
     @property
-    def optional_actions(self) -> list[RetrofitAction]:
+    def optional_actions(self) -> tuple[RetrofitAction, ...]:
         """Get optional actions."""
-        return [a for a in self.actions if a.priority == ActionPriority.OPTIONAL]
+        self._index()
+        return self._by_priority[ActionPriority.OPTIONAL]
 
     @property
-    def conflicts(self) -> list[RetrofitAction]:
+    def conflicts(self) -> tuple[RetrofitAction, ...]:
         """Get conflicting actions that need manual resolution."""
-        return [a for a in self.actions if a.action_type == ActionType.CONFLICT]
+        self._index()
+        return self._by_type[ActionType.CONFLICT]
 
     @property
-    def auto_applicable_actions(self) -> list[RetrofitAction]:
+    def skipped_actions(self) -> tuple[RetrofitAction, ...]:
+        """Get actions skipped because the feature is already configured."""
+        self._index()
+        return self._by_type[ActionType.SKIP]
+
+    @property
+    def auto_applicable_actions(self) -> tuple[RetrofitAction, ...]:
         """Get actions that can be auto-applied."""
-        return [
-            a
-            for a in self.actions
-            if a.auto_applicable and a.action_type in (ActionType.ADOPT, ActionType.CONFIGURE)
-        ]
+        self._index()
+        return self._auto
 
 
 class RetrofitAnalyzer:
     """Analyzes a project profile and generates a retrofit plan."""
 
+    # (profile field, action name, description) for deployment targets
+    _DEPLOYMENT_TABLE: tuple[tuple[str, str, str], ...] = (
+        ("vercel_config", "vercel", "Vercel already configured"),
+        ("fly_config", "fly", "Fly.io already configured"),
+    )
+
+    # (profile field, description, current value) for hosted databases
+    _DATABASE_TABLE: tuple[tuple[str, str, str], ...] = (
+        ("supabase_config", "Supabase already configured", "supabase"),
+        ("neon_config", "Neon already configured", "neon"),
+    )
+
     def __init__(self, profile: ProjectProfile):
         """Initialize analyzer with a project profile."""
         self.profile = profile
+        self._plan_cache: RetrofitPlan | None = None
+        self._plan_key: tuple[Any, ...] = ()
+
+    @staticmethod
+    def _skip(
+        name: str, priority: ActionPriority, description: str, **extras: Any
+    ) -> RetrofitAction:
+        """Build a SKIP action for something that is already configured."""
+        return RetrofitAction(name, ActionType.SKIP, priority, description, **extras)
+
+    @staticmethod
+    def _adopt(
+        name: str, priority: ActionPriority, description: str, **extras: Any
+    ) -> RetrofitAction:
+        """Build an ADOPT action for a boilerplate feature to add."""
+        return RetrofitAction(name, ActionType.ADOPT, priority, description, **extras)
+
+    def _profile_key(self) -> tuple[Any, ...]:
+        """Snapshot the profile and the DetectionResult held by each field."""
+        profile = self.profile
+        return (profile, *(getattr(profile, f.name) for f in fields(profile)))
 
     def analyze(self) -> RetrofitPlan:
-        """Generate a complete retrofit plan."""
+        """
+        Generate a complete retrofit plan.
+
+        The plan is cached and returned again on later calls as long as the
+        profile (and each of its detection results) is the same object.
+        """
+        key = self._profile_key()
+        if (
+            self._plan_cache is not None
+            and len(key) == len(self._plan_key)
+            and all(map(operator.is_, key, self._plan_key))
+        ):
+            return self._plan_cache
+
         plan = RetrofitPlan(profile=self.profile)
 
         # Analyze each area and add actions
@@ -94,40 +223,46 @@ class RetrofitAnalyzer:
         self._analyze_deployment_config(plan)
         self._analyze_database_config(plan)
         self._analyze_labels(plan)
+        plan.freeze()
 
+        self._plan_cache = plan
+        self._plan_key = key
         return plan
 
     def _analyze_vibe_config(self, plan: RetrofitPlan) -> None:
         """Analyze existing vibe configuration."""
-        if self.profile.has_vibe_config.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="vibe_config",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.REQUIRED,
-                    description="Vibe configuration already exists",
-                    current_value=self.profile.has_vibe_config.value,
-                    details=self.profile.has_vibe_config.details,
+        vc = self.profile.has_vibe_config
+        if vc.detected:
+            plan.add(
+                self._skip(
+                    "vibe_config",
+                    ActionPriority.REQUIRED,
+                    "Vibe configuration already exists",
+                    current_value=vc.value,
+                    details=vc.details,
                 )
             )
         else:
-            plan.actions.append(
-                RetrofitAction(
-                    name="vibe_config",
-                    action_type=ActionType.ADOPT,
-                    priority=ActionPriority.REQUIRED,
-                    description="Create .vibe/config.json with project settings",
+            plan.add(
+                self._adopt(
+                    "vibe_config",
+                    ActionPriority.REQUIRED,
+                    "Create .vibe/config.json with project settings",
                     auto_applicable=True,
                 )
             )
 
     def _analyze_git_config(self, plan: RetrofitPlan) -> None:
         """Analyze git configuration (main branch, branch pattern, worktrees)."""
+        p = self.profile
+        mb = p.main_branch
+        bp = p.branch_pattern
+        wt = p.has_worktrees
         # Main branch detection
-        if self.profile.main_branch.detected:
-            main_branch = self.profile.main_branch.value
+        if mb.detected:
+            main_branch = mb.value
             if main_branch in ("main", "master"):
-                plan.actions.append(
+                plan.add(
                     RetrofitAction(
                         name="main_branch",
                         action_type=ActionType.CONFIGURE,
@@ -136,11 +271,11 @@ class RetrofitAnalyzer:
                         current_value=main_branch,
                         suggested_value=main_branch,
                         auto_applicable=True,
-                        details=self.profile.main_branch.details,
+                        details=mb.details,
                     )
                 )
             else:
-                plan.actions.append(
+                plan.add(
                     RetrofitAction(
                         name="main_branch",
                         action_type=ActionType.CONFLICT,
@@ -153,7 +288,7 @@ class RetrofitAnalyzer:
                     )
                 )
         else:
-            plan.actions.append(
+            plan.add(
                 RetrofitAction(
                     name="main_branch",
                     action_type=ActionType.CONFIGURE,
@@ -165,11 +300,11 @@ class RetrofitAnalyzer:
             )
 
         # Branch pattern
-        if self.profile.branch_pattern.detected:
-            pattern = self.profile.branch_pattern.value
-            confidence = self.profile.branch_pattern.confidence
+        if bp.detected:
+            pattern = bp.value
+            confidence = bp.confidence
             if confidence >= 0.7:
-                plan.actions.append(
+                plan.add(
                     RetrofitAction(
                         name="branch_pattern",
                         action_type=ActionType.CONFIGURE,
@@ -178,11 +313,11 @@ class RetrofitAnalyzer:
                         current_value=pattern,
                         suggested_value=pattern,
                         auto_applicable=True,
-                        details=self.profile.branch_pattern.details,
+                        details=bp.details,
                     )
                 )
             else:
-                plan.actions.append(
+                plan.add(
                     RetrofitAction(
                         name="branch_pattern",
                         action_type=ActionType.CONFIGURE,
@@ -195,12 +330,11 @@ class RetrofitAnalyzer:
                     )
                 )
         else:
-            plan.actions.append(
-                RetrofitAction(
-                    name="branch_pattern",
-                    action_type=ActionType.ADOPT,
-                    priority=ActionPriority.RECOMMENDED,
-                    description="Add branch naming convention",
+            plan.add(
+                self._adopt(
+                    "branch_pattern",
+                    ActionPriority.RECOMMENDED,
+                    "Add branch naming convention",
                     suggested_value="{PROJ}-{num}",
                     auto_applicable=True,
                     details="Using default pattern: {PROJ}-{num}",
@@ -208,24 +342,22 @@ class RetrofitAnalyzer:
             )
 
         # Worktrees
-        if self.profile.has_worktrees.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="worktrees",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.OPTIONAL,
-                    description="Worktrees already in use",
-                    current_value=self.profile.has_worktrees.value,
-                    details=self.profile.has_worktrees.details,
+        if wt.detected:
+            plan.add(
+                self._skip(
+                    "worktrees",
+                    ActionPriority.OPTIONAL,
+                    "Worktrees already in use",
+                    current_value=wt.value,
+                    details=wt.details,
                 )
             )
         else:
-            plan.actions.append(
-                RetrofitAction(
-                    name="worktrees",
-                    action_type=ActionType.ADOPT,
-                    priority=ActionPriority.RECOMMENDED,
-                    description="Enable git worktrees for parallel development",
+            plan.add(
+                self._adopt(
+                    "worktrees",
+                    ActionPriority.RECOMMENDED,
+                    "Enable git worktrees for parallel development",
                     auto_applicable=True,
                     details="Worktrees isolate work per ticket, preventing conflicts",
                 )
@@ -233,72 +365,71 @@ class RetrofitAnalyzer:
 
     def _analyze_github_config(self, plan: RetrofitPlan) -> None:
         """Analyze GitHub configuration (actions, PR template)."""
+        p = self.profile
+        ga = p.github_actions
+        pr = p.has_pr_template
         # GitHub Actions
-        if self.profile.github_actions.detected:
-            existing = self.profile.github_actions.value
-            boilerplate_workflows = ["security", "pr-policy", "pr-opened", "pr-merged", "tests"]
-            missing = [w for w in boilerplate_workflows if w not in existing]
+        if ga.detected:
+            existing = ga.value
+            existing_set = set(existing)
+            missing = [w for w in _BOILERPLATE_WORKFLOWS if w not in existing_set]
 
             if missing:
-                plan.actions.append(
-                    RetrofitAction(
-                        name="github_actions",
-                        action_type=ActionType.ADOPT,
-                        priority=ActionPriority.RECOMMENDED,
-                        description=f"Add missing workflows: {', '.join(missing)}",
+                plan.add(
+                    self._adopt(
+                        "github_actions",
+                        ActionPriority.RECOMMENDED,
+                        f"Add missing workflows: {', '.join(missing)}",
                         current_value=existing,
-                        suggested_value=boilerplate_workflows,
+                        suggested_value=list(_BOILERPLATE_WORKFLOWS),
                         auto_applicable=True,
                         details="Existing workflows will be preserved",
                     )
                 )
             else:
-                plan.actions.append(
-                    RetrofitAction(
-                        name="github_actions",
-                        action_type=ActionType.SKIP,
-                        priority=ActionPriority.RECOMMENDED,
-                        description="All recommended workflows already exist",
+                plan.add(
+                    self._skip(
+                        "github_actions",
+                        ActionPriority.RECOMMENDED,
+                        "All recommended workflows already exist",
                         current_value=existing,
                     )
                 )
         else:
-            plan.actions.append(
-                RetrofitAction(
-                    name="github_actions",
-                    action_type=ActionType.ADOPT,
-                    priority=ActionPriority.RECOMMENDED,
-                    description="Add GitHub Actions workflows (CI, security, PR automation)",
+            plan.add(
+                self._adopt(
+                    "github_actions",
+                    ActionPriority.RECOMMENDED,
+                    "Add GitHub Actions workflows (CI, security, PR automation)",
                     auto_applicable=True,
                 )
             )
 
         # PR Template
-        if self.profile.has_pr_template.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="pr_template",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.OPTIONAL,
-                    description="PR template already exists",
-                    current_value=self.profile.has_pr_template.value,
+        if pr.detected:
+            plan.add(
+                self._skip(
+                    "pr_template",
+                    ActionPriority.OPTIONAL,
+                    "PR template already exists",
+                    current_value=pr.value,
                 )
             )
         else:
-            plan.actions.append(
-                RetrofitAction(
-                    name="pr_template",
-                    action_type=ActionType.ADOPT,
-                    priority=ActionPriority.RECOMMENDED,
-                    description="Add PR template with risk assessment checklist",
+            plan.add(
+                self._adopt(
+                    "pr_template",
+                    ActionPriority.RECOMMENDED,
+                    "Add PR template with risk assessment checklist",
                     auto_applicable=True,
                 )
             )
 
     def _analyze_tracker_config(self, plan: RetrofitPlan) -> None:
         """Analyze ticket tracker configuration."""
-        if self.profile.linear_integration.detected:
-            plan.actions.append(
+        p = self.profile
+        if p.linear_integration.detected:
+            plan.add(
                 RetrofitAction(
                     name="tracker",
                     action_type=ActionType.CONFIGURE,
@@ -310,8 +441,8 @@ class RetrofitAnalyzer:
                     details="Linear detected. Run 'bin/vibe setup -w tracker' to configure.",
                 )
             )
-        elif self.profile.shortcut_integration.detected:
-            plan.actions.append(
+        elif p.shortcut_integration.detected:
+            plan.add(
                 RetrofitAction(
                     name="tracker",
                     action_type=ActionType.CONFIGURE,
@@ -324,12 +455,11 @@ class RetrofitAnalyzer:
                 )
             )
         else:
-            plan.actions.append(
-                RetrofitAction(
-                    name="tracker",
-                    action_type=ActionType.ADOPT,
-                    priority=ActionPriority.OPTIONAL,
-                    description="Add ticket tracker integration (Linear/Shortcut)",
+            plan.add(
+                self._adopt(
+                    "tracker",
+                    ActionPriority.OPTIONAL,
+                    "Add ticket tracker integration (Linear/Shortcut)",
                     auto_applicable=False,
                     details="Run 'bin/vibe setup -w tracker' when ready",
                 )
@@ -337,40 +467,29 @@ class RetrofitAnalyzer:
 
     def _analyze_deployment_config(self, plan: RetrofitPlan) -> None:
         """Analyze deployment configuration."""
-        # Vercel
-        if self.profile.vercel_config.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="vercel",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.OPTIONAL,
-                    description="Vercel already configured",
-                    current_value=self.profile.vercel_config.value,
-                    details=self.profile.vercel_config.details,
-                )
-            )
-
-        # Fly.io
-        if self.profile.fly_config.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="fly",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.OPTIONAL,
-                    description="Fly.io already configured",
-                    current_value=self.profile.fly_config.value,
-                    details=self.profile.fly_config.details,
+        p = self.profile
+        any_detected = False
+        for attr, name, description in self._DEPLOYMENT_TABLE:
+            det = getattr(p, attr)
+            if det.detected:
+                any_detected = True
+                plan.add(
+                    self._skip(
+                        name,
+                        ActionPriority.OPTIONAL,
+                        description,
+                        current_value=det.value,
+                        details=det.details,
+                    )
                 )
-            )
 
         # If no deployment configured, suggest options
-        if not self.profile.vercel_config.detected and not self.profile.fly_config.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="deployment",
-                    action_type=ActionType.ADOPT,
-                    priority=ActionPriority.OPTIONAL,
-                    description="Configure deployment (Vercel or Fly.io)",
+        if not any_detected:
+            plan.add(
+                self._adopt(
+                    "deployment",
+                    ActionPriority.OPTIONAL,
+                    "Configure deployment (Vercel or Fly.io)",
                     auto_applicable=False,
                     details="Run 'bin/vibe setup -w vercel' or 'bin/vibe setup -w fly'",
                 )
@@ -378,48 +497,36 @@ class RetrofitAnalyzer:
 
     def _analyze_database_config(self, plan: RetrofitPlan) -> None:
         """Analyze database configuration."""
-        if self.profile.supabase_config.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="database",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.OPTIONAL,
-                    description="Supabase already configured",
-                    current_value="supabase",
-                    details=self.profile.supabase_config.details,
-                )
-            )
-        elif self.profile.neon_config.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="database",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.OPTIONAL,
-                    description="Neon already configured",
-                    current_value="neon",
-                    details=self.profile.neon_config.details,
-                )
-            )
-        elif self.profile.database_type.detected:
-            plan.actions.append(
-                RetrofitAction(
-                    name="database",
-                    action_type=ActionType.SKIP,
-                    priority=ActionPriority.OPTIONAL,
-                    description=f"{self.profile.database_type.value} database detected",
-                    current_value=self.profile.database_type.value,
-                    details=self.profile.database_type.details,
-                )
+        p = self.profile
+        # First match wins: hosted providers, then a generic database type
+        for attr, description, current_value in self._DATABASE_TABLE:
+            det = getattr(p, attr)
+            if det.detected:
+                break
+        else:
+            det = p.database_type
+            if not det.detected:
+                return
+            description = f"{det.value} database detected"
+            current_value = det.value
+
+        plan.add(
+            self._skip(
+                "database",
+                ActionPriority.OPTIONAL,
+                description,
+                current_value=current_value,
+                details=det.details,
             )
+        )
 
     def _analyze_labels(self, plan: RetrofitPlan) -> None:
         """Analyze GitHub labels."""
-        plan.actions.append(
-            RetrofitAction(
-                name="github_labels",
-                action_type=ActionType.ADOPT,
-                priority=ActionPriority.RECOMMENDED,
-                description="Create standard GitHub labels (type, risk, area)",
+        plan.add(
+            self._adopt(
+                "github_labels",
+                ActionPriority.RECOMMENDED,
+                "Create standard GitHub labels (type, risk, area)",
                 auto_applicable=True,
                 details="Creates labels: Bug, Feature, Chore, Low/Medium/High Risk, etc.",
             )
@@ -427,80 +534,88 @@ class RetrofitAnalyzer:
 
     def generate_summary(self, plan: RetrofitPlan) -> str:
         """Generate a human-readable summary of the retrofit plan."""
-        lines = []
-        lines.append("=" * 60)
-        lines.append("  Retrofit Analysis Summary")
-        lines.append("=" * 60)
-        lines.append("")
+        buf = io.StringIO()
+        self.stream_summary(plan, buf.write)
+        return buf.getvalue().removesuffix("\n")
+
+    def stream_summary(self, plan: RetrofitPlan, write: Callable[[str], object]) -> None:
+        """Pass the summary of the retrofit plan to *write*, one line at a time."""
+        for line in self._summary_lines(plan):
+            write(f"{line}\n")
+
+    def _summary_lines(self, plan: RetrofitPlan) -> Iterator[str]:
+        """Yield the lines of the retrofit plan summary."""
+        p = self.profile
+        yield _RULE
+        yield "  Retrofit Analysis Summary"
+        yield _RULE
+        yield ""
 
         # Detected configuration
-        lines.append("Detected Configuration:")
-        lines.append("-" * 30)
-
-        if self.profile.main_branch.detected:
-            lines.append(f"  Main branch: {self.profile.main_branch.value}")
-        if self.profile.branch_pattern.detected:
-            conf = self.profile.branch_pattern.confidence
-            lines.append(
-                f"  Branch pattern: {self.profile.branch_pattern.value} ({conf:.0%} conf.)"
-            )
-        if self.profile.frontend_framework.detected:
-            lines.append(f"  Frontend: {self.profile.frontend_framework.value}")
-        if self.profile.backend_framework.detected:
-            lines.append(f"  Backend: {self.profile.backend_framework.value}")
-        if self.profile.package_manager.detected:
-            lines.append(f"  Package manager: {self.profile.package_manager.value}")
-        if self.profile.vercel_config.detected:
-            lines.append("  Deployment: Vercel")
-        if self.profile.fly_config.detected:
-            lines.append("  Deployment: Fly.io")
-        if self.profile.supabase_config.detected:
-            lines.append("  Database: Supabase")
-        if self.profile.test_framework.detected:
-            lines.append(f"  Testing: {self.profile.test_framework.value}")
-
-        lines.append("")
+        yield "Detected Configuration:"
+        yield _SUBRULE
+
+        mb = p.main_branch
+        if mb.detected:
+            yield f"  Main branch: {mb.value}"
+        bp = p.branch_pattern
+        if bp.detected:
+            yield f"  Branch pattern: {bp.value} ({bp.confidence:.0%} conf.)"
+        fe = p.frontend_framework
+        if fe.detected:
+            yield f"  Frontend: {fe.value}"
+        be = p.backend_framework
+        if be.detected:
+            yield f"  Backend: {be.value}"
+        pm = p.package_manager
+        if pm.detected:
+            yield f"  Package manager: {pm.value}"
+        if p.vercel_config.detected:
+            yield "  Deployment: Vercel"
+        if p.fly_config.detected:
+            yield "  Deployment: Fly.io"
+        if p.supabase_config.detected:
+            yield "  Database: Supabase"
+        tf = p.test_framework
+        if tf.detected:
+            yield f"  Testing: {tf.value}"
+
+        yield ""
 
         # Required actions
-        if plan.required_actions:
-            lines.append("Required Actions:")
-            lines.append("-" * 30)
-            for action in plan.required_actions:
-                status = "[AUTO]" if action.auto_applicable else "[MANUAL]"
-                lines.append(f"  {status} {action.description}")
-            lines.append("")
+        required = plan.required_actions
+        if required:
+            yield "Required Actions:"
+            yield _SUBRULE
+            for action in required:
+                yield f"  {_STATUS[action.auto_applicable]} {action.description}"
+            yield ""
 
         # Recommended actions
-        recommended = [
-            a
-            for a in plan.recommended_actions
-            if a.action_type in (ActionType.ADOPT, ActionType.CONFIGURE)
-        ]
+        recommended = [a for a in plan.recommended_actions if a.action_type in _ADOPT_OR_CONFIGURE]
         if recommended:
-            lines.append("Recommended Actions:")
-            lines.append("-" * 30)
+            yield "Recommended Actions:"
+            yield _SUBRULE
             for action in recommended:
-                status = "[AUTO]" if action.auto_applicable else "[MANUAL]"
-                lines.append(f"  {status} {action.description}")
-            lines.append("")
+                yield f"  {_STATUS[action.auto_applicable]} {action.description}"
+            yield ""
 
         # Conflicts
-        if plan.conflicts:
-            lines.append("Conflicts (manual resolution needed):")
-            lines.append("-" * 30)
-            for action in plan.conflicts:
-                lines.append(f"  ! {action.description}")
-                lines.append(f"    Current: {action.current_value}")
-                lines.append(f"    Suggested: {action.suggested_value}")
-            lines.append("")
+        conflicts = plan.conflicts
+        if conflicts:
+            yield "Conflicts (manual resolution needed):"
+            yield _SUBRULE
+            for action in conflicts:
+                yield f"  ! {action.description}"
+                yield f"    Current: {action.current_value}"
+                yield f"    Suggested: {action.suggested_value}"
+            yield ""
 
         # Skipped (already configured)
-        skipped = [a for a in plan.actions if a.action_type == ActionType.SKIP]
+        skipped = plan.skipped_actions
         if skipped:
-            lines.append("Already Configured (skipped):")
-            lines.append("-" * 30)
+            yield "Already Configured (skipped):"
+            yield _SUBRULE
             for action in skipped:
-                lines.append(f"  ✓ {action.description}")
-            lines.append("")
-
-        return "\n".join(lines)
+                yield f"  ✓ {action.description}"
+            yield ""
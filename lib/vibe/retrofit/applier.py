@@ -1,18 +1,177 @@
 """Apply retrofit actions to a project."""
 
 import copy
+import functools
+import os
 import shutil
+import stat
 import subprocess
-from collections.abc import Callable
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import click
 
-from lib.vibe.config import DEFAULT_CONFIG, save_config
+from lib.vibe.config import DEFAULT_CONFIG, load_config, save_config
+from lib.vibe.github_actions import create_github_label, fetch_label_names, github_api_session
 from lib.vibe.retrofit.analyzer import ActionType, RetrofitAction, RetrofitPlan
 from lib.vibe.state import DEFAULT_STATE, save_state
 
+# Labels created by the github_labels action: (name, color, description)
+_GITHUB_LABELS = (
+    # Type labels
+    ("Bug", "d73a4a", "Something isn't working"),
+    ("Feature", "a2eeef", "New feature or request"),
+    ("Chore", "fef2c0", "Maintenance or cleanup"),
+    ("Refactor", "c5def5", "Code improvement without behavior change"),
+    # Risk labels
+    ("Low Risk", "0e8a16", "Minimal scope, well-tested, low blast radius"),
+    ("Medium Risk", "fbca04", "Moderate scope, may affect multiple components"),
+    ("High Risk", "b60205", "Large scope, critical path, or infrastructure"),
+    # Area labels
+    ("Frontend", "1d76db", "UI and client-side code"),
+    ("Backend", "5319e7", "Server, API, business logic"),
+    ("Infra", "006b75", "DevOps, CI/CD, infrastructure"),
+    ("Docs", "0075ca", "Documentation only"),
+    # Special labels
+    ("HUMAN", "d4c5f9", "Requires human decision or action"),
+    ("Milestone", "bfdadc", "Part of a larger feature"),
+    ("Blocked", "e99695", "Waiting on external dependency"),
+)
+
+# Default PR template
+_PR_TEMPLATE = b"""## Summary
+
+<!-- Brief description of the changes. Link to the ticket. -->
+
+Closes #<!-- ticket number -->
+
+## Changes
+
+<!-- Bullet points of what changed -->
+
+-
+
+## Risk Assessment
+
+<!-- Select one risk level and delete the others -->
+
+- [ ] **Low Risk** - Minimal scope, well-tested, low blast radius
+- [ ] **Medium Risk** - Moderate scope, may affect multiple components
+- [ ] **High Risk** - Large scope, critical path, or infrastructure changes
+
+## Testing
+
+- [ ] Unit tests added/updated
+- [ ] Manual testing instructions included (for non-trivial changes)
+
+## Checklist
+
+- [ ] Code follows project conventions
+- [ ] No secrets or credentials committed
+- [ ] PR title includes ticket reference
+- [ ] Risk label added
+"""
+
+# Minimal PR policy workflow, used when there is no boilerplate to copy from
+_PR_POLICY_WORKFLOW = b"""name: PR Policy
+
+on:
+  pull_request:
+    types: [opened, edited, synchronize, labeled, unlabeled]
+
+jobs:
+  check-policy:
+    runs-on: ubuntu-latest
+    steps:
+      - name: Check risk label
+        uses: actions/github-script@v7
+        with:
+          script: |
+            const labels = context.payload.pull_request.labels.map(l => l.name);
+            const riskLabels = ['Low Risk', 'Medium Risk', 'High Risk'];
+            const hasRiskLabel = labels.some(l => riskLabels.includes(l));
+
+            if (!hasRiskLabel) {
+              core.setFailed('PR must have a risk label (Low Risk, Medium Risk, or High Risk)');
+            }
+"""
+
+# Minimal security workflow, used when there is no boilerplate to copy from
+_SECURITY_WORKFLOW = b"""name: Security
+
+on:
+  push:
+    branches: [main, master]
+  pull_request:
+    branches: [main, master]
+
+jobs:
+  gitleaks:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+        with:
+          fetch-depth: 0
+      - uses: gitleaks/gitleaks-action@v2
+        env:
+          GITHUB_TOKEN: ${{ secrets.GITHUB_TOKEN }}
+"""
+
+# Directories (relative to the project) each action writes into
+_ACTION_DIRS = {
+    "github_actions": (Path(".github", "workflows"),),
+    "pr_template": (Path(".github"),),
+}
+
+# Actions that must finish before the rest run (they create files the others edit)
+_FIRST_ACTIONS = frozenset({"vibe_config"})
+
+
+@functools.lru_cache(maxsize=1)
+def _gh_available() -> bool:
+    """Check once per process whether the gh CLI can be run."""
+    try:
+        subprocess.run(["gh", "--version"], capture_output=True, check=True)
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return False
+    return True
+
+
+def _fast_copy(src: str | Path, dst: str | Path) -> None:
+    """
+    Copy file contents, letting the kernel move the bytes where it can.
+
+    os.copy_file_range can reflink on copy-on-write filesystems and copy
+    server-side on NFS; filesystems that reject it fall back to
+    shutil.copyfile (sendfile on Linux).
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            remaining = os.fstat(src_fd).st_size
+            try:
+                while remaining > 0:
+                    copied = copy_file_range(src_fd, dst_fd, remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return
+            except OSError:
+                pass
+    shutil.copyfile(src, dst)
+
+
+def _copy_stat(st: os.stat_result, dst: str | Path) -> None:
+    """Like shutil.copystat, but from an already-fetched stat of the source."""
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+
 
 @dataclass
 class ApplyResult:
@@ -43,17 +202,31 @@ class RetrofitApplier:
         self.project_path = project_path or Path.cwd()
         self.boilerplate_path = boilerplate_path
         self.dry_run = dry_run
-
-        # Map action names to applier methods
-        self._appliers: dict[str, Callable[[RetrofitAction], ApplyResult]] = {
-            "vibe_config": self._apply_vibe_config,
-            "main_branch": self._apply_main_branch,
-            "branch_pattern": self._apply_branch_pattern,
-            "worktrees": self._apply_worktrees,
-            "github_actions": self._apply_github_actions,
-            "pr_template": self._apply_pr_template,
-            "github_labels": self._apply_github_labels,
-        }
+        # Serializes read-modify-write of .vibe/config.json across worker threads
+        self._config_lock = threading.Lock()
+        # Staged .vibe/config.json while a _config_transaction() is open
+        self._in_transaction = False
+        self._config_cache: dict[str, Any] | None = None
+        self._config_dirty = False
+        # Directories already created by _ensure_dirs()
+        self._made_dirs: set[Path] = set()
+
+    @functools.cached_property
+    def _github_dir(self) -> Path:
+        """The project's .github directory."""
+        return self.project_path / ".github"
+
+    @functools.cached_property
+    def _workflows_dir(self) -> Path:
+        """The project's workflows directory."""
+        return self._github_dir / "workflows"
+
+    @functools.cached_property
+    def _source_workflows_dir(self) -> Path | None:
+        """The boilerplate's workflows directory, if copying from a boilerplate."""
+        if self.boilerplate_path is None:
+            return None
+        return self.boilerplate_path / ".github" / "workflows"
 
     def apply_plan(
         self,
@@ -72,8 +245,7 @@ class RetrofitApplier:
         Returns:
             List of apply results
         """
-        results = []
-
+        # Both sources hold only ADOPT/CONFIGURE actions, so SKIPs never reach the loop
         actions_to_apply = (
             plan.auto_applicable_actions
             if auto_only
@@ -82,36 +254,123 @@ class RetrofitApplier:
             ]
         )
 
-        for action in actions_to_apply:
-            if action.action_type == ActionType.SKIP:
-                continue
+        with self._config_transaction():
+            if not interactive:
+                # Every action will run, so create their shared directories up
+                # front; interactively, handlers create them once confirmed.
+                if not self.dry_run:
+                    self._ensure_dirs(
+                        {
+                            self.project_path / d
+                            for action in actions_to_apply
+                            for d in _ACTION_DIRS.get(action.name, ())
+                        }
+                    )
+                return self._apply_concurrently(actions_to_apply)
 
-            if interactive:
+            results = []
+            for action in actions_to_apply:
                 if not click.confirm(f"Apply: {action.description}?", default=True):
                     results.append(ApplyResult(False, action.name, "Skipped by user"))
                     continue
 
-            result = self.apply_action(action)
-            results.append(result)
+                result = self.apply_action(action)
+                results.append(result)
 
-            if interactive:
                 status = "✓" if result.success else "✗"
                 click.echo(f"  {status} {result.message}")
 
-        return results
+            return results
+
+    def _ensure_dirs(self, dirs: set[Path]) -> None:
+        """Create each directory (and its parents) once per applier."""
+        for d in sorted(dirs - self._made_dirs):
+            os.makedirs(d, exist_ok=True)
+            self._made_dirs.add(d)
+
+    @contextmanager
+    def _config_transaction(self) -> Iterator[None]:
+        """Stage config edits made by actions in memory and save them once on exit."""
+        self._in_transaction = True
+        try:
+            yield
+        finally:
+            with self._config_lock:
+                if self._config_dirty and self._config_cache is not None:
+                    save_config(self._config_cache, self.project_path)
+                self._in_transaction = False
+                self._config_cache = None
+                self._config_dirty = False
+
+    @contextmanager
+    def _edit_config(self) -> Iterator[dict[str, Any]]:
+        """
+        Yield .vibe/config.json for editing.
+
+        Inside a _config_transaction() the edits are staged and saved on exit;
+        otherwise the file is loaded and saved around this single edit.
+        """
+        with self._config_lock:
+            if not self._in_transaction:
+                config = load_config(self.project_path)
+                yield config
+                save_config(config, self.project_path)
+                return
+
+            if self._config_cache is None:
+                self._config_cache = load_config(self.project_path)
+            yield self._config_cache
+            self._config_dirty = True
+
+    def _replace_config(self, config: dict[str, Any]) -> None:
+        """Overwrite .vibe/config.json, staging it if a transaction is open."""
+        with self._config_lock:
+            if not self._in_transaction:
+                save_config(config, self.project_path)
+                return
+
+            self._config_cache = config
+            self._config_dirty = True
+
+    def _apply_concurrently(self, actions: Sequence[RetrofitAction]) -> list[ApplyResult]:
+        """
+        Apply actions on a thread pool so their file and network I/O overlap.
+
+        Actions in _FIRST_ACTIONS run before the rest; results keep plan order.
+        """
+        first = [a for a in actions if a.name in _FIRST_ACTIONS]
+        rest = [a for a in actions if a.name not in _FIRST_ACTIONS]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(self.apply_action, first))
+            results.extend(pool.map(self.apply_action, rest))
+
+        by_action = {id(a): r for a, r in zip(first + rest, results, strict=True)}
+        return [by_action[id(a)] for a in actions]
 
     def apply_action(self, action: RetrofitAction) -> ApplyResult:
         """Apply a single action."""
-        applier = self._appliers.get(action.name)
-        if not applier:
-            return ApplyResult(
-                False,
-                action.name,
-                f"No applier found for action: {action.name}",
-            )
-
         try:
-            return applier(action)
+            match action.name:
+                case "vibe_config":
+                    return self._apply_vibe_config(action)
+                case "main_branch":
+                    return self._apply_main_branch(action)
+                case "branch_pattern":
+                    return self._apply_branch_pattern(action)
+                case "worktrees":
+                    return self._apply_worktrees(action)
+                case "github_actions":
+                    return self._apply_github_actions(action)
+                case "pr_template":
+                    return self._apply_pr_template(action)
+                case "github_labels":
+                    return self._apply_github_labels(action)
+                case _:
+                    return ApplyResult(
+                        False,
+                        action.name,
+                        f"No applier found for action: {action.name}",
+                    )
         except (OSError, RuntimeError, ValueError) as e:
             return ApplyResult(False, action.name, f"Error: {e}")
 
@@ -120,10 +379,8 @@ class RetrofitApplier:
         if self.dry_run:
             return ApplyResult(True, "vibe_config", "Would create .vibe/config.json")
 
-        config = copy.deepcopy(DEFAULT_CONFIG)
-
         # Will be populated by other actions
-        save_config(config, self.project_path)
+        self._replace_config(copy.deepcopy(DEFAULT_CONFIG))
 
         # Also create local state
         save_state(copy.deepcopy(DEFAULT_STATE), self.project_path)
@@ -136,12 +393,9 @@ class RetrofitApplier:
             branch = action.suggested_value or action.current_value or "main"
             return ApplyResult(True, "main_branch", f"Would set main branch to '{branch}'")
 
-        from lib.vibe.config import load_config, save_config
-
-        config = load_config(self.project_path)
-        branch = action.suggested_value or action.current_value or "main"
-        config.setdefault("branching", {})["main_branch"] = branch
-        save_config(config, self.project_path)
+        with self._edit_config() as config:
+            branch = action.suggested_value or action.current_value or "main"
+            config.setdefault("branching", {})["main_branch"] = branch
 
         return ApplyResult(True, "main_branch", f"Set main branch to '{branch}'")
 
@@ -151,12 +405,9 @@ class RetrofitApplier:
             pattern = action.suggested_value or "{PROJ}-{num}"
             return ApplyResult(True, "branch_pattern", f"Would set pattern to '{pattern}'")
 
-        from lib.vibe.config import load_config, save_config
-
-        config = load_config(self.project_path)
-        pattern = action.suggested_value or "{PROJ}-{num}"
-        config.setdefault("branching", {})["pattern"] = pattern
-        save_config(config, self.project_path)
+        with self._edit_config() as config:
+            pattern = action.suggested_value or "{PROJ}-{num}"
+            config.setdefault("branching", {})["pattern"] = pattern
 
         return ApplyResult(True, "branch_pattern", f"Set branch pattern to '{pattern}'")
 
@@ -165,38 +416,45 @@ class RetrofitApplier:
         if self.dry_run:
             return ApplyResult(True, "worktrees", "Would configure worktree settings")
 
-        from lib.vibe.config import load_config, save_config
-
-        config = load_config(self.project_path)
-        config["worktrees"] = {
-            "location": "sibling",
-            "base_path": "../{repo}-worktrees",
-            "auto_cleanup": True,
-        }
-        save_config(config, self.project_path)
+        with self._edit_config() as config:
+            config["worktrees"] = {
+                "location": "sibling",
+                "base_path": "../{repo}-worktrees",
+                "auto_cleanup": True,
+            }
 
         return ApplyResult(True, "worktrees", "Configured worktree settings")
 
     def _apply_github_actions(self, action: RetrofitAction) -> ApplyResult:
         """Copy GitHub Actions workflows from boilerplate."""
-        workflows_dir = self.project_path / ".github" / "workflows"
+        workflows_dir = self._workflows_dir
 
         if self.dry_run:
             return ApplyResult(True, "github_actions", f"Would create workflows in {workflows_dir}")
 
-        # Create directory if needed
-        workflows_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dirs({workflows_dir})
+        # One directory read answers every "does the destination exist?" check
+        existing = set(os.listdir(workflows_dir))
 
         # If we have a boilerplate path, copy from there
-        if self.boilerplate_path:
-            source_workflows = self.boilerplate_path / ".github" / "workflows"
-            if source_workflows.is_dir():
+        source_workflows = self._source_workflows_dir
+        if source_workflows is not None:
+            try:
+                # DirEntry caches the file type and stat from the directory read
+                with os.scandir(source_workflows) as entries:
+                    workflow_entries = [
+                        e for e in entries if e.name.endswith(".yml") and e.is_file()
+                    ]
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+            else:
                 copied = []
-                for workflow_file in source_workflows.glob("*.yml"):
-                    dest = workflows_dir / workflow_file.name
-                    if not dest.exists():
-                        shutil.copy2(workflow_file, dest)
-                        copied.append(workflow_file.name)
+                for entry in workflow_entries:
+                    if entry.name not in existing:
+                        dest = os.path.join(workflows_dir, entry.name)
+                        _fast_copy(entry.path, dest)
+                        _copy_stat(entry.stat(), dest)
+                        copied.append(entry.name)
 
                 if copied:
                     return ApplyResult(
@@ -215,15 +473,13 @@ class RetrofitApplier:
         created = []
 
         # PR policy workflow
-        pr_policy = workflows_dir / "pr-policy.yml"
-        if not pr_policy.exists():
-            pr_policy.write_text(self._get_pr_policy_workflow())
+        if "pr-policy.yml" not in existing:
+            (workflows_dir / "pr-policy.yml").write_bytes(_PR_POLICY_WORKFLOW)
             created.append("pr-policy.yml")
 
         # Security workflow
-        security = workflows_dir / "security.yml"
-        if not security.exists():
-            security.write_text(self._get_security_workflow())
+        if "security.yml" not in existing:
+            (workflows_dir / "security.yml").write_bytes(_SECURITY_WORKFLOW)
             created.append("security.yml")
 
         if created:
@@ -237,89 +493,52 @@ class RetrofitApplier:
 
     def _apply_pr_template(self, action: RetrofitAction) -> ApplyResult:
         """Create PR template."""
-        template_path = self.project_path / ".github" / "PULL_REQUEST_TEMPLATE.md"
+        template_path = self._github_dir / "PULL_REQUEST_TEMPLATE.md"
 
         if self.dry_run:
             return ApplyResult(True, "pr_template", f"Would create {template_path}")
 
-        if template_path.exists():
+        if os.path.lexists(template_path):
             return ApplyResult(True, "pr_template", "PR template already exists")
 
-        template_path.parent.mkdir(parents=True, exist_ok=True)
-        template_path.write_text(self._get_pr_template())
+        self._ensure_dirs({template_path.parent})
+        template_path.write_bytes(_PR_TEMPLATE)
 
         return ApplyResult(True, "pr_template", "Created PR template")
 
     def _apply_github_labels(self, action: RetrofitAction) -> ApplyResult:
-        """Create GitHub labels using gh CLI."""
+        """Create GitHub labels through the gh CLI's credentials."""
         if self.dry_run:
             return ApplyResult(True, "github_labels", "Would create GitHub labels")
 
-        # Check if gh CLI is available
-        try:
-            subprocess.run(
-                ["gh", "--version"],
-                capture_output=True,
-                check=True,
-            )
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        if not _gh_available():
             return ApplyResult(
                 False,
                 "github_labels",
                 "gh CLI not available. Install from https://cli.github.com/",
             )
 
-        # Define labels to create
-        labels = [
-            # Type labels
-            ("Bug", "d73a4a", "Something isn't working"),
-            ("Feature", "a2eeef", "New feature or request"),
-            ("Chore", "fef2c0", "Maintenance or cleanup"),
-            ("Refactor", "c5def5", "Code improvement without behavior change"),
-            # Risk labels
-            ("Low Risk", "0e8a16", "Minimal scope, well-tested, low blast radius"),
-            ("Medium Risk", "fbca04", "Moderate scope, may affect multiple components"),
-            ("High Risk", "b60205", "Large scope, critical path, or infrastructure"),
-            # Area labels
-            ("Frontend", "1d76db", "UI and client-side code"),
-            ("Backend", "5319e7", "Server, API, business logic"),
-            ("Infra", "006b75", "DevOps, CI/CD, infrastructure"),
-            ("Docs", "0075ca", "Documentation only"),
-            # Special labels
-            ("HUMAN", "d4c5f9", "Requires human decision or action"),
-            ("Milestone", "bfdadc", "Part of a larger feature"),
-            ("Blocked", "e99695", "Waiting on external dependency"),
-        ]
-
         created = []
         already_exists = []
         failed = []
 
-        for name, color, description in labels:
-            result = subprocess.run(
-                [
-                    "gh",
-                    "label",
-                    "create",
-                    name,
-                    "--color",
-                    color,
-                    "--description",
-                    description,
-                    "--force",  # Update if exists
-                ],
-                capture_output=True,
-                text=True,
-                cwd=str(self.project_path),
-            )
-
-            if result.returncode == 0:
-                if "already exists" in result.stderr.lower():
+        # One keep-alive HTTPS connection for every label instead of a gh process
+        # each; without API credentials every label goes through the gh CLI.
+        api = github_api_session(self.project_path)
+        try:
+            existing = fetch_label_names(api) if api is not None else set()
+            for name, color, description in _GITHUB_LABELS:
+                if not create_github_label(
+                    name, color, description, api=api, cwd=self.project_path
+                ):
+                    failed.append(name)
+                elif name.lower() in existing:
                     already_exists.append(name)
                 else:
                     created.append(name)
-            else:
-                failed.append(name)
+        finally:
+            if api is not None:
+                api.close()
 
         if failed:
             return ApplyResult(
@@ -333,85 +552,3 @@ class RetrofitApplier:
             "github_labels",
             f"Created {len(created)} labels, {len(already_exists)} already existed",
         )
-
-    def _get_pr_template(self) -> str:
-        """Get default PR template content."""
-        return """## Summary
-
-<!-- Brief description of the changes. Link to the ticket. -->
-
-Closes #<!-- ticket number -->
-
-## Changes
-
-<!-- Bullet points of what changed -->
-
--
-
-## Risk Assessment
-
-<!-- Select one risk level and delete the others -->
-
-- [ ] **Low Risk** - Minimal scope, well-tested, low blast radius
-- [ ] **Medium Risk** - Moderate scope, may affect multiple components
-- [ ] **High Risk** - Large scope, critical path, or infrastructure changes
-
-## Testing
-
-- [ ] Unit tests added/updated
-- [ ] Manual testing instructions included (for non-trivial changes)
-
-## Checklist
-
-- [ ] Code follows project conventions
-- [ ] No secrets or credentials committed
-- [ ] PR title includes ticket reference
-- [ ] Risk label added
-"""
-
-    def _get_pr_policy_workflow(self) -> str:
-        """Get minimal PR policy workflow."""
-        return """name: PR Policy
-
-on:
-  pull_request:
-    types: [opened, edited, synchronize, labeled, unlabeled]
-
-jobs:
-  check-policy:
-    runs-on: ubuntu-latest
-    steps:
-      - name: Check risk label
-        uses: actions/github-script@v7
-        with:
-          script: |
-            const labels = context.payload.pull_request.labels.map(l => l.name);
-            const riskLabels = ['Low Risk', 'Medium Risk', 'High Risk'];
-            const hasRiskLabel = labels.some(l => riskLabels.includes(l));
-
-            if (!hasRiskLabel) {
-              core.setFailed('PR must have a risk label (Low Risk, Medium Risk, or High Risk)');
-            }
-"""
-
-    def _get_security_workflow(self) -> str:
-        """Get minimal security workflow."""
-        return """name: Security
-
-on:
-  push:
-    branches: [main, master]
-  pull_request:
-    branches: [main, master]
-
-jobs:
-  gitleaks:
-    runs-on: ubuntu-latest
-    steps:
-      - uses: actions/checkout@v4
-        with:
-          fetch-depth: 0
-      - uses: gitleaks/gitleaks-action@v2
-        env:
-          GITHUB_TOKEN: ${{ secrets.GITHUB_TOKEN }}
-"""
@@ -1,16 +1,154 @@
 """Detection utilities for analyzing existing projects."""
 
+import functools
 import json
+import os
 import re
 import subprocess
-from collections import Counter
-from dataclasses import dataclass, field
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
-
-
-@dataclass
-class DetectionResult:
+from typing import Any, NamedTuple
+
+from lib.vibe.utils.fast_json import loads as _json_loads
+
+# Env files scanned for service configuration, in priority order
+_ENV_FILES = (".env", ".env.local", ".env.example")
+
+# Databases detect_database_type reports, in priority order, with display names
+_DATABASES = (
+    ("postgres", "PostgreSQL"),
+    ("mysql", "MySQL"),
+    ("mongodb", "MongoDB"),
+    ("redis", "Redis"),
+)
+# Case-insensitive env file markers for each database
+_DB_MARKERS = {
+    "postgres": "postgres",
+    "mysql": "mysql",
+    "mongodb": "mongodb",
+    "mongo_": "mongodb",
+    "redis": "redis",
+}
+# Case-sensitive env file markers for each service
+_SERVICE_MARKERS = {
+    "LINEAR_": "linear",
+    "SHORTCUT_API_TOKEN": "shortcut",
+    "CLUBHOUSE_": "shortcut",
+    "SUPABASE_URL": "supabase",
+    "NEON_": "neon",
+    "neon.tech": "neon",
+}
+# One alternation finds every marker in a single pass over an env file. It
+# matches case-insensitively for the databases; service hits are kept only
+# when their case matches exactly.
+_ENV_SCANNER = re.compile(
+    "|".join(re.escape(marker) for marker in (*_SERVICE_MARKERS, *_DB_MARKERS)),
+    re.IGNORECASE | re.ASCII,
+)
+
+
+def _env_markers(content: str) -> frozenset[str]:
+    """Get the services and databases an env file's contents mention."""
+    found = set()
+    for marker in _ENV_SCANNER.findall(content):
+        service = _SERVICE_MARKERS.get(marker)
+        if service is not None:
+            found.add(service)
+        else:
+            db = _DB_MARKERS.get(marker.lower())
+            if db is not None:
+                found.add(db)
+    return frozenset(found)
+
+
+# package.json frameworks each detector reports, in priority order:
+# (package, detected value, message)
+_FRONTEND_PACKAGES = (
+    ("next", "next", "Found Next.js in dependencies"),
+    ("nuxt", "nuxt", "Found Nuxt in dependencies"),
+    ("astro", "astro", "Found Astro in dependencies"),
+    ("svelte", "svelte", "Found Svelte in dependencies"),
+    ("@sveltejs/kit", "svelte", "Found Svelte in dependencies"),
+    ("vue", "vue", "Found Vue in dependencies"),
+    ("react", "react", "Found React in dependencies"),
+    ("angular", "angular", "Found Angular in dependencies"),
+    ("@angular/core", "angular", "Found Angular in dependencies"),
+)
+_NODE_BACKEND_PACKAGES = (
+    ("express", "express", "Found Express in dependencies"),
+    ("fastify", "fastify", "Found Fastify in dependencies"),
+    ("hono", "hono", "Found Hono in dependencies"),
+)
+_CSS_PACKAGES = (
+    ("tailwindcss", "tailwind", "Found Tailwind in dependencies"),
+    ("@chakra-ui/react", "chakra", "Found Chakra UI in dependencies"),
+    ("@mui/material", "mui", "Found MUI in dependencies"),
+    ("bootstrap", "bootstrap", "Found Bootstrap in dependencies"),
+)
+_JS_TEST_PACKAGES = (
+    ("vitest", "vitest", "Found Vitest in dependencies"),
+    ("jest", "jest", "Found Jest in dependencies"),
+    ("@playwright/test", "playwright", "Found Playwright in deps"),
+    ("cypress", "cypress", "Found Cypress in dependencies"),
+)
+
+# Python version declarations
+_PYPROJECT_PYTHON_RE = re.compile(r'python\s*[=<>]+\s*["\']?(\d+\.\d+)')
+_RUNTIME_PYTHON_RE = re.compile(r"python-(\d+\.\d+)")
+
+
+# Branch type prefixes recognized by the {type}/... naming patterns
+_BRANCH_TYPE_PREFIXES = frozenset({"feature/", "fix/", "chore/"})
+
+
+def _ticket_letters(branch: str) -> str | None:
+    """Get the letters of a leading "<ASCII letters>-<digit>" ticket ID, if any."""
+    dash = branch.find("-")
+    if dash <= 0 or not branch[dash + 1 : dash + 2].isdecimal():
+        return None
+    letters = branch[:dash]
+    return letters if letters.isascii() and letters.isalpha() else None
+
+
+# Branch naming patterns _classify_branch indexes into; earlier ones win ties
+_BRANCH_PATTERNS = (
+    "{PROJ}-{num}",
+    "{proj}-{num}",
+    "{type}/{PROJ}-{num}",
+    "{type}/{description}",
+    "{num}-{description}",
+)
+
+
+def _classify_branch(branch: str) -> int:
+    """
+    Get the _BRANCH_PATTERNS index of the pattern a branch name follows, or -1.
+
+    Plain string checks rather than regexes, since this runs once per branch.
+    """
+    letters = _ticket_letters(branch)
+    if letters is not None:
+        if letters.isupper():
+            return 0
+        if letters.islower():
+            return 1
+
+    slash = branch.find("/")
+    if branch[: slash + 1] in _BRANCH_TYPE_PREFIXES:
+        letters = _ticket_letters(branch[slash + 1 :])
+        if letters is not None and letters.isupper():
+            return 2
+        return 3
+
+    dash = branch.find("-")
+    if dash > 0 and branch[:dash].isdecimal():
+        return 4
+    return -1
+
+
+class DetectionResult(NamedTuple):
     """Result of a detection operation."""
 
     detected: bool
@@ -19,49 +157,94 @@ class DetectionResult:
     details: str = ""
 
 
-@dataclass
+# Default for profile fields no detector has filled; immutable, so it's shared
+_EMPTY = DetectionResult(False, 0.0)
+
+
+@dataclass(slots=True)
 class ProjectProfile:
     """Profile of an existing project's configuration and patterns."""
 
     # Git configuration
-    main_branch: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    branch_pattern: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    has_worktrees: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    main_branch: DetectionResult = _EMPTY
+    branch_pattern: DetectionResult = _EMPTY
+    has_worktrees: DetectionResult = _EMPTY
 
     # Package management
-    package_manager: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    python_version: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    package_manager: DetectionResult = _EMPTY
+    python_version: DetectionResult = _EMPTY
 
     # Frameworks and libraries
-    frontend_framework: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    backend_framework: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    css_framework: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    frontend_framework: DetectionResult = _EMPTY
+    backend_framework: DetectionResult = _EMPTY
+    css_framework: DetectionResult = _EMPTY
 
     # Deployment and hosting
-    vercel_config: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    fly_config: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    docker_config: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    vercel_config: DetectionResult = _EMPTY
+    fly_config: DetectionResult = _EMPTY
+    docker_config: DetectionResult = _EMPTY
 
     # Database
-    supabase_config: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    neon_config: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    database_type: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    supabase_config: DetectionResult = _EMPTY
+    neon_config: DetectionResult = _EMPTY
+    database_type: DetectionResult = _EMPTY
 
     # Testing
-    test_framework: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    test_framework: DetectionResult = _EMPTY
 
     # CI/CD
-    github_actions: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    has_pr_template: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    github_actions: DetectionResult = _EMPTY
+    has_pr_template: DetectionResult = _EMPTY
 
     # Ticket tracking
-    linear_integration: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
-    shortcut_integration: DetectionResult = field(
-        default_factory=lambda: DetectionResult(False, 0.0)
-    )
+    linear_integration: DetectionResult = _EMPTY
+    shortcut_integration: DetectionResult = _EMPTY
+
+    # Existing vibe config
+    has_vibe_config: DetectionResult = _EMPTY
+
 
+# ProjectProfile field filled by each detector, in detect_all() order
+_PROFILE_DETECTORS: tuple[tuple[str, str], ...] = (
+    # Git detection
+    ("main_branch", "detect_main_branch"),
+    ("branch_pattern", "detect_branch_pattern"),
+    ("has_worktrees", "detect_worktrees"),
+    # Package management
+    ("package_manager", "detect_package_manager"),
+    ("python_version", "detect_python_version"),
+    # Frameworks
+    ("frontend_framework", "detect_frontend_framework"),
+    ("backend_framework", "detect_backend_framework"),
+    ("css_framework", "detect_css_framework"),
+    # Deployment
+    ("vercel_config", "detect_vercel"),
+    ("fly_config", "detect_fly"),
+    ("docker_config", "detect_docker"),
+    # Database
+    ("supabase_config", "detect_supabase"),
+    ("neon_config", "detect_neon"),
+    ("database_type", "detect_database_type"),
+    # Testing
+    ("test_framework", "detect_test_framework"),
+    # CI/CD
+    ("github_actions", "detect_github_actions"),
+    ("has_pr_template", "detect_pr_template"),
+    # Ticket tracking
+    ("linear_integration", "detect_linear"),
+    ("shortcut_integration", "detect_shortcut"),
     # Existing vibe config
-    has_vibe_config: DetectionResult = field(default_factory=lambda: DetectionResult(False, 0.0))
+    ("has_vibe_config", "detect_vibe_config"),
+)
+
+
+@dataclass(frozen=True)
+class _GitRefs:
+    """Branch refs of a repository, as read by ProjectDetector._git_refs."""
+
+    origin_head: str | None  # e.g. "refs/remotes/origin/main"
+    local: tuple[str, ...]  # e.g. ("main", "TEST-1")
+    remote: tuple[str, ...]  # e.g. ("origin/main", "upstream/main")
 
 
 class ProjectDetector:
@@ -70,159 +253,255 @@ class ProjectDetector:
     def __init__(self, project_path: Path | None = None):
         """Initialize detector with project path."""
         self.project_path = project_path or Path.cwd()
+        self._dir_cache: dict[str, dict[str, bool]] = {}
+        self._file_cache: dict[str, str | None] = {}
+        # Guard cache fills when detect_all() runs detectors concurrently
+        self._cache_lock = threading.RLock()
+        self._git_lock = threading.Lock()
 
     def detect_all(self) -> ProjectProfile:
-        """Run all detection routines and return a complete profile."""
-        profile = ProjectProfile()
-
-        # Git detection
-        profile.main_branch = self.detect_main_branch()
-        profile.branch_pattern = self.detect_branch_pattern()
-        profile.has_worktrees = self.detect_worktrees()
-
-        # Package management
-        profile.package_manager = self.detect_package_manager()
-        profile.python_version = self.detect_python_version()
-
-        # Frameworks
-        profile.frontend_framework = self.detect_frontend_framework()
-        profile.backend_framework = self.detect_backend_framework()
-        profile.css_framework = self.detect_css_framework()
-
-        # Deployment
-        profile.vercel_config = self.detect_vercel()
-        profile.fly_config = self.detect_fly()
-        profile.docker_config = self.detect_docker()
-
-        # Database
-        profile.supabase_config = self.detect_supabase()
-        profile.neon_config = self.detect_neon()
-        profile.database_type = self.detect_database_type()
-
-        # Testing
-        profile.test_framework = self.detect_test_framework()
+        """
+        Run all detection routines and return a complete profile.
 
-        # CI/CD
-        profile.github_actions = self.detect_github_actions()
-        profile.has_pr_template = self.detect_pr_template()
+        Detectors run on a thread pool so their git calls and file reads
+        overlap; the shared caches they read through are filled under locks.
+        """
+        return self.lazy_profile().to_profile()
 
-        # Ticket tracking
-        profile.linear_integration = self.detect_linear()
-        profile.shortcut_integration = self.detect_shortcut()
+    def lazy_profile(self) -> "LazyProfile":
+        """Get a profile that runs each detector only when its field is first read."""
+        return LazyProfile(self)
 
-        # Existing vibe config
-        profile.has_vibe_config = self.detect_vibe_config()
+    def _entries(self, subdir: str = "") -> dict[str, bool]:
+        """
+        List a project directory once, mapping each name to whether it's a directory.
 
-        return profile
+        One directory read answers all of the detectors' existence probes in
+        it, instead of a stat() per probe. Missing directories list as empty.
+        """
+        try:
+            return self._dir_cache[subdir]
+        except KeyError:
+            pass
+        with self._cache_lock:
+            if subdir in self._dir_cache:
+                return self._dir_cache[subdir]
+            try:
+                with os.scandir(self.project_path / subdir) as it:
+                    entries = {e.name: e.is_dir() for e in it}
+            except OSError:
+                entries = {}
+            self._dir_cache[subdir] = entries
+            return entries
+
+    def _has(self, name: str) -> bool:
+        """Check whether a project-relative path ("a/b.txt") exists."""
+        parent, _, base = name.rpartition("/")
+        return base in self._entries(parent)
+
+    def _is_dir(self, name: str) -> bool:
+        """Check whether a project-relative path is a directory."""
+        parent, _, base = name.rpartition("/")
+        return self._entries(parent).get(base, False)
+
+    def _read(self, name: str) -> str | None:
+        """Read a file under the project once, or None if it can't be read."""
+        try:
+            return self._file_cache[name]
+        except KeyError:
+            pass
+        with self._cache_lock:
+            if name in self._file_cache:
+                return self._file_cache[name]
+            content: str | None = None
+            if self._has(name):
+                try:
+                    content = (self.project_path / name).read_text()
+                except OSError:
+                    pass
+            self._file_cache[name] = content
+            return content
+
+    @functools.cached_property
+    def _env_hits(self) -> tuple[tuple[str, frozenset[str]], ...]:
+        """(name, services and databases mentioned) of each env file, in _ENV_FILES order."""
+        return tuple(
+            (name, _env_markers(content))
+            for name in _ENV_FILES
+            if (content := self._read(name)) is not None
+        )
+
+    @functools.cached_property
+    def _package_deps(self) -> dict[str, Any] | None:
+        """package.json dependencies merged with devDependencies, or None if unusable."""
+        package_json = self._read("package.json")
+        if package_json is None:
+            return None
+        try:
+            data = _json_loads(package_json)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        return {**data.get("dependencies", {}), **data.get("devDependencies", {})}
+
+    def _match_package(self, packages: tuple[tuple[str, str, str], ...]) -> DetectionResult:
+        """Report the first of packages found in package.json dependencies."""
+        deps = self._package_deps
+        if deps:
+            for package, value, message in packages:
+                if package in deps:
+                    return DetectionResult(True, 1.0, value, message)
+        return DetectionResult(False, 0.0)
 
-    def detect_main_branch(self) -> DetectionResult:
-        """Detect the main branch (main vs master)."""
+    @functools.cached_property
+    def _python_deps_text(self) -> str:
+        """Lower-cased pyproject.toml and requirements.txt, for dependency checks."""
+        pyproject = self._read("pyproject.toml") or ""
+        requirements = self._read("requirements.txt") or ""
+        # Join before lowering: one case-folding pass and one copy, and the
+        # newline keeps a match from spanning the end of one file into the next
+        return "\n".join((pyproject, requirements)).lower()
+
+    @functools.cached_property
+    def _git_refs(self) -> _GitRefs | None:
+        """
+        Snapshot local branches, remote branches and origin/HEAD in one git call.
+
+        Returns None if git is unavailable or the project isn't a repository.
+        """
+        with self._git_lock:
+            # Cache under the lock so a detector that waited on another's
+            # git call reuses its result instead of running git again
+            if "_git_refs" not in self.__dict__:
+                self.__dict__["_git_refs"] = self._load_git_refs()
+            refs: _GitRefs | None = self.__dict__["_git_refs"]
+            return refs
+
+    def _load_git_refs(self) -> _GitRefs | None:
+        """Run git for-each-ref and parse it into a _GitRefs, for _git_refs."""
         try:
-            # First try symbolic-ref for HEAD
             result = subprocess.run(
-                ["git", "-C", str(self.project_path), "symbolic-ref", "refs/remotes/origin/HEAD"],
+                [
+                    "git",
+                    "-C",
+                    str(self.project_path),
+                    "for-each-ref",
+                    "--format=%(refname)%00%(symref)",
+                    "refs/heads",
+                    "refs/remotes",
+                ],
                 capture_output=True,
                 text=True,
                 timeout=5,
             )
-            if result.returncode == 0:
-                ref = result.stdout.strip()
-                branch = ref.split("/")[-1]
-                return DetectionResult(True, 1.0, branch, f"Detected from origin/HEAD: {branch}")
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None  # git not installed or timed out
+        if result.returncode != 0:
+            return None
+
+        origin_head = None
+        local = []
+        remote = []
+        for line in result.stdout.splitlines():
+            refname, _, symref = line.partition("\0")
+            if refname.startswith("refs/heads/"):
+                local.append(refname.removeprefix("refs/heads/"))
+            elif refname == "refs/remotes/origin/HEAD":
+                origin_head = symref or None
+            elif refname.startswith("refs/remotes/") and not symref:
+                remote.append(refname.removeprefix("refs/remotes/"))
+        return _GitRefs(origin_head, tuple(local), tuple(remote))
+
+    def _loose_origin_head(self) -> str | None:
+        """
+        Read origin/HEAD's target from .git/refs without running git.
+
+        Symbolic refs are never packed, so a missing file (or a .git file
+        pointing elsewhere, as in worktrees) leaves the answer to git.
+        """
+        content = self._read(".git/refs/remotes/origin/HEAD")
+        if content is None or not content.startswith("ref: "):
+            return None
+        return content[len("ref: ") :].strip() or None
 
+    def detect_main_branch(self) -> DetectionResult:
+        """Detect the main branch (main vs master)."""
+        # First try origin/HEAD, straight from the ref file when it's loose
+        origin_head = self._loose_origin_head()
+        refs = self._git_refs if origin_head is None else None
+        if refs is not None:
+            origin_head = refs.origin_head
+        if origin_head:
+            branch = origin_head.split("/")[-1]
+            return DetectionResult(True, 1.0, branch, f"Detected from origin/HEAD: {branch}")
+
+        if refs is not None:
             # Fallback: check if main or master exists
-            result = subprocess.run(
-                ["git", "-C", str(self.project_path), "branch", "-r"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                branches = result.stdout
-                if "origin/main" in branches:
-                    return DetectionResult(True, 0.9, "main", "Found origin/main remote branch")
-                if "origin/master" in branches:
-                    return DetectionResult(True, 0.9, "master", "Found origin/master remote branch")
+            if "origin/main" in refs.remote:
+                return DetectionResult(True, 0.9, "main", "Found origin/main remote branch")
+            if "origin/master" in refs.remote:
+                return DetectionResult(True, 0.9, "master", "Found origin/master remote branch")
 
             # Check local branches
-            result = subprocess.run(
-                ["git", "-C", str(self.project_path), "branch"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                branches = result.stdout
-                if "main" in branches:
-                    return DetectionResult(True, 0.8, "main", "Found local main branch")
-                if "master" in branches:
-                    return DetectionResult(True, 0.8, "master", "Found local master branch")
-
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass  # git not installed or timed out
+            if "main" in refs.local:
+                return DetectionResult(True, 0.8, "main", "Found local main branch")
+            if "master" in refs.local:
+                return DetectionResult(True, 0.8, "master", "Found local master branch")
 
         return DetectionResult(False, 0.0, "main", "Could not detect main branch, defaulting")
 
     def detect_branch_pattern(self) -> DetectionResult:
         """Detect branch naming patterns from existing branches."""
-        try:
-            result = subprocess.run(
-                ["git", "-C", str(self.project_path), "branch", "-a"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode != 0:
-                return DetectionResult(False, 0.0)
-
-            branches = [
-                b.strip().lstrip("* ").replace("remotes/origin/", "")
-                for b in result.stdout.strip().split("\n")
-                if b.strip() and "HEAD" not in b
-            ]
-
-            # Remove main/master from analysis
-            branches = [b for b in branches if b not in ("main", "master", "develop", "dev")]
-
-            if not branches:
-                return DetectionResult(False, 0.0, None, "No feature branches found")
-
-            # Pattern detection
-            patterns: Counter[str] = Counter()
-
-            for branch in branches:
-                # Check for ticket ID patterns
-                if re.match(r"^[A-Z]+-\d+", branch):
-                    patterns["{PROJ}-{num}"] += 1
-                elif re.match(r"^[a-z]+-\d+", branch):
-                    patterns["{proj}-{num}"] += 1
-                elif re.match(r"^(feature|fix|chore)/[A-Z]+-\d+", branch):
-                    patterns["{type}/{PROJ}-{num}"] += 1
-                elif re.match(r"^(feature|fix|chore)/", branch):
-                    patterns["{type}/{description}"] += 1
-                elif re.match(r"^\d+-", branch):
-                    patterns["{num}-{description}"] += 1
-
-            if patterns:
-                most_common = patterns.most_common(1)[0]
-                pattern, count = most_common
-                confidence = min(count / len(branches), 1.0) if branches else 0.0
-                return DetectionResult(
-                    True,
-                    confidence,
-                    pattern,
-                    f"Detected pattern '{pattern}' from {count}/{len(branches)} branches",
-                )
+        refs = self._git_refs
+        if refs is None:
+            return DetectionResult(False, 0.0)
 
+        # Local branches plus remote ones, with origin's shown by bare name
+        branches = [
+            b
+            for b in (*refs.local, *(r.removeprefix("origin/") for r in refs.remote))
+            if "HEAD" not in b
+        ]
+
+        # Remove main/master from analysis
+        branches = [b for b in branches if b not in ("main", "master", "develop", "dev")]
+
+        if not branches:
+            return DetectionResult(False, 0.0, None, "No feature branches found")
+
+        # Pattern detection: tally per _BRANCH_PATTERNS index
+        counts = [0] * len(_BRANCH_PATTERNS)
+        for branch in branches:
+            index = _classify_branch(branch)
+            if index >= 0:
+                counts[index] += 1
+
+        best = max(range(len(counts)), key=counts.__getitem__)
+        count = counts[best]
+        if count:
+            pattern = _BRANCH_PATTERNS[best]
+            confidence = min(count / len(branches), 1.0) if branches else 0.0
             return DetectionResult(
-                False, 0.3, "{PROJ}-{num}", "No clear pattern, suggesting default"
+                True,
+                confidence,
+                pattern,
+                f"Detected pattern '{pattern}' from {count}/{len(branches)} branches",
             )
 
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return DetectionResult(False, 0.0)
+        return DetectionResult(False, 0.3, "{PROJ}-{num}", "No clear pattern, suggesting default")
+
+    def _count_worktrees(self) -> int | None:
+        """
+        Count the checkouts (main plus linked worktrees) of the project's repo.
+
+        When the project root holds the .git directory, linked worktrees are
+        registered under .git/worktrees and no git process is needed; other
+        layouts ask `git worktree list`. Returns None if git can't tell.
+        """
+        if self._is_dir(".git"):
+            return 1 + sum(self._entries(".git/worktrees").values())
 
-    def detect_worktrees(self) -> DetectionResult:
-        """Detect if project already uses git worktrees."""
         try:
             result = subprocess.run(
                 ["git", "-C", str(self.project_path), "worktree", "list"],
@@ -230,47 +509,47 @@ class ProjectDetector:
                 text=True,
                 timeout=5,
             )
-            if result.returncode == 0:
-                worktrees = [
-                    line
-                    for line in result.stdout.strip().split("\n")
-                    if line and "(bare)" not in line
-                ]
-                # More than just the main checkout means worktrees are in use
-                if len(worktrees) > 1:
-                    return DetectionResult(
-                        True, 1.0, len(worktrees), f"Found {len(worktrees)} active worktrees"
-                    )
-                return DetectionResult(
-                    False, 0.0, 1, "Only main checkout found (no additional worktrees)"
-                )
         except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-        return DetectionResult(False, 0.0)
+            return None
+        if result.returncode != 0:
+            return None
+        return len(
+            [line for line in result.stdout.strip().split("\n") if line and "(bare)" not in line]
+        )
+
+    def detect_worktrees(self) -> DetectionResult:
+        """Detect if project already uses git worktrees."""
+        count = self._count_worktrees()
+        if count is None:
+            return DetectionResult(False, 0.0)
+
+        # More than just the main checkout means worktrees are in use
+        if count > 1:
+            return DetectionResult(True, 1.0, count, f"Found {count} active worktrees")
+        return DetectionResult(False, 0.0, 1, "Only main checkout found (no additional worktrees)")
 
     def detect_package_manager(self) -> DetectionResult:
         """Detect Python package manager (poetry, pipenv, pip, uv)."""
         # Check for uv
-        if (self.project_path / "uv.lock").exists():
+        if self._has("uv.lock"):
             return DetectionResult(True, 1.0, "uv", "Found uv.lock")
 
         # Check for Poetry
-        pyproject = self.project_path / "pyproject.toml"
-        if pyproject.exists():
-            content = pyproject.read_text()
-            if "[tool.poetry]" in content:
+        pyproject = self._read("pyproject.toml")
+        if pyproject is not None:
+            if "[tool.poetry]" in pyproject:
                 return DetectionResult(True, 1.0, "poetry", "Found [tool.poetry] in pyproject.toml")
 
         # Check for Pipenv
-        if (self.project_path / "Pipfile").exists():
+        if self._has("Pipfile"):
             return DetectionResult(True, 1.0, "pipenv", "Found Pipfile")
 
         # Check for requirements.txt (pip)
-        if (self.project_path / "requirements.txt").exists():
+        if self._has("requirements.txt"):
             return DetectionResult(True, 0.8, "pip", "Found requirements.txt")
 
         # pyproject.toml without poetry (could be pip with pyproject)
-        if pyproject.exists():
+        if pyproject is not None:
             return DetectionResult(True, 0.7, "pip", "Found pyproject.toml (pip-compatible)")
 
         return DetectionResult(False, 0.0)
@@ -278,24 +557,22 @@ class ProjectDetector:
     def detect_python_version(self) -> DetectionResult:
         """Detect Python version from project configuration."""
         # Check .python-version
-        pyversion_file = self.project_path / ".python-version"
-        if pyversion_file.exists():
-            version = pyversion_file.read_text().strip()
+        pyversion = self._read(".python-version")
+        if pyversion is not None:
+            version = pyversion.strip()
             return DetectionResult(True, 1.0, version, "Found .python-version")
 
         # Check pyproject.toml
-        pyproject = self.project_path / "pyproject.toml"
-        if pyproject.exists():
-            content = pyproject.read_text()
-            match = re.search(r'python\s*[=<>]+\s*["\']?(\d+\.\d+)', content)
+        pyproject = self._read("pyproject.toml")
+        if pyproject is not None:
+            match = _PYPROJECT_PYTHON_RE.search(pyproject)
             if match:
                 return DetectionResult(True, 0.9, match.group(1), "Detected from pyproject.toml")
 
         # Check runtime.txt (Heroku-style)
-        runtime = self.project_path / "runtime.txt"
-        if runtime.exists():
-            content = runtime.read_text()
-            match = re.search(r"python-(\d+\.\d+)", content)
+        runtime = self._read("runtime.txt")
+        if runtime is not None:
+            match = _RUNTIME_PYTHON_RE.search(runtime)
             if match:
                 return DetectionResult(True, 0.9, match.group(1), "Found runtime.txt")
 
@@ -303,46 +580,12 @@ class ProjectDetector:
 
     def detect_frontend_framework(self) -> DetectionResult:
         """Detect frontend framework from package.json or config files."""
-        package_json = self.project_path / "package.json"
-        if not package_json.exists():
-            return DetectionResult(False, 0.0)
-
-        try:
-            data = json.loads(package_json.read_text())
-            deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-
-            # Check for frameworks (order matters - more specific first)
-            if "next" in deps:
-                return DetectionResult(True, 1.0, "next", "Found Next.js in dependencies")
-            if "nuxt" in deps:
-                return DetectionResult(True, 1.0, "nuxt", "Found Nuxt in dependencies")
-            if "astro" in deps:
-                return DetectionResult(True, 1.0, "astro", "Found Astro in dependencies")
-            if "svelte" in deps or "@sveltejs/kit" in deps:
-                return DetectionResult(True, 1.0, "svelte", "Found Svelte in dependencies")
-            if "vue" in deps:
-                return DetectionResult(True, 1.0, "vue", "Found Vue in dependencies")
-            if "react" in deps:
-                return DetectionResult(True, 1.0, "react", "Found React in dependencies")
-            if "angular" in deps or "@angular/core" in deps:
-                return DetectionResult(True, 1.0, "angular", "Found Angular in dependencies")
-
-        except (json.JSONDecodeError, OSError):
-            pass
-
-        return DetectionResult(False, 0.0)
+        return self._match_package(_FRONTEND_PACKAGES)
 
     def detect_backend_framework(self) -> DetectionResult:
         """Detect backend framework."""
         # Check pyproject.toml or requirements.txt for Python frameworks
-        deps_text = ""
-        pyproject = self.project_path / "pyproject.toml"
-        requirements = self.project_path / "requirements.txt"
-
-        if pyproject.exists():
-            deps_text += pyproject.read_text().lower()
-        if requirements.exists():
-            deps_text += requirements.read_text().lower()
+        deps_text = self._python_deps_text
 
         if "fastapi" in deps_text:
             return DetectionResult(True, 1.0, "fastapi", "Found FastAPI in dependencies")
@@ -354,82 +597,40 @@ class ProjectDetector:
             return DetectionResult(True, 1.0, "litestar", "Found Litestar in dependencies")
 
         # Check package.json for Node.js backends
-        package_json = self.project_path / "package.json"
-        if package_json.exists():
-            try:
-                data = json.loads(package_json.read_text())
-                deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-                if "express" in deps:
-                    return DetectionResult(True, 1.0, "express", "Found Express in dependencies")
-                if "fastify" in deps:
-                    return DetectionResult(True, 1.0, "fastify", "Found Fastify in dependencies")
-                if "hono" in deps:
-                    return DetectionResult(True, 1.0, "hono", "Found Hono in dependencies")
-            except (json.JSONDecodeError, OSError):
-                pass
-
-        return DetectionResult(False, 0.0)
+        return self._match_package(_NODE_BACKEND_PACKAGES)
 
     def detect_css_framework(self) -> DetectionResult:
         """Detect CSS framework."""
         # Check for Tailwind config
-        if (self.project_path / "tailwind.config.js").exists() or (
-            self.project_path / "tailwind.config.ts"
-        ).exists():
+        if self._has("tailwind.config.js") or self._has("tailwind.config.ts"):
             return DetectionResult(True, 1.0, "tailwind", "Found tailwind.config")
 
-        package_json = self.project_path / "package.json"
-        if package_json.exists():
-            try:
-                data = json.loads(package_json.read_text())
-                deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-
-                if "tailwindcss" in deps:
-                    return DetectionResult(True, 1.0, "tailwind", "Found Tailwind in dependencies")
-                if "@chakra-ui/react" in deps:
-                    return DetectionResult(True, 1.0, "chakra", "Found Chakra UI in dependencies")
-                if "@mui/material" in deps:
-                    return DetectionResult(True, 1.0, "mui", "Found MUI in dependencies")
-                if "bootstrap" in deps:
-                    return DetectionResult(
-                        True, 1.0, "bootstrap", "Found Bootstrap in dependencies"
-                    )
-
-            except (json.JSONDecodeError, OSError):
-                pass
-
-        return DetectionResult(False, 0.0)
+        return self._match_package(_CSS_PACKAGES)
 
     def detect_vercel(self) -> DetectionResult:
         """Detect Vercel configuration."""
-        vercel_json = self.project_path / "vercel.json"
-        if vercel_json.exists():
+        if self._has("vercel.json"):
             return DetectionResult(True, 1.0, "configured", "Found vercel.json")
 
         # Check for .vercel directory
-        if (self.project_path / ".vercel").is_dir():
+        if self._is_dir(".vercel"):
             return DetectionResult(True, 0.9, "linked", "Found .vercel directory (project linked)")
 
         return DetectionResult(False, 0.0)
 
     def detect_fly(self) -> DetectionResult:
         """Detect Fly.io configuration."""
-        fly_toml = self.project_path / "fly.toml"
-        if fly_toml.exists():
+        if self._has("fly.toml"):
             return DetectionResult(True, 1.0, "configured", "Found fly.toml")
 
         return DetectionResult(False, 0.0)
 
     def detect_docker(self) -> DetectionResult:
         """Detect Docker configuration."""
-        dockerfile = self.project_path / "Dockerfile"
-        compose = self.project_path / "docker-compose.yml"
-        compose_yaml = self.project_path / "docker-compose.yaml"
-
         configs_found = []
-        if dockerfile.exists():
+        if self._has("Dockerfile"):
             configs_found.append("Dockerfile")
-        if compose.exists() or compose_yaml.exists():
+        if self._has("docker-compose.yml") or self._has("docker-compose.yaml"):
             configs_found.append("docker-compose")
 
         if configs_found:
@@ -440,128 +641,86 @@ class ProjectDetector:
     def detect_supabase(self) -> DetectionResult:
         """Detect Supabase configuration."""
         # Check for supabase directory (local dev)
-        if (self.project_path / "supabase" / "config.toml").exists():
+        if self._has("supabase/config.toml"):
             return DetectionResult(True, 1.0, "local", "Found supabase/config.toml")
 
-        # Check environment files for SUPABASE_URL
-        env_files = [".env", ".env.local", ".env.example"]
-        for env_file in env_files:
-            env_path = self.project_path / env_file
-            if env_path.exists():
-                content = env_path.read_text()
-                if "SUPABASE_URL" in content or "NEXT_PUBLIC_SUPABASE_URL" in content:
-                    return DetectionResult(True, 0.8, "env", f"Found Supabase config in {env_file}")
+        # Check environment files for SUPABASE_URL (NEXT_PUBLIC_SUPABASE_URL included)
+        for env_file, hits in self._env_hits:
+            if "supabase" in hits:
+                return DetectionResult(True, 0.8, "env", f"Found Supabase config in {env_file}")
 
         return DetectionResult(False, 0.0)
 
     def detect_neon(self) -> DetectionResult:
         """Detect Neon database configuration."""
-        env_files = [".env", ".env.local", ".env.example"]
-        for env_file in env_files:
-            env_path = self.project_path / env_file
-            if env_path.exists():
-                content = env_path.read_text()
-                if "neon.tech" in content or "NEON_" in content:
-                    return DetectionResult(True, 0.8, "env", f"Found Neon config in {env_file}")
+        for env_file, hits in self._env_hits:
+            if "neon" in hits:
+                return DetectionResult(True, 0.8, "env", f"Found Neon config in {env_file}")
 
         return DetectionResult(False, 0.0)
 
     def detect_database_type(self) -> DetectionResult:
         """Detect database type from configuration or dependencies."""
         # Check environment files
-        env_files = [".env", ".env.local", ".env.example"]
-        for env_file in env_files:
-            env_path = self.project_path / env_file
-            if env_path.exists():
-                content = env_path.read_text().lower()
-                if "postgres" in content or "postgresql" in content:
-                    return DetectionResult(True, 0.8, "postgres", "Found PostgreSQL in env")
-                if "mysql" in content:
-                    return DetectionResult(True, 0.8, "mysql", "Found MySQL in env")
-                if "mongodb" in content or "mongo_" in content:
-                    return DetectionResult(True, 0.8, "mongodb", "Found MongoDB in env")
-                if "redis" in content:
-                    return DetectionResult(True, 0.8, "redis", "Found Redis in env")
+        for _, hits in self._env_hits:
+            # Priority, not position in the file, decides the winner
+            for db, label in _DATABASES:
+                if db in hits:
+                    return DetectionResult(True, 0.8, db, f"Found {label} in env")
 
         return DetectionResult(False, 0.0)
 
     def detect_test_framework(self) -> DetectionResult:
         """Detect test framework."""
         # Python test frameworks
-        deps_text = ""
-        pyproject = self.project_path / "pyproject.toml"
-        requirements = self.project_path / "requirements.txt"
-
-        if pyproject.exists():
-            deps_text += pyproject.read_text().lower()
-        if requirements.exists():
-            deps_text += requirements.read_text().lower()
+        deps_text = self._python_deps_text
 
         if "pytest" in deps_text:
             return DetectionResult(True, 1.0, "pytest", "Found pytest in dependencies")
 
         # Check for pytest.ini or pyproject.toml [tool.pytest]
-        if (self.project_path / "pytest.ini").exists():
+        if self._has("pytest.ini"):
             return DetectionResult(True, 1.0, "pytest", "Found pytest.ini")
 
         # JavaScript test frameworks
-        package_json = self.project_path / "package.json"
-        if package_json.exists():
-            try:
-                data = json.loads(package_json.read_text())
-                deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-
-                if "vitest" in deps:
-                    return DetectionResult(True, 1.0, "vitest", "Found Vitest in dependencies")
-                if "jest" in deps:
-                    return DetectionResult(True, 1.0, "jest", "Found Jest in dependencies")
-                if "@playwright/test" in deps:
-                    return DetectionResult(True, 1.0, "playwright", "Found Playwright in deps")
-                if "cypress" in deps:
-                    return DetectionResult(True, 1.0, "cypress", "Found Cypress in dependencies")
-
-            except (json.JSONDecodeError, OSError):
-                pass
-
-        return DetectionResult(False, 0.0)
+        return self._match_package(_JS_TEST_PACKAGES)
 
     def detect_github_actions(self) -> DetectionResult:
         """Detect GitHub Actions workflows."""
-        workflows_dir = self.project_path / ".github" / "workflows"
-        if workflows_dir.is_dir():
-            workflows = list(workflows_dir.glob("*.yml")) + list(workflows_dir.glob("*.yaml"))
-            if workflows:
-                names = [w.stem for w in workflows]
-                return DetectionResult(
-                    True, 1.0, names, f"Found {len(workflows)} workflow(s): {', '.join(names)}"
-                )
+        # One cached listing of the directory; directories named *.yml aren't workflows
+        names = [
+            os.path.splitext(name)[0]
+            for name, is_dir in self._entries(".github/workflows").items()
+            if not is_dir and name.endswith((".yml", ".yaml"))
+        ]
+        if names:
+            return DetectionResult(
+                True, 1.0, names, f"Found {len(names)} workflow(s): {', '.join(names)}"
+            )
 
         return DetectionResult(False, 0.0)
 
     def detect_pr_template(self) -> DetectionResult:
         """Detect PR template."""
         templates = [
-            self.project_path / ".github" / "PULL_REQUEST_TEMPLATE.md",
-            self.project_path / ".github" / "pull_request_template.md",
-            self.project_path / "PULL_REQUEST_TEMPLATE.md",
+            ".github/PULL_REQUEST_TEMPLATE.md",
+            ".github/pull_request_template.md",
+            "PULL_REQUEST_TEMPLATE.md",
         ]
 
         for template in templates:
-            if template.exists():
-                return DetectionResult(True, 1.0, str(template), f"Found {template.name}")
+            if self._has(template):
+                path = self.project_path / template
+                return DetectionResult(True, 1.0, str(path), f"Found {path.name}")
 
         return DetectionResult(False, 0.0)
 
     def detect_linear(self) -> DetectionResult:
         """Detect Linear integration."""
-        # Check for LINEAR_API_KEY in env files
-        env_files = [".env", ".env.local", ".env.example"]
-        for env_file in env_files:
-            env_path = self.project_path / env_file
-            if env_path.exists():
-                content = env_path.read_text()
-                if "LINEAR_API_KEY" in content or "LINEAR_" in content:
-                    return DetectionResult(True, 0.8, "env", f"Found Linear config in {env_file}")
+        # Check for LINEAR_* settings (LINEAR_API_KEY included) in env files
+        for env_file, hits in self._env_hits:
+            if "linear" in hits:
+                return DetectionResult(True, 0.8, "env", f"Found Linear config in {env_file}")
 
         # Check for Linear-style branch names
         branch_result = self.detect_branch_pattern()
@@ -577,22 +736,18 @@ class ProjectDetector:
 
     def detect_shortcut(self) -> DetectionResult:
         """Detect Shortcut integration."""
-        env_files = [".env", ".env.local", ".env.example"]
-        for env_file in env_files:
-            env_path = self.project_path / env_file
-            if env_path.exists():
-                content = env_path.read_text()
-                if "SHORTCUT_API_TOKEN" in content or "CLUBHOUSE_" in content:
-                    return DetectionResult(True, 0.8, "env", f"Found Shortcut config in {env_file}")
+        for env_file, hits in self._env_hits:
+            if "shortcut" in hits:
+                return DetectionResult(True, 0.8, "env", f"Found Shortcut config in {env_file}")
 
         return DetectionResult(False, 0.0)
 
     def detect_vibe_config(self) -> DetectionResult:
         """Detect if project already has vibe configuration."""
-        config_path = self.project_path / ".vibe" / "config.json"
-        if config_path.exists():
+        config_text = self._read(".vibe/config.json")
+        if config_text is not None:
             try:
-                config = json.loads(config_path.read_text())
+                config = _json_loads(config_text)
                 version = config.get("version", "unknown")
                 return DetectionResult(
                     True, 1.0, version, f"Found .vibe/config.json (version {version})"
@@ -601,3 +756,40 @@ class ProjectDetector:
                 return DetectionResult(True, 0.5, "invalid", "Found .vibe/config.json (invalid)")
 
         return DetectionResult(False, 0.0)
+
+
+class LazyProfile:
+    """
+    ProjectProfile stand-in that runs each detector on first access.
+
+    For callers that read only a few fields, e.g. ``lazy.main_branch``,
+    this skips the git calls and file scans the other detectors would do.
+    """
+
+    _DETECTORS = dict(_PROFILE_DETECTORS)
+
+    def __init__(self, detector: ProjectDetector):
+        """Initialize with the detector whose results to expose."""
+        self._detector = detector
+
+    def __getattr__(self, name: str) -> DetectionResult:
+        """Run the detector behind a ProjectProfile field and cache its result."""
+        try:
+            method = self._DETECTORS[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        result: DetectionResult = getattr(self._detector, method)()
+        self.__dict__[name] = result
+        return result
+
+    def to_profile(self) -> ProjectProfile:
+        """
+        Get a full ProjectProfile, running the detectors not yet read.
+
+        Pending detectors run on a thread pool so their I/O overlaps.
+        """
+        pending = [name for name, _ in _PROFILE_DETECTORS if name not in self.__dict__]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            # Each worker caches a distinct field, so the writes don't race
+            list(pool.map(self.__getattr__, pending))
+        return ProjectProfile(**{name: self.__dict__[name] for name, _ in _PROFILE_DETECTORS})
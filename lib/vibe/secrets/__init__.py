@@ -1,15 +1,21 @@
 """Secret management utilities."""
 
 from lib.vibe.secrets.allowlist import (
+    add_many_to_allowlist,
     add_to_allowlist,
+    filter_allowed,
     is_allowed_secret,
     load_allowlist,
+    load_allowlist_indexed,
     validate_allowlist,
 )
 
 __all__ = [
     "load_allowlist",
+    "load_allowlist_indexed",
     "is_allowed_secret",
+    "filter_allowed",
     "add_to_allowlist",
+    "add_many_to_allowlist",
     "validate_allowlist",
 ]
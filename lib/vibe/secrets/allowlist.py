@@ -1,18 +1,29 @@
 """Secret allowlist management."""
 
 import fnmatch
+import functools
 import hashlib
 import json
+import os
+import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from lib.vibe.config import load_config
+from lib.vibe.config import get_config_path, load_config
+from lib.vibe.utils.fast_json import load_file
+from lib.vibe.utils.file_lock import atomic_write_json
 
 ALLOWLIST_PATH = Path(".vibe/secrets.allowlist.json")
 
+# Hash algorithm for new entries; entries written before "algo" existed are sha256
+HASH_ALGO = "blake2b"
+_LEGACY_HASH_ALGO = "sha256"
+_HASH_ALGOS = ("blake2b", "sha256")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class AllowlistEntry:
     """An entry in the secrets allowlist."""
 
@@ -21,25 +32,110 @@ class AllowlistEntry:
     added_by: str
     file_path: str | None = None
     hash: str | None = None
+    algo: str = HASH_ALGO
+
+
+def _hash_secret(secret_value: str, algo: str = HASH_ALGO) -> str:
+    """Hex digest of a secret with the given allowlist hash algorithm."""
+    return _hash_bytes(secret_value.encode(), algo)
+
+
+def _hash_bytes(data: bytes, algo: str) -> str:
+    """Hex digest of an already-encoded secret."""
+    if algo == "blake2b":
+        return hashlib.blake2b(data, digest_size=32).hexdigest()
+    if algo == "sha256":
+        return hashlib.sha256(data).hexdigest()
+    raise ValueError(f"Unsupported allowlist hash algorithm: {algo}")
+
+
+# Entries keyed by hash algorithm then hash, plus the entries that have a
+# pattern, in file order
+_AllowlistIndex = tuple[dict[str, dict[str, AllowlistEntry]], list[AllowlistEntry]]
+
+# (absolute path, st_dev, st_ino, st_mtime_ns, st_size) of a file.  The inode
+# is part of the key because atomic_write_json() replaces files, so a rewrite
+# is noticed even when it keeps the size within one mtime tick.
+_FileKey = tuple[Path, int, int, int, int]
+
+# Raw parsed allowlist, its entries and their index, keyed by the _FileKey of
+# the file they came from
+_ALLOWLIST_CACHE: tuple[_FileKey, dict[str, Any], list[AllowlistEntry], _AllowlistIndex] | None = (
+    None
+)
+
+# Allowlist path resolved from the config, keyed by the _FileKey of the config
+# file; -1s when there is no config file
+_ALLOWLIST_PATH_CACHE: tuple[_FileKey, Path] | None = None
 
 
 def get_allowlist_path() -> Path:
-    """Get the path to the allowlist file."""
+    """
+    Get the path to the allowlist file.
+
+    The path comes from the config, which is only re-read when the config
+    file is replaced or its mtime or size changes (or the working directory
+    does).
+    """
+    global _ALLOWLIST_PATH_CACHE
+    config_file = get_config_path()
+    try:
+        st = config_file.stat()
+        key: _FileKey = (
+            config_file.absolute(),
+            st.st_dev,
+            st.st_ino,
+            st.st_mtime_ns,
+            st.st_size,
+        )
+    except FileNotFoundError:
+        key = (config_file.absolute(), -1, -1, -1, -1)
+    if _ALLOWLIST_PATH_CACHE is not None and _ALLOWLIST_PATH_CACHE[0] == key:
+        return _ALLOWLIST_PATH_CACHE[1]
+
     config = load_config()
     custom_path = config.get("secrets", {}).get("allowlist_path")
-    if custom_path:
-        return Path(custom_path)
-    return ALLOWLIST_PATH
+    path = Path(custom_path) if custom_path else ALLOWLIST_PATH
+    _ALLOWLIST_PATH_CACHE = (key, path)
+    return path
 
 
-def load_allowlist() -> list[AllowlistEntry]:
-    """Load the secrets allowlist."""
+def _invalidate_allowlist_cache() -> None:
+    """Forget the parsed allowlist and its resolved path (after writes, and between tests)."""
+    global _ALLOWLIST_CACHE, _ALLOWLIST_PATH_CACHE
+    _ALLOWLIST_CACHE = None
+    _ALLOWLIST_PATH_CACHE = None
+
+
+def _load_cached() -> tuple[dict[str, Any] | None, list[AllowlistEntry], _AllowlistIndex]:
+    """
+    Load and index the secrets allowlist.
+
+    The parse is reused until the file is replaced or its mtime or size
+    changes, so checking many secrets parses the file once.
+
+    Returns:
+        Tuple of (raw parsed file or None if there is none, entries, index),
+        all shared with the cache
+    """
+    global _ALLOWLIST_CACHE
     allowlist_file = get_allowlist_path()
-    if not allowlist_file.exists():
-        return []
+    try:
+        st = allowlist_file.stat()
+    except FileNotFoundError:
+        return None, [], ({}, [])
+
+    key: _FileKey = (
+        allowlist_file.absolute(),
+        st.st_dev,
+        st.st_ino,
+        st.st_mtime_ns,
+        st.st_size,
+    )
+    if _ALLOWLIST_CACHE is not None and _ALLOWLIST_CACHE[0] == key:
+        return _ALLOWLIST_CACHE[1], _ALLOWLIST_CACHE[2], _ALLOWLIST_CACHE[3]
 
-    with open(allowlist_file) as f:
-        data = json.load(f)
+    data = load_file(allowlist_file)
 
     entries = []
     for entry in data.get("entries", []):
@@ -50,19 +146,46 @@ def load_allowlist() -> list[AllowlistEntry]:
                 added_by=entry.get("added_by", ""),
                 file_path=entry.get("file_path"),
                 hash=entry.get("hash"),
+                algo=entry.get("algo", _LEGACY_HASH_ALGO),
             )
         )
-    return entries
+
+    by_hash: dict[str, dict[str, AllowlistEntry]] = {}
+    for entry in entries:
+        # validate_allowlist() reports unsupported algorithms; they never match
+        if entry.hash and entry.algo in _HASH_ALGOS:
+            by_hash.setdefault(entry.algo, {}).setdefault(entry.hash, entry)
+    with_pattern = [e for e in entries if e.pattern]
+
+    _ALLOWLIST_CACHE = (key, data, entries, (by_hash, with_pattern))
+    return data, entries, (by_hash, with_pattern)
+
+
+def load_allowlist() -> list[AllowlistEntry]:
+    """Load the secrets allowlist."""
+    _, entries, _ = _load_cached()
+    return list(entries)
+
+
+def load_allowlist_indexed() -> tuple[dict[str, dict[str, AllowlistEntry]], list[AllowlistEntry]]:
+    """
+    Load the secrets allowlist indexed for lookups.
+
+    Returns:
+        Tuple of (entries keyed by hash algorithm then hash, entries with a
+        pattern in file order). Both are shared with the cache and must not
+        be modified.
+    """
+    _, _, index = _load_cached()
+    return index
 
 
 def save_allowlist(entries: list[AllowlistEntry]) -> None:
     """Save the secrets allowlist."""
     allowlist_file = get_allowlist_path()
-    allowlist_file.parent.mkdir(parents=True, exist_ok=True)
-
     data: dict[str, Any] = {
         "$schema": "./secrets.allowlist.schema.json",
-        "version": "1.0.0",
+        "version": "1.1.0",
         "description": "Allowlist for secrets that are intentionally committed",
         "entries": [
             {
@@ -71,14 +194,79 @@ def save_allowlist(entries: list[AllowlistEntry]) -> None:
                 "added_by": e.added_by,
                 "file_path": e.file_path,
                 "hash": e.hash,
+                "algo": e.algo,
             }
             for e in entries
         ],
     }
 
-    with open(allowlist_file, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
+    atomic_write_json(allowlist_file, data)
+    # A rewrite within the filesystem's mtime granularity could keep the same key
+    _invalidate_allowlist_cache()
+
+
+@functools.lru_cache(maxsize=1)
+def _pattern_prefilter(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """
+    Compile all allowlist patterns into one regex that matches if any does.
+
+    Uses the same translation and case normalization as fnmatch.fnmatch().
+    """
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+def _match_secret(
+    secret_value: str,
+    file_path: str | None,
+    index: _AllowlistIndex,
+    prefilter: re.Pattern[str] | None,
+) -> tuple[bool, AllowlistEntry | None]:
+    """Check one secret against a loaded allowlist index."""
+    by_hash, with_pattern = index
+
+    # Check hash match, hashing once per algorithm the allowlist uses. The
+    # secret is encoded once and the bytes shared by every algorithm.
+    if by_hash:
+        data = secret_value.encode()
+        for algo, entries_by_hash in by_hash.items():
+            entry = entries_by_hash.get(_hash_bytes(data, algo))
+            if entry is not None:
+                return True, entry
+
+    # Most secrets match no pattern; one regex pass rules them all out
+    if prefilter is None or not prefilter.match(os.path.normcase(secret_value)):
+        return False, None
+
+    for entry in with_pattern:
+        # Check pattern match
+        if fnmatch.fnmatch(secret_value, entry.pattern):
+            # If file_path is specified in entry, it must match
+            if entry.file_path and file_path and entry.file_path != file_path:
+                continue
+            return True, entry
+
+    return False, None
+
+
+def filter_allowed(
+    candidates: Iterable[tuple[str, str | None]],
+) -> list[tuple[bool, AllowlistEntry | None]]:
+    """
+    Check a batch of secrets against the allowlist, loading it once.
+
+    Args:
+        candidates: (secret_value, file_path) pairs, as for is_allowed_secret
+
+    Returns:
+        One (is_allowed, matching_entry) tuple per candidate, in order
+    """
+    index = load_allowlist_indexed()
+    by_hash, with_pattern = index
+    if not by_hash and not with_pattern:
+        # Nothing to hash or match against (no allowlist, or no usable entries)
+        return [(False, None) for _ in candidates]
+    prefilter = _pattern_prefilter(tuple(e.pattern for e in with_pattern)) if with_pattern else None
+    return [_match_secret(value, path, index, prefilter) for value, path in candidates]
 
 
 def is_allowed_secret(
@@ -95,22 +283,7 @@ def is_allowed_secret(
     Returns:
         Tuple of (is_allowed, matching_entry)
     """
-    entries = load_allowlist()
-    secret_hash = hashlib.sha256(secret_value.encode()).hexdigest()
-
-    for entry in entries:
-        # Check hash match
-        if entry.hash and entry.hash == secret_hash:
-            return True, entry
-
-        # Check pattern match
-        if entry.pattern and fnmatch.fnmatch(secret_value, entry.pattern):
-            # If file_path is specified in entry, it must match
-            if entry.file_path and file_path and entry.file_path != file_path:
-                continue
-            return True, entry
-
-    return False, None
+    return filter_allowed([(secret_value, file_path)])[0]
 
 
 def add_to_allowlist(
@@ -133,20 +306,32 @@ def add_to_allowlist(
     Returns:
         The created AllowlistEntry
     """
-    entries = load_allowlist()
-
     entry = AllowlistEntry(
         pattern=pattern,
         reason=reason,
         added_by=added_by,
         file_path=file_path,
-        hash=hashlib.sha256(secret_value.encode()).hexdigest() if secret_value else None,
+        hash=_hash_secret(secret_value) if secret_value else None,
     )
+    return add_many_to_allowlist([entry])[0]
+
 
-    entries.append(entry)
-    save_allowlist(entries)
+def add_many_to_allowlist(new_entries: Iterable[AllowlistEntry]) -> list[AllowlistEntry]:
+    """
+    Add several entries to the secrets allowlist with one load and one save.
+
+    Entries carrying a hash must already hold the digest (see _hash_secret).
+
+    Args:
+        new_entries: Entries to append, in order
 
-    return entry
+    Returns:
+        The added entries
+    """
+    added = list(new_entries)
+    if added:
+        save_allowlist(load_allowlist() + added)
+    return added
 
 
 def validate_allowlist() -> tuple[bool, list[str]]:
@@ -157,23 +342,24 @@ def validate_allowlist() -> tuple[bool, list[str]]:
         Tuple of (is_valid, list of issues)
     """
     issues = []
-    allowlist_file = get_allowlist_path()
-
-    if not allowlist_file.exists():
-        return True, []  # No allowlist is valid
 
+    # Shares the parse with the allowlist loader
     try:
-        with open(allowlist_file) as f:
-            data = json.load(f)
+        data, _, _ = _load_cached()
     except json.JSONDecodeError as e:
         return False, [f"Invalid JSON: {e}"]
 
+    if data is None:
+        return True, []  # No allowlist is valid
+
     if "entries" not in data:
         issues.append("Missing 'entries' key")
 
     for i, entry in enumerate(data.get("entries", [])):
         if not entry.get("pattern") and not entry.get("hash"):
             issues.append(f"Entry {i}: must have 'pattern' or 'hash'")
+        if entry.get("algo", _LEGACY_HASH_ALGO) not in _HASH_ALGOS:
+            issues.append(f"Entry {i}: unsupported 'algo' {entry['algo']!r}")
         if not entry.get("reason"):
             issues.append(f"Entry {i}: missing 'reason'")
         if not entry.get("added_by"):
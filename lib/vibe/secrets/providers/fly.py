@@ -1,8 +1,15 @@
 """Fly.io secrets provider."""
 
+import re
 import subprocess
+from functools import cached_property
 
 from lib.vibe.secrets.providers.base import Secret, SecretProvider
+from lib.vibe.utils.fast_json import loads
+
+# A KEY=value line: the first "=" splits it; blank lines, lines without "="
+# and lines whose first non-blank character is "#" don't match
+_ENV_LINE = re.compile(r"^(?![^\S\n]*#)([^=\n]*)=(.*)$", re.MULTILINE)
 
 
 class FlySecretsProvider(SecretProvider):
@@ -36,6 +43,30 @@ class FlySecretsProvider(SecretProvider):
     def name(self) -> str:
         return "fly"
 
+    # argv pieces are built on first use and reused; they only depend on the
+    # CLI name and app, which don't change after construction.
+
+    @cached_property
+    def _list_argv(self) -> tuple[str, ...]:
+        return (self._fly_cmd, "secrets", "list", "-a", self._app_name or "", "--json")
+
+    @cached_property
+    def _deploy_argv(self) -> tuple[str, ...]:
+        return (self._fly_cmd, "secrets", "deploy", "-a", self._app_name or "")
+
+    @cached_property
+    def _set_argv_prefix(self) -> tuple[str, ...]:
+        return (self._fly_cmd, "secrets", "set")
+
+    @cached_property
+    def _unset_argv_prefix(self) -> tuple[str, ...]:
+        return (self._fly_cmd, "secrets", "unset")
+
+    @cached_property
+    def _staged_app_args(self) -> tuple[str, ...]:
+        # Stage the change, don't deploy yet
+        return ("-a", self._app_name or "", "--stage")
+
     def authenticate(self) -> bool:
         """Check if Fly CLI is authenticated."""
         try:
@@ -57,16 +88,12 @@ class FlySecretsProvider(SecretProvider):
         if not self._app_name:
             raise RuntimeError("App name not configured. Set app_name in provider config.")
 
-        cmd = [self._fly_cmd, "secrets", "list", "-a", self._app_name, "--json"]
-
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(self._list_argv, capture_output=True, text=True)
             if result.returncode != 0:
                 raise RuntimeError(f"Failed to list secrets: {result.stderr}")
 
-            import json
-
-            secrets_data = json.loads(result.stdout) if result.stdout.strip() else []
+            secrets_data = loads(result.stdout) if result.stdout.strip() else []
             return [
                 Secret(
                     name=s.get("Name", ""),
@@ -95,18 +122,20 @@ class FlySecretsProvider(SecretProvider):
 
     def set_secret(self, name: str, value: str, environment: str) -> bool:
         """Set a Fly.io secret."""
+        return self._set_secrets({name: value})
+
+    def _set_secrets(self, secrets: dict[str, str]) -> bool:
+        """
+        Stage several secrets with a single ``fly secrets set``.
+
+        Fly applies all pairs of one invocation together, so the result
+        covers every secret passed in.
+        """
         if not self._app_name:
             raise RuntimeError("App name not configured. Set app_name in provider config.")
 
-        cmd = [
-            self._fly_cmd,
-            "secrets",
-            "set",
-            f"{name}={value}",
-            "-a",
-            self._app_name,
-            "--stage",  # Stage the change, don't deploy yet
-        ]
+        pairs = [f"{name}={value}" for name, value in secrets.items()]
+        cmd = [*self._set_argv_prefix, *pairs, *self._staged_app_args]
 
         try:
             result = subprocess.run(cmd, capture_output=True, text=True)
@@ -121,15 +150,7 @@ class FlySecretsProvider(SecretProvider):
         if not self._app_name:
             raise RuntimeError("App name not configured. Set app_name in provider config.")
 
-        cmd = [
-            self._fly_cmd,
-            "secrets",
-            "unset",
-            name,
-            "-a",
-            self._app_name,
-            "--stage",
-        ]
+        cmd = [*self._unset_argv_prefix, name, *self._staged_app_args]
 
         try:
             result = subprocess.run(cmd, capture_output=True, text=True)
@@ -145,37 +166,32 @@ class FlySecretsProvider(SecretProvider):
 
         Returns a dict mapping secret names to success status.
         """
-        results: dict[str, bool] = {}
-
         # Parse the env file
         secrets = self._parse_env_file(env_file)
+        if not secrets:
+            return {}
 
-        for name, value in secrets.items():
-            try:
-                success = self.set_secret(name, value, environment)
-                results[name] = success
-            except (subprocess.CalledProcessError, OSError, RuntimeError):
-                results[name] = False
+        # One CLI run for the whole file rather than a process start and API
+        # round-trip per secret
+        try:
+            success = self._set_secrets(secrets)
+        except (subprocess.CalledProcessError, OSError, RuntimeError):
+            success = False
 
-        return results
+        return dict.fromkeys(secrets, success)
 
     def _parse_env_file(self, env_file: str) -> dict[str, str]:
         """Parse a .env file into a dict."""
-        secrets: dict[str, str] = {}
         try:
             with open(env_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if "=" in line:
-                        key, _, value = line.partition("=")
-                        # Remove quotes if present
-                        value = value.strip().strip('"').strip("'")
-                        secrets[key.strip()] = value
+                text = f.read()
         except FileNotFoundError:
             raise RuntimeError(f"Env file not found: {env_file}")
-        return secrets
+        # Remove quotes if present
+        return {
+            key.strip(): value.strip().strip('"').strip("'")
+            for key, value in _ENV_LINE.findall(text)
+        }
 
     def deploy(self) -> bool:
         """
@@ -186,10 +202,8 @@ class FlySecretsProvider(SecretProvider):
         if not self._app_name:
             raise RuntimeError("App name not configured.")
 
-        cmd = [self._fly_cmd, "secrets", "deploy", "-a", self._app_name]
-
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(self._deploy_argv, capture_output=True, text=True)
             return result.returncode == 0
         except FileNotFoundError:
             return False
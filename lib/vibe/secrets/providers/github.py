@@ -1,5 +1,10 @@
 """GitHub Actions secrets provider (stub)."""
 
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+
 from lib.vibe.secrets.providers.base import Secret, SecretProvider
 
 
@@ -18,10 +23,13 @@ class GitHubSecretsProvider(SecretProvider):
     def name(self) -> str:
         return "github"
 
+    @cached_property
+    def _repo_args(self) -> tuple[str, ...]:
+        """``-R owner/repo``, formatted once rather than per command."""
+        return ("-R", f"{self._owner}/{self._repo}")
+
     def authenticate(self) -> bool:
         """Check if gh CLI is authenticated."""
-        import subprocess
-
         try:
             result = subprocess.run(
                 ["gh", "auth", "status"],
@@ -34,13 +42,11 @@ class GitHubSecretsProvider(SecretProvider):
 
     def list_secrets(self, environment: str | None = None) -> list[Secret]:
         """List GitHub Actions secrets."""
-        import subprocess
-
         if not self._owner or not self._repo:
             return []
 
         try:
-            cmd = ["gh", "secret", "list", "-R", f"{self._owner}/{self._repo}"]
+            cmd = ["gh", "secret", "list", *self._repo_args]
             if environment:
                 cmd.extend(["--env", environment])
 
@@ -73,13 +79,11 @@ class GitHubSecretsProvider(SecretProvider):
 
     def set_secret(self, name: str, value: str, environment: str) -> bool:
         """Set a GitHub Actions secret."""
-        import subprocess
-
         if not self._owner or not self._repo:
             return False
 
         try:
-            cmd = ["gh", "secret", "set", name, "-R", f"{self._owner}/{self._repo}"]
+            cmd = ["gh", "secret", "set", name, *self._repo_args]
             if environment != "repository":
                 cmd.extend(["--env", environment])
 
@@ -90,13 +94,11 @@ class GitHubSecretsProvider(SecretProvider):
 
     def delete_secret(self, name: str, environment: str) -> bool:
         """Delete a GitHub Actions secret."""
-        import subprocess
-
         if not self._owner or not self._repo:
             return False
 
         try:
-            cmd = ["gh", "secret", "delete", name, "-R", f"{self._owner}/{self._repo}"]
+            cmd = ["gh", "secret", "delete", name, *self._repo_args]
             if environment != "repository":
                 cmd.extend(["--env", environment])
 
@@ -107,14 +109,14 @@ class GitHubSecretsProvider(SecretProvider):
 
     def sync_from_local(self, env_file: str, environment: str) -> dict[str, bool]:
         """Sync secrets from a local env file to GitHub."""
-        from pathlib import Path
-
-        results: dict[str, bool] = {}
         env_path = Path(env_file)
 
         if not env_path.exists():
-            return results
+            return {}
 
+        # A repeated key keeps its last value, as when the lines were set in
+        # order; setting it once also keeps parallel writes from racing.
+        secrets: dict[str, str] = {}
         with open(env_path) as f:
             for line in f:
                 line = line.strip()
@@ -122,8 +124,9 @@ class GitHubSecretsProvider(SecretProvider):
                     continue
                 if "=" in line:
                     key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip("\"'")
-                    results[key] = self.set_secret(key, value, environment)
+                    secrets[key.strip()] = value.strip().strip("\"'")
 
-        return results
+        # Each `gh secret set` is an independent network round-trip
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            ok = pool.map(lambda name: self.set_secret(name, secrets[name], environment), secrets)
+            return dict(zip(secrets, ok, strict=True))
@@ -1,11 +1,12 @@
 """Local state management for .vibe/local_state.json."""
 
 import copy
-import json
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from lib.vibe.utils.fast_json import loads
 from lib.vibe.utils.file_lock import atomic_write_json, file_lock
 
 STATE_PATH = Path(".vibe/local_state.json")
@@ -34,12 +35,12 @@ def state_exists(base_path: Path | None = None) -> bool:
 def load_state(base_path: Path | None = None) -> dict[str, Any]:
     """Load local state from .vibe/local_state.json."""
     state_file = get_state_path(base_path)
-    if not state_file.exists():
+    try:
+        with open(state_file, "rb") as f:
+            result: dict[str, Any] = loads(f.read())
+    except FileNotFoundError:
         return copy.deepcopy(DEFAULT_STATE)
-
-    with open(state_file) as f:
-        result: dict[str, Any] = json.load(f)
-        return result
+    return result
 
 
 def save_state(state: dict[str, Any], base_path: Path | None = None) -> None:
@@ -59,12 +60,20 @@ def update_state(updates: dict[str, Any], base_path: Path | None = None) -> dict
 
 
 def _deep_update(base: dict, updates: dict) -> None:
-    """Recursively update nested dictionaries."""
-    for key, value in updates.items():
-        if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-            _deep_update(base[key], value)
-        else:
-            base[key] = value
+    """Update nested dictionaries in place, merging dicts at every level.
+
+    Walks with an explicit stack, so nesting depth isn't bounded by the
+    recursion limit.
+    """
+    stack = [(base, updates)]
+    while stack:
+        target, changes = stack.pop()
+        for key, value in changes.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                stack.append((current, value))
+            else:
+                target[key] = value
 
 
 def add_worktree(worktree_path: str, base_path: Path | None = None) -> None:
@@ -79,11 +88,21 @@ def add_worktree(worktree_path: str, base_path: Path | None = None) -> None:
 
 def remove_worktree(worktree_path: str, base_path: Path | None = None) -> None:
     """Remove a worktree from the active worktrees list."""
+    remove_worktrees([worktree_path], base_path)
+
+
+def remove_worktrees(worktree_paths: Iterable[str], base_path: Path | None = None) -> None:
+    """Remove several worktrees from the active worktrees list in one write."""
+    drop = set(worktree_paths)
+    if not drop:
+        return
     state_file = get_state_path(base_path)
     with file_lock(state_file):
         state = load_state(base_path)
-        if worktree_path in state["active_worktrees"]:
-            state["active_worktrees"].remove(worktree_path)
+        active = state["active_worktrees"]
+        kept = [path for path in active if path not in drop]
+        if len(kept) != len(active):
+            state["active_worktrees"] = kept
             save_state(state, base_path)
 
 
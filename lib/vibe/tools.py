@@ -1,13 +1,19 @@
 """Development tools detection and validation."""
 
+import functools
+import os
 import platform
 import re
 import shutil
 import subprocess
 import sys
-from dataclasses import dataclass
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from types import MappingProxyType
+
+import click
 
 
 class ToolStatus(Enum):
@@ -30,7 +36,26 @@ class ToolInfo:
     message: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class ToolDef:
+    """Static definition of a development tool: how to find, version and install it."""
+
+    commands: tuple[str, ...]
+    description: str = ""
+    install: Mapping[str, str] = field(default_factory=dict)
+    version_flag: str = "--version"
+    required: bool = False
+    min_version: tuple[int, ...] | None = None
+    auth_check: tuple[str, ...] | None = None
+    auth_hint: str = ""
+
+    def __post_init__(self) -> None:
+        # Frozen covers the fields; make the install hints read-only too
+        object.__setattr__(self, "install", MappingProxyType(dict(self.install)))
+
+
 # Platform detection
+@functools.cache
 def get_platform() -> str:
     """Get the current platform (macos, linux, windows)."""
     system = platform.system().lower()
@@ -44,146 +69,179 @@ def get_platform() -> str:
 
 
 # Tool definitions with install instructions per platform
-TOOL_DEFINITIONS: dict[str, dict[str, Any]] = {
-    "git": {
-        "commands": ["git"],
-        "version_flag": "--version",
-        "required": True,
-        "description": "Version control",
-        "install": {
-            "macos": "xcode-select --install",
-            "linux": "sudo apt install git  # or: sudo yum install git",
-            "windows": "Download from https://git-scm.com/download/win",
-        },
-    },
-    "python": {
-        "commands": ["python3", "python"],
-        "version_flag": "--version",
-        "required": True,
-        "min_version": (3, 11),
-        "description": "Python runtime",
-        "install": {
-            "macos": "brew install python@3.12",
-            "linux": "sudo apt install python3.12  # or use pyenv",
-            "windows": "Download from https://python.org/downloads/",
-        },
-    },
-    "gh": {
-        "commands": ["gh"],
-        "version_flag": "--version",
-        "auth_check": ["gh", "auth", "status"],
-        "required": False,
-        "description": "GitHub CLI",
-        "install": {
-            "macos": "brew install gh",
-            "linux": "See https://cli.github.com/",
-            "windows": "winget install GitHub.cli",
-        },
-        "auth_hint": "gh auth login",
-    },
-    "npm": {
-        "commands": ["npm"],
-        "version_flag": "--version",
-        "required": False,
-        "description": "Node.js package manager",
-        "install": {
-            "macos": "brew install node",
-            "linux": "See https://nodejs.org/",
-            "windows": "Download from https://nodejs.org/",
-        },
-    },
-    "fly": {
-        "commands": ["fly", "flyctl"],
-        "version_flag": "version",
-        "auth_check": ["fly", "auth", "whoami"],
-        "required": False,
-        "description": "Fly.io CLI",
-        "install": {
-            "macos": "brew install flyctl",
-            "linux": "curl -L https://fly.io/install.sh | sh",
-            "windows": 'powershell -Command "iwr https://fly.io/install.ps1 -useb | iex"',
-        },
-        "auth_hint": "fly auth login",
-    },
-    "vercel": {
-        "commands": ["vercel"],
-        "version_flag": "--version",
-        "auth_check": ["vercel", "whoami"],
-        "required": False,
-        "description": "Vercel CLI",
-        "install": {
-            "all": "npm install -g vercel",
-        },
-        "auth_hint": "vercel login",
-    },
-    "supabase": {
-        "commands": ["supabase"],
-        "version_flag": "--version",
-        "required": False,
-        "description": "Supabase CLI",
-        "install": {
-            "macos": "brew install supabase/tap/supabase",
-            "linux": "brew install supabase/tap/supabase  # or: npm install -g supabase",
-            "windows": "npm install -g supabase",
-        },
-        "auth_hint": "supabase login",
-    },
-    "neonctl": {
-        "commands": ["neonctl"],
-        "version_flag": "--version",
-        "required": False,
-        "description": "Neon database CLI",
-        "install": {
-            "all": "npm install -g neonctl",
-        },
-        "auth_hint": "neonctl auth",
-    },
-}
-
-
-def find_command(commands: list[str]) -> str | None:
+TOOL_DEFINITIONS: Mapping[str, ToolDef] = MappingProxyType(
+    {
+        "git": ToolDef(
+            commands=("git",),
+            required=True,
+            description="Version control",
+            install={
+                "macos": "xcode-select --install",
+                "linux": "sudo apt install git  # or: sudo yum install git",
+                "windows": "Download from https://git-scm.com/download/win",
+            },
+        ),
+        "python": ToolDef(
+            commands=("python3", "python"),
+            required=True,
+            min_version=(3, 11),
+            description="Python runtime",
+            install={
+                "macos": "brew install python@3.12",
+                "linux": "sudo apt install python3.12  # or use pyenv",
+                "windows": "Download from https://python.org/downloads/",
+            },
+        ),
+        "gh": ToolDef(
+            commands=("gh",),
+            auth_check=("gh", "auth", "status"),
+            description="GitHub CLI",
+            install={
+                "macos": "brew install gh",
+                "linux": "See https://cli.github.com/",
+                "windows": "winget install GitHub.cli",
+            },
+            auth_hint="gh auth login",
+        ),
+        "npm": ToolDef(
+            commands=("npm",),
+            description="Node.js package manager",
+            install={
+                "macos": "brew install node",
+                "linux": "See https://nodejs.org/",
+                "windows": "Download from https://nodejs.org/",
+            },
+        ),
+        "fly": ToolDef(
+            commands=("fly", "flyctl"),
+            version_flag="version",
+            auth_check=("fly", "auth", "whoami"),
+            description="Fly.io CLI",
+            install={
+                "macos": "brew install flyctl",
+                "linux": "curl -L https://fly.io/install.sh | sh",
+                "windows": 'powershell -Command "iwr https://fly.io/install.ps1 -useb | iex"',
+            },
+            auth_hint="fly auth login",
+        ),
+        "vercel": ToolDef(
+            commands=("vercel",),
+            auth_check=("vercel", "whoami"),
+            description="Vercel CLI",
+            install={
+                "all": "npm install -g vercel",
+            },
+            auth_hint="vercel login",
+        ),
+        "supabase": ToolDef(
+            commands=("supabase",),
+            description="Supabase CLI",
+            install={
+                "macos": "brew install supabase/tap/supabase",
+                "linux": "brew install supabase/tap/supabase  # or: npm install -g supabase",
+                "windows": "npm install -g supabase",
+            },
+            auth_hint="supabase login",
+        ),
+        "neonctl": ToolDef(
+            commands=("neonctl",),
+            description="Neon database CLI",
+            install={
+                "all": "npm install -g neonctl",
+            },
+            auth_hint="neonctl auth",
+        ),
+    }
+)
+
+
+def find_command(commands: Sequence[str]) -> str | None:
     """Find the first available command from a list of alternatives."""
+    path_env = os.environ.get("PATH")
+    on_path = _path_names(path_env)
     for cmd in commands:
-        if shutil.which(cmd):
+        if (on_path is None or cmd in on_path) and _which(cmd, path_env):
             return cmd
     return None
 
 
+@functools.cache
+def _path_names(path_env: str | None) -> frozenset[str] | None:
+    """
+    Names of all entries in the PATH directories, listed once per PATH value.
+
+    Lets find_command() rule out missing tools without a stat() per PATH
+    directory; names that are present are still confirmed by shutil.which().
+    Returns None (no prefilter) where a plain name scan can't be trusted:
+    Windows adds PATHEXT suffixes and searches the current directory, and
+    an empty PATH entry also means the current directory.
+    """
+    if os.name == "nt" or not path_env:
+        return None
+    directories = path_env.split(os.pathsep)
+    if "" in directories:
+        return None
+    names: set[str] = set()
+    for directory in directories:
+        try:
+            with os.scandir(directory) as entries:
+                names.update(entry.name for entry in entries)
+        except OSError:
+            continue
+    return frozenset(names)
+
+
+@functools.cache
+def _which(cmd: str, path_env: str | None) -> str | None:
+    """shutil.which(), remembered per command and PATH value (the cache key)."""
+    return shutil.which(cmd)
+
+
 def get_version(command: str, version_flag: str) -> str | None:
     """Get version string from a command."""
     try:
         result = subprocess.run(
             [command, version_flag],
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
             timeout=10,
         )
         if result.returncode == 0:
-            # Extract first line, clean up common prefixes
+            # Version output is ASCII: work on the raw bytes and decode
+            # only the token we return.
             output = result.stdout.strip() or result.stderr.strip()
-            first_line = output.split("\n")[0]
+            first_line = output.partition(b"\n")[0]
             # Remove common prefixes like "git version ", "Python ", etc.
-            for prefix in ["git version ", "Python ", "npm ", "v"]:
-                if first_line.startswith(prefix):
-                    first_line = first_line[len(prefix) :]
-            return first_line.split()[0] if first_line else None
+            for prefix in (b"git version ", b"Python ", b"npm ", b"v"):
+                first_line = first_line.removeprefix(prefix)
+            fields = first_line.split()
+            return fields[0].decode("ascii", "replace") if fields else None
     except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
         pass
     return None
 
 
-def check_auth(auth_command: list[str]) -> bool:
-    """Check if a tool is authenticated."""
+def check_auth(auth_command: Sequence[str], command: str | None = None) -> bool:
+    """
+    Check if a tool is authenticated.
+
+    Args:
+        auth_command: Auth check command line, e.g. ["gh", "auth", "status"]
+        command: Already-resolved executable to run in place of
+            auth_command[0] (e.g. "flyctl" when "fly" isn't installed)
+    """
     try:
         # Use the actual command that's available
-        cmd = find_command([auth_command[0]])
+        cmd = command or find_command([auth_command[0]])
         if not cmd:
             return False
-        actual_command = [cmd] + auth_command[1:]
+        actual_command = [cmd, *auth_command[1:]]
+        # Only the exit status matters, so no pipes are set up
         result = subprocess.run(
             actual_command,
-            capture_output=True,
-            text=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=10,
         )
         return result.returncode == 0
@@ -191,10 +249,15 @@ def check_auth(auth_command: list[str]) -> bool:
         return False
 
 
+@functools.cache
 def check_tool(tool_name: str) -> ToolInfo:
     """
     Check if a tool is installed and optionally authenticated.
 
+    Results are memoized for the life of the process: doctor and wizard
+    prerequisite checks ask about the same tools repeatedly, and each
+    probe costs one or two subprocesses.
+
     Args:
         tool_name: Name of the tool to check (must be in TOOL_DEFINITIONS)
 
@@ -209,11 +272,9 @@ def check_tool(tool_name: str) -> ToolInfo:
         )
 
     definition = TOOL_DEFINITIONS[tool_name]
-    commands = definition["commands"]
-    version_flag = definition.get("version_flag", "--version")
 
     # Find the command
-    cmd = find_command(commands)
+    cmd = find_command(definition.commands)
     if not cmd:
         return ToolInfo(
             name=tool_name,
@@ -222,19 +283,19 @@ def check_tool(tool_name: str) -> ToolInfo:
         )
 
     # Get version
-    version = get_version(cmd, version_flag)
+    version = get_version(cmd, definition.version_flag)
 
     # Check authentication if applicable
-    auth_check = definition.get("auth_check")
+    auth_check = definition.auth_check
     if auth_check:
-        if check_auth(auth_check):
+        if check_auth(auth_check, cmd):
             return ToolInfo(
                 name=tool_name,
                 status=ToolStatus.AUTHENTICATED,
                 version=version,
             )
         else:
-            auth_hint = definition.get("auth_hint", "")
+            auth_hint = definition.auth_hint
             return ToolInfo(
                 name=tool_name,
                 status=ToolStatus.NOT_AUTHENTICATED,
@@ -254,8 +315,7 @@ def get_install_hint(tool_name: str) -> str:
     if tool_name not in TOOL_DEFINITIONS:
         return f"Install {tool_name}"
 
-    definition = TOOL_DEFINITIONS[tool_name]
-    install = definition.get("install", {})
+    install = TOOL_DEFINITIONS[tool_name].install
     current_platform = get_platform()
 
     # Check for platform-specific or 'all' instruction
@@ -281,22 +341,35 @@ def check_required_tools(tool_names: list[str]) -> tuple[bool, list[ToolInfo]]:
     Returns:
         Tuple of (all_ok, list of ToolInfo)
     """
-    results = []
+    results = _check_tools(tool_names)
     all_ok = True
 
-    for name in tool_names:
-        info = check_tool(name)
-        results.append(info)
-
+    for name, info in zip(tool_names, results, strict=True):
         # Check if this is a required tool that's missing
-        definition = TOOL_DEFINITIONS.get(name, {})
-        if definition.get("required", False):
+        definition = TOOL_DEFINITIONS.get(name)
+        if definition is not None and definition.required:
             if info.status in (ToolStatus.NOT_INSTALLED, ToolStatus.ERROR):
                 all_ok = False
 
     return all_ok, results
 
 
+def _check_tools(tool_names: list[str]) -> list[ToolInfo]:
+    """
+    Check several tools concurrently, returning results in input order.
+
+    Each probe mostly waits on subprocesses (and the network for auth
+    checks), so threads overlap them; the slowest tool bounds wall time.
+    A thread pool is used rather than asyncio subprocesses: the probes are
+    a handful of short-lived children, and keeping them on subprocess.run()
+    leaves check_tool() synchronous and callable from any context.
+    """
+    if len(tool_names) <= 1:
+        return [check_tool(name) for name in tool_names]
+    with ThreadPoolExecutor(max_workers=min(len(tool_names), 8)) as pool:
+        return list(pool.map(check_tool, tool_names))
+
+
 def require_tool(tool_name: str, need_auth: bool = False) -> tuple[bool, str | None]:
     """
     Check that a tool is available (and optionally authenticated).
@@ -357,6 +430,11 @@ def require_interactive(wizard_name: str) -> tuple[bool, str | None]:
 # Input Validation
 # =============================================================================
 
+_GH_OWNER_RE = re.compile(r"^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$")
+_GH_REPO_RE = re.compile(r"^[a-zA-Z0-9._-]+$")
+_UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+_SHORT_ID_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+
 
 def validate_github_owner(value: str) -> tuple[bool, str]:
     """
@@ -367,7 +445,7 @@ def validate_github_owner(value: str) -> tuple[bool, str]:
     """
     if not value:
         return False, "Owner cannot be empty"
-    if not re.match(r"^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$", value):
+    if not _GH_OWNER_RE.match(value):
         return False, "Owner must be alphanumeric with optional hyphens (not at start/end)"
     if len(value) > 39:
         return False, "Owner must be 39 characters or less"
@@ -383,7 +461,7 @@ def validate_github_repo(value: str) -> tuple[bool, str]:
     """
     if not value:
         return False, "Repository name cannot be empty"
-    if not re.match(r"^[a-zA-Z0-9._-]+$", value):
+    if not _GH_REPO_RE.match(value):
         return False, "Repository name can only contain alphanumeric, dots, hyphens, underscores"
     if value.startswith("."):
         return False, "Repository name cannot start with a dot"
@@ -419,12 +497,11 @@ def validate_linear_team_id(value: str) -> tuple[bool, str]:
         return True, ""  # Optional field
 
     # UUID format
-    uuid_pattern = r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
-    if re.match(uuid_pattern, value.lower()):
+    if _UUID_RE.match(value.lower()):
         return True, ""
 
     # Short ID format (alphanumeric)
-    if re.match(r"^[a-zA-Z0-9_-]+$", value) and len(value) <= 50:
+    if len(value) <= 50 and _SHORT_ID_RE.match(value):
         return True, ""
 
     return False, "Team ID should be a UUID or alphanumeric identifier"
@@ -439,84 +516,121 @@ def get_default_branch() -> str:
     """
     Get the default branch name (main or master).
 
+    Detected once per working directory for the life of the process.
+
     Returns:
         Branch name, defaults to "main" if detection fails
     """
-    # Try to get from remote HEAD
-    try:
-        result = subprocess.run(
-            ["git", "symbolic-ref", "refs/remotes/origin/HEAD"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            # Output is like "refs/remotes/origin/main"
-            return result.stdout.strip().split("/")[-1]
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
-        pass
+    return _default_branch(os.getcwd())
 
-    # Try to check if main exists
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--verify", "origin/main"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return "main"
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
-        pass
 
-    # Check for master
+_ORIGIN_PREFIX = "refs/remotes/origin/"
+
+
+@functools.cache
+def _default_branch(cwd: str) -> str:
+    """Detect the default branch of the repository at *cwd* (the cache key)."""
+    # One for-each-ref lists whichever of origin/HEAD, origin/main and
+    # origin/master exist, along with what origin/HEAD points at.
     try:
         result = subprocess.run(
-            ["git", "rev-parse", "--verify", "origin/master"],
+            [
+                "git",
+                "for-each-ref",
+                "--format=%(refname) %(symref)",
+                f"{_ORIGIN_PREFIX}HEAD",
+                f"{_ORIGIN_PREFIX}main",
+                f"{_ORIGIN_PREFIX}master",
+            ],
             capture_output=True,
             text=True,
             timeout=5,
         )
-        if result.returncode == 0:
-            return "master"
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
-        pass
+    except (subprocess.TimeoutExpired, OSError):
+        return "main"
+    if result.returncode != 0:
+        return "main"
+
+    refs = dict(line.partition(" ")[::2] for line in result.stdout.splitlines())
+    # Prefer the remote HEAD, e.g. "refs/remotes/origin/HEAD refs/remotes/origin/main"
+    head_target = refs.get(f"{_ORIGIN_PREFIX}HEAD", "")
+    if head_target.startswith(_ORIGIN_PREFIX):
+        return head_target.removeprefix(_ORIGIN_PREFIX)
+    if f"{_ORIGIN_PREFIX}main" in refs:
+        return "main"
+    if f"{_ORIGIN_PREFIX}master" in refs:
+        return "master"
 
     # Default to main
     return "main"
 
 
+def _reset_tool_cache() -> None:
+    """Forget memoized tool, platform and default-branch results (for tests)."""
+    check_tool.cache_clear()
+    _which.cache_clear()
+    _path_names.cache_clear()
+    get_platform.cache_clear()
+    _default_branch.cache_clear()
+
+
 # =============================================================================
 # Doctor Helpers
 # =============================================================================
 
 
+def _version_suffix(info: ToolInfo) -> str:
+    return f" ({info.version})" if info.version else ""
+
+
+def _hint_lines(info: ToolInfo) -> list[str]:
+    return [f"      \u2192 {info.message}"] if info.message else []
+
+
+def _format_authenticated(info: ToolInfo, description: str, required: bool) -> list[str]:
+    return [f"  \u2713 {description}: authenticated{_version_suffix(info)}"]
+
+
+def _format_installed(info: ToolInfo, description: str, required: bool) -> list[str]:
+    return [f"  \u2713 {description}: installed{_version_suffix(info)}"]
+
+
+def _format_not_authenticated(info: ToolInfo, description: str, required: bool) -> list[str]:
+    return [
+        f"  \u26a0 {description}: not authenticated{_version_suffix(info)}",
+        *_hint_lines(info),
+    ]
+
+
+def _format_not_installed(info: ToolInfo, description: str, required: bool) -> list[str]:
+    marker = "\u2717" if required else "\u25cb"
+    suffix = "" if required else " (optional)"
+    return [f"  {marker} {description}: not installed{suffix}", *_hint_lines(info)]
+
+
+def _format_error(info: ToolInfo, description: str, required: bool) -> list[str]:
+    return [f"  ? {description}: {info.message}"]
+
+
+# Status -> formatter returning the doctor output lines for one tool
+_STATUS_FORMATTERS: dict[ToolStatus, Callable[[ToolInfo, str, bool], list[str]]] = {
+    ToolStatus.AUTHENTICATED: _format_authenticated,
+    ToolStatus.INSTALLED: _format_installed,
+    ToolStatus.NOT_AUTHENTICATED: _format_not_authenticated,
+    ToolStatus.NOT_INSTALLED: _format_not_installed,
+    ToolStatus.ERROR: _format_error,
+}
+
+
 def print_tool_status(tool_names: list[str]) -> None:
     """Print a formatted status of tools (for doctor command)."""
-    import click
-
-    for name in tool_names:
-        info = check_tool(name)
-        definition = TOOL_DEFINITIONS.get(name, {})
-        description = definition.get("description", name)
-
-        if info.status == ToolStatus.AUTHENTICATED:
-            version_str = f" ({info.version})" if info.version else ""
-            click.echo(f"  \u2713 {description}: authenticated{version_str}")
-        elif info.status == ToolStatus.INSTALLED:
-            version_str = f" ({info.version})" if info.version else ""
-            click.echo(f"  \u2713 {description}: installed{version_str}")
-        elif info.status == ToolStatus.NOT_AUTHENTICATED:
-            version_str = f" ({info.version})" if info.version else ""
-            click.echo(f"  \u26a0 {description}: not authenticated{version_str}")
-            if info.message:
-                click.echo(f"      \u2192 {info.message}")
-        elif info.status == ToolStatus.NOT_INSTALLED:
-            required = definition.get("required", False)
-            marker = "\u2717" if required else "\u25cb"
-            suffix = "" if required else " (optional)"
-            click.echo(f"  {marker} {description}: not installed{suffix}")
-            if info.message:
-                click.echo(f"      \u2192 {info.message}")
+    echo = click.echo
+
+    for name, info in zip(tool_names, _check_tools(tool_names), strict=True):
+        definition = TOOL_DEFINITIONS.get(name)
+        if definition is None:
+            description, required = name, False
         else:
-            click.echo(f"  ? {description}: {info.message}")
+            description, required = definition.description, definition.required
+        for line in _STATUS_FORMATTERS[info.status](info, description, required):
+            echo(line)
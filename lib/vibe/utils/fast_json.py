@@ -0,0 +1,53 @@
+"""JSON encoding and decoding, backed by orjson when it is installed."""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Below this size a plain read() is cheaper than setting up a mapping
+_MMAP_MIN_SIZE = 4096
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON text or UTF-8 bytes.
+
+    Raises json.JSONDecodeError on invalid input (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: Path | str) -> Any:
+    """Decode a JSON file.
+
+    With orjson, files of at least _MMAP_MIN_SIZE bytes are parsed straight
+    from a read-only memory map rather than copied into a bytes object first.
+    Writers replace these files via atomic_write_json(), so a mapped file is
+    never truncated underneath the parser.
+    """
+    with open(path, "rb") as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        return loads(f.read())
+
+
+def dumps_pretty(data: Any) -> bytes:
+    """Encode data as 2-space indented UTF-8 JSON with a trailing newline.
+
+    Raises TypeError for values JSON can't represent (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+    return (json.dumps(data, indent=2) + "\n").encode()
@@ -1,7 +1,6 @@
 """File locking and atomic write utilities for multi-agent safety."""
 
 import fcntl
-import json
 import os
 import sys
 import tempfile
@@ -11,6 +10,8 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+from lib.vibe.utils.fast_json import dumps_pretty
+
 # Maximum seconds to wait for a lock before giving up and proceeding unlocked.
 LOCK_TIMEOUT_SECONDS = 10
 LOCK_RETRY_INTERVAL = 0.05
@@ -61,14 +62,21 @@ def atomic_write_json(path: Path, data: dict[str, Any]) -> None:
     Writes to a temporary file in the same directory, then uses
     ``os.replace()`` (which is atomic on the same filesystem) to move
     it into place.  This prevents partial writes from corrupting the
-    file if the process is interrupted.
+    file if the process is interrupted, and concurrent readers only ever
+    see the old or the new contents.  The data is fsynced once, before the
+    rename, so a crash can't leave the new name pointing at empty blocks.
     """
+    # Serialize up front so the file gets one write() rather than one per token
+    payload = memoryview(dumps_pretty(data))
     path.parent.mkdir(parents=True, exist_ok=True)
     fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
     try:
-        with os.fdopen(fd, "w") as f:
-            json.dump(data, f, indent=2)
-            f.write("\n")
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload) :]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
         os.replace(tmp_path, str(path))
     except BaseException:
         os.unlink(tmp_path)
@@ -2,6 +2,9 @@
 
 import json
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 from lib.vibe.config import (
     _deep_update,
@@ -100,6 +103,30 @@ class TestSaveConfig:
         parsed = json.loads(content)
         assert parsed["key"] == "value"
 
+    def test_save_config_unserializable_leaves_no_temp_file(self, tmp_path: Path) -> None:
+        """A config that can't be serialized raises without touching .vibe."""
+        save_config({"key": "value"}, base_path=tmp_path)
+        with pytest.raises(TypeError):
+            save_config({"key": object()}, base_path=tmp_path)
+
+        assert [p.name for p in (tmp_path / ".vibe").iterdir()] == ["config.json"]
+        assert json.loads((tmp_path / ".vibe" / "config.json").read_text()) == {"key": "value"}
+
+    def test_save_config_same_layout_without_orjson(self, tmp_path: Path) -> None:
+        """The stdlib fallback writes the same layout as orjson."""
+        config = {"tracker": {"type": "linear"}, "labels": [], "n": 1}
+        save_config(config, base_path=tmp_path)
+        first = (tmp_path / ".vibe" / "config.json").read_text()
+
+        with patch("lib.vibe.utils.fast_json.orjson", None):
+            save_config(config, base_path=tmp_path)
+        assert (tmp_path / ".vibe" / "config.json").read_text() == first
+
+    def test_save_and_load_non_ascii(self, tmp_path: Path) -> None:
+        """Non-ASCII values round-trip whatever the encoder."""
+        save_config({"owner": "Zoë"}, base_path=tmp_path)
+        assert load_config(base_path=tmp_path)["owner"] == "Zoë"
+
 
 class TestUpdateConfig:
     """Tests for update_config function."""
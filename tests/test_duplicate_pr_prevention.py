@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import json
 import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -22,10 +23,17 @@ from lib.vibe.cli.main import (
     _warn_duplicate_prs,
 )
 from lib.vibe.state import (
+    _deep_update,
+    add_worktree,
     get_branches_for_ticket,
     get_ticket_branch,
+    load_state,
     record_ticket_branch,
+    remove_worktree,
+    remove_worktrees,
+    update_state,
 )
+from lib.vibe.utils.file_lock import atomic_write_json
 
 # ---------------------------------------------------------------------------
 # _extract_ticket_id
@@ -313,3 +321,55 @@ class TestTicketBranchState:
         branches = get_branches_for_ticket("PROJ-500", base_path=tmp_path)
         assert len(branches) == 1
         assert branches[0]["branch"] == "PROJ-500-legacy"
+
+
+class TestUpdateState:
+    def test_merges_nested_dicts(self, tmp_path: Path) -> None:
+        update_state({"github_cache": {"username": "octo"}}, base_path=tmp_path)
+        state = load_state(tmp_path)
+        assert state["github_cache"] == {"authenticated": False, "username": "octo"}
+
+    def test_non_dict_value_replaces(self, tmp_path: Path) -> None:
+        update_state({"tracker_cache": None}, base_path=tmp_path)
+        update_state({"tracker_cache": {"last_sync": "now"}}, base_path=tmp_path)
+        assert load_state(tmp_path)["tracker_cache"] == {"last_sync": "now"}
+
+    def test_deep_nesting_beyond_recursion_limit(self, tmp_path: Path) -> None:
+        depth = sys.getrecursionlimit() + 100
+        base: dict = {}
+        updates: dict = {}
+        node, change = base, updates
+        for _ in range(depth):
+            node["n"] = {"keep": True}
+            change["n"] = {}
+            node, change = node["n"], change["n"]
+        change["leaf"] = 1
+
+        _deep_update(base, updates)
+
+        node = base
+        for _ in range(depth):
+            node = node["n"]
+            assert node["keep"] is True
+        assert node["leaf"] == 1
+
+
+class TestActiveWorktrees:
+    def test_add_is_idempotent(self, tmp_path: Path) -> None:
+        add_worktree("/wt/a", base_path=tmp_path)
+        add_worktree("/wt/a", base_path=tmp_path)
+        assert load_state(tmp_path)["active_worktrees"] == ["/wt/a"]
+
+    def test_remove_many_in_one_write(self, tmp_path: Path) -> None:
+        for name in ("a", "b", "c", "d"):
+            add_worktree(f"/wt/{name}", base_path=tmp_path)
+        with patch("lib.vibe.state.atomic_write_json", wraps=atomic_write_json) as mock_write:
+            remove_worktrees(["/wt/b", "/wt/d", "/wt/missing"], base_path=tmp_path)
+        mock_write.assert_called_once()
+        assert load_state(tmp_path)["active_worktrees"] == ["/wt/a", "/wt/c"]
+
+    def test_remove_unknown_does_not_write(self, tmp_path: Path) -> None:
+        add_worktree("/wt/a", base_path=tmp_path)
+        with patch("lib.vibe.state.atomic_write_json") as mock_write:
+            remove_worktree("/wt/missing", base_path=tmp_path)
+        mock_write.assert_not_called()
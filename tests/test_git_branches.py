@@ -0,0 +1,37 @@
+"""Tests for branch management utilities."""
+
+from pathlib import Path
+
+import pytest
+
+from lib.vibe.config import save_config
+from lib.vibe.git.branches import format_branch_name, get_main_branch
+
+
+class TestBranchingConfig:
+    """Tests for reading the branching config section."""
+
+    def test_config_changes_are_picked_up(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A config saved between calls (e.g. by the setup wizard) takes effect."""
+        monkeypatch.chdir(tmp_path)
+        save_config({"branching": {"pattern": "{PROJ}-{num}", "main_branch": "main"}})
+        assert format_branch_name("PROJ-1") == "PROJ-1"
+        assert get_main_branch() == "main"
+
+        save_config({"branching": {"pattern": "feature/{PROJ}-{num}", "main_branch": "trunk"}})
+        assert format_branch_name("PROJ-1") == "feature/PROJ-1"
+        assert get_main_branch() == "trunk"
+
+    def test_follows_working_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        for name, main in (("a", "main"), ("b", "develop")):
+            (tmp_path / name).mkdir()
+            save_config({"branching": {"main_branch": main}}, tmp_path / name)
+
+        monkeypatch.chdir(tmp_path / "a")
+        assert get_main_branch() == "main"
+        monkeypatch.chdir(tmp_path / "b")
+        assert get_main_branch() == "develop"
@@ -1,10 +1,15 @@
 """Tests for git worktree management."""
 
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from lib.vibe.config import save_config
 from lib.vibe.git.worktrees import (
     Worktree,
+    _reset_caches,
     cleanup_stale_worktrees,
     cleanup_worktree,
     create_worktree,
@@ -14,6 +19,17 @@ from lib.vibe.git.worktrees import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_worktree_caches() -> None:
+    """Reset memoized repo root / base path between tests."""
+    _reset_caches()
+
+
+def _porcelain_z(text: str) -> bytes:
+    """Convert newline porcelain output to the NUL-delimited ``-z`` form."""
+    return text.replace("\n", "\0").encode()
+
+
 class TestWorktreeDataclass:
     """Tests for Worktree dataclass."""
 
@@ -54,6 +70,17 @@ class TestGetPrimaryRepoRoot:
         # Path may be resolved with system-specific prefix
         assert str(root).endswith("/home/user/project") or root.name == "project"
 
+    def test_primary_repo_root_is_cached(self) -> None:
+        mock_result = MagicMock()
+        mock_result.stdout = "/home/user/project/.git\n"
+
+        with patch("lib.vibe.git.worktrees.subprocess.run", return_value=mock_result) as mock_run:
+            first = get_primary_repo_root()
+            second = get_primary_repo_root()
+
+        assert first == second
+        mock_run.assert_called_once()
+
 
 class TestGetWorktreeBasePath:
     """Tests for get_worktree_base_path function."""
@@ -94,6 +121,38 @@ class TestGetWorktreeBasePath:
 
         assert "repo-worktrees" in str(base_path)
 
+    def test_cached_per_working_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Each working directory resolves against its own repo root and config."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+        roots = {tmp_path / "a": tmp_path / "a", tmp_path / "b": tmp_path / "b"}
+
+        with patch(
+            "lib.vibe.git.worktrees.get_primary_repo_root",
+            side_effect=lambda: roots[Path.cwd()],
+        ):
+            monkeypatch.chdir(tmp_path / "a")
+            first = get_worktree_base_path()
+            monkeypatch.chdir(tmp_path / "b")
+            second = get_worktree_base_path()
+
+        assert first == tmp_path / "a-worktrees"
+        assert second == tmp_path / "b-worktrees"
+
+    def test_config_edit_invalidates_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        with patch("lib.vibe.git.worktrees.get_primary_repo_root", return_value=tmp_path):
+            save_config({"worktrees": {"base_path": "../one"}})
+            assert get_worktree_base_path() == tmp_path.parent / "one"
+            assert get_worktree_base_path() == tmp_path.parent / "one"
+
+            save_config({"worktrees": {"base_path": "../two-longer"}})
+            assert get_worktree_base_path() == tmp_path.parent / "two-longer"
+
 
 class TestCreateWorktree:
     """Tests for create_worktree function."""
@@ -103,17 +162,15 @@ class TestCreateWorktree:
         worktree_base = tmp_path / "worktrees"
         repo_root = tmp_path / "repo"
 
+        calls = []
+
         # Mock subprocess calls
         def mock_run(cmd, *args, **kwargs):
-            result = MagicMock()
-            if "rev-parse" in cmd and "--verify" in cmd:
-                # Branch doesn't exist
-                result.returncode = 1
-            elif "rev-parse" in cmd and "HEAD" in cmd:
-                result.stdout = "abc123def"
-            elif "worktree" in cmd and "add" in cmd:
-                result.returncode = 0
-            result.returncode = getattr(result, "returncode", 0)
+            calls.append(cmd)
+            result = MagicMock(returncode=0)
+            if "cat-file" in cmd:
+                # Branch doesn't exist; base resolves
+                result.stdout = "refs/heads/feature-123^{commit} missing\nabc123def\n"
             return result
 
         with (
@@ -128,6 +185,9 @@ class TestCreateWorktree:
         assert wt.commit == "abc123def"
         assert wt.is_main is False
         mock_add.assert_called_once()
+        # One lookup process plus the worktree add itself
+        assert len(calls) == 2
+        assert "-b" in calls[1]
 
     def test_create_worktree_existing_branch(self, tmp_path: Path) -> None:
         """Test creating a worktree for an existing branch."""
@@ -138,13 +198,10 @@ class TestCreateWorktree:
 
         def mock_run(cmd, *args, **kwargs):
             nonlocal call_count
-            result = MagicMock()
-            if "rev-parse" in cmd and "--verify" in cmd:
+            result = MagicMock(returncode=0)
+            if "cat-file" in cmd:
                 # Branch exists
-                result.returncode = 0
-            elif "rev-parse" in cmd and "HEAD" in cmd:
-                result.stdout = "existingcommit123"
-            result.returncode = getattr(result, "returncode", 0)
+                result.stdout = "existingcommit123\nbasecommit456\n"
             call_count += 1
             return result
 
@@ -216,7 +273,7 @@ HEAD ghi789
 branch refs/heads/feature-2
 """
         mock_result = MagicMock()
-        mock_result.stdout = porcelain_output
+        mock_result.stdout = _porcelain_z(porcelain_output)
 
         with patch("lib.vibe.git.worktrees.subprocess.run", return_value=mock_result):
             worktrees = list_worktrees()
@@ -235,7 +292,7 @@ HEAD abc123
 branch refs/heads/main
 """
         mock_result = MagicMock()
-        mock_result.stdout = porcelain_output
+        mock_result.stdout = _porcelain_z(porcelain_output)
 
         with patch("lib.vibe.git.worktrees.subprocess.run", return_value=mock_result):
             worktrees = list_worktrees()
@@ -252,7 +309,7 @@ HEAD abc123
 branch refs/heads/main
 """
         mock_result = MagicMock()
-        mock_result.stdout = porcelain_output
+        mock_result.stdout = _porcelain_z(porcelain_output)
 
         with patch("lib.vibe.git.worktrees.subprocess.run", return_value=mock_result):
             worktrees = list_worktrees()
@@ -261,9 +318,39 @@ branch refs/heads/main
         assert worktrees[0].is_main is True  # bare repo
         assert worktrees[1].is_main is False
 
+    def test_list_worktrees_falls_back_without_z(self) -> None:
+        """git < 2.36 rejects -z; the newline porcelain output is parsed instead."""
+        porcelain_output = b"""worktree /home/user/project
+HEAD abc123
+branch refs/heads/main
+
+worktree /home/user/project-worktrees/feature-1
+HEAD def456
+branch refs/heads/feature-1
+"""
+        old_git = subprocess.CalledProcessError(129, ["git"], stderr=b"error: unknown switch `z'")
+
+        with patch(
+            "lib.vibe.git.worktrees.subprocess.run",
+            side_effect=[old_git, MagicMock(stdout=porcelain_output)],
+        ) as mock_run:
+            worktrees = list_worktrees()
+
+        assert mock_run.call_args.args[0] == ["git", "worktree", "list", "--porcelain"]
+        assert [(w.path, w.branch, w.commit) for w in worktrees] == [
+            ("/home/user/project", "main", "abc123"),
+            ("/home/user/project-worktrees/feature-1", "feature-1", "def456"),
+        ]
+
+    def test_list_worktrees_outside_repo_still_raises(self) -> None:
+        error = subprocess.CalledProcessError(128, ["git"])
+        with patch("lib.vibe.git.worktrees.subprocess.run", side_effect=[error, error]):
+            with pytest.raises(subprocess.CalledProcessError):
+                list_worktrees()
+
     def test_list_worktrees_empty(self) -> None:
         mock_result = MagicMock()
-        mock_result.stdout = ""
+        mock_result.stdout = b""
 
         with patch("lib.vibe.git.worktrees.subprocess.run", return_value=mock_result):
             worktrees = list_worktrees()
@@ -284,12 +371,12 @@ class TestCleanupStaleWorktrees:
 
         with (
             patch("lib.vibe.git.worktrees.load_state", return_value=state),
-            patch("lib.vibe.git.worktrees.remove_worktree") as mock_remove,
+            patch("lib.vibe.git.worktrees.remove_worktrees") as mock_remove,
         ):
             cleaned = cleanup_stale_worktrees()
 
         assert cleaned == [nonexistent_path]
-        mock_remove.assert_called_once_with(nonexistent_path)
+        mock_remove.assert_called_once_with([nonexistent_path])
 
     def test_cleanup_stale_worktrees_none_stale(self, tmp_path: Path) -> None:
         # Create all paths that exist
@@ -302,7 +389,7 @@ class TestCleanupStaleWorktrees:
 
         with (
             patch("lib.vibe.git.worktrees.load_state", return_value=state),
-            patch("lib.vibe.git.worktrees.remove_worktree") as mock_remove,
+            patch("lib.vibe.git.worktrees.remove_worktrees") as mock_remove,
         ):
             cleaned = cleanup_stale_worktrees()
 
@@ -314,21 +401,39 @@ class TestCleanupStaleWorktrees:
 
         with (
             patch("lib.vibe.git.worktrees.load_state", return_value=state),
-            patch("lib.vibe.git.worktrees.remove_worktree") as mock_remove,
+            patch("lib.vibe.git.worktrees.remove_worktrees") as mock_remove,
         ):
             cleaned = cleanup_stale_worktrees()
 
         assert len(cleaned) == 2
-        assert mock_remove.call_count == 2
+        mock_remove.assert_called_once_with(cleaned)
 
     def test_cleanup_stale_worktrees_empty_state(self) -> None:
         state = {"active_worktrees": []}
 
         with (
             patch("lib.vibe.git.worktrees.load_state", return_value=state),
-            patch("lib.vibe.git.worktrees.remove_worktree") as mock_remove,
+            patch("lib.vibe.git.worktrees.remove_worktrees") as mock_remove,
         ):
             cleaned = cleanup_stale_worktrees()
 
         assert cleaned == []
         mock_remove.assert_not_called()
+
+    def test_cleanup_stale_worktrees_uses_base_listing(self, tmp_path: Path) -> None:
+        (tmp_path / "wt1").mkdir()
+        stale = str(tmp_path / "wt2")
+        outside = tmp_path / "elsewhere" / "wt3"
+        outside.mkdir(parents=True)
+
+        state = {"active_worktrees": [str(tmp_path / "wt1"), stale, str(outside)]}
+
+        with (
+            patch("lib.vibe.git.worktrees.load_state", return_value=state),
+            patch("lib.vibe.git.worktrees.get_worktree_base_path", return_value=tmp_path),
+            patch("lib.vibe.git.worktrees.remove_worktrees") as mock_remove,
+        ):
+            cleaned = cleanup_stale_worktrees()
+
+        assert cleaned == [stale]
+        mock_remove.assert_called_once_with([stale])
@@ -0,0 +1,188 @@
+"""Tests for GitHub Actions initialization utilities."""
+
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from lib.vibe.github_actions import (
+    GitHubAPI,
+    _upsert_label,
+    create_github_label,
+    fetch_label_names,
+    github_api_session,
+)
+
+
+def _response(status: int, body: object = None, next_url: str | None = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status
+    response.ok = 200 <= status < 300
+    response.json.return_value = body
+    response.links = {"next": {"url": next_url}} if next_url else {}
+    return response
+
+
+def _completed(returncode: int, stdout: str = "") -> MagicMock:
+    return MagicMock(returncode=returncode, stdout=stdout)
+
+
+class TestGitHubApiSession:
+    """Tests for github_api_session function."""
+
+    def test_github_com(self) -> None:
+        repo_view = _completed(
+            0, '{"nameWithOwner": "owner/repo", "url": "https://github.com/owner/repo"}'
+        )
+        with patch(
+            "lib.vibe.github_actions.subprocess.run",
+            side_effect=[repo_view, _completed(0, "gho_token\n")],
+        ) as mock_run:
+            api = github_api_session()
+
+        assert api is not None
+        assert api.repo == "owner/repo"
+        assert api.api_url == "https://api.github.com"
+        assert api.session.headers["Authorization"] == "Bearer gho_token"
+        assert mock_run.call_args_list[1].args[0] == [
+            "gh",
+            "auth",
+            "token",
+            "--hostname",
+            "github.com",
+        ]
+
+    def test_enterprise_host(self) -> None:
+        """GitHub Enterprise repositories use their own host's API and token."""
+        repo_view = _completed(
+            0, '{"nameWithOwner": "team/app", "url": "https://ghe.example.com/team/app"}'
+        )
+        with patch(
+            "lib.vibe.github_actions.subprocess.run",
+            side_effect=[repo_view, _completed(0, "token\n")],
+        ) as mock_run:
+            api = github_api_session()
+
+        assert api is not None
+        assert api.host == "ghe.example.com"
+        assert api.api_url == "https://ghe.example.com/api/v3"
+        assert mock_run.call_args_list[1].args[0][-1] == "ghe.example.com"
+
+    def test_not_a_repository(self) -> None:
+        with patch("lib.vibe.github_actions.subprocess.run", return_value=_completed(1)):
+            assert github_api_session() is None
+
+    def test_no_token(self) -> None:
+        repo_view = _completed(
+            0, '{"nameWithOwner": "owner/repo", "url": "https://github.com/owner/repo"}'
+        )
+        with patch(
+            "lib.vibe.github_actions.subprocess.run",
+            side_effect=[repo_view, _completed(1)],
+        ):
+            assert github_api_session() is None
+
+    def test_gh_missing(self) -> None:
+        with patch("lib.vibe.github_actions.subprocess.run", side_effect=FileNotFoundError):
+            assert github_api_session() is None
+
+
+class TestFetchLabelNames:
+    """Tests for fetch_label_names function."""
+
+    def test_follows_pagination(self) -> None:
+        session = MagicMock()
+        session.get.side_effect = [
+            _response(200, [{"name": "Bug"}], next_url="https://api.github.com/page2"),
+            _response(200, [{"name": "Feature"}]),
+        ]
+
+        names = fetch_label_names(GitHubAPI(session, "owner/repo"))
+
+        assert names == {"bug", "feature"}
+        assert session.get.call_args_list[0].args[0] == (
+            "https://api.github.com/repos/owner/repo/labels?per_page=100"
+        )
+        assert session.get.call_args_list[1].args[0] == "https://api.github.com/page2"
+
+    def test_request_error_returns_partial(self) -> None:
+        session = MagicMock()
+        session.get.side_effect = [
+            _response(200, [{"name": "Bug"}], next_url="https://api.github.com/page2"),
+            requests.ConnectionError("reset"),
+        ]
+
+        assert fetch_label_names(GitHubAPI(session, "owner/repo")) == {"bug"}
+
+
+class TestUpsertLabel:
+    """Tests for _upsert_label function."""
+
+    def test_created(self) -> None:
+        session = MagicMock()
+        session.post.return_value = _response(201)
+
+        assert _upsert_label(GitHubAPI(session, "owner/repo"), "Bug", "d73a4a", "Broken")
+        session.post.assert_called_once_with(
+            "https://api.github.com/repos/owner/repo/labels",
+            json={"name": "Bug", "color": "d73a4a", "description": "Broken"},
+            timeout=30,
+        )
+        session.patch.assert_not_called()
+
+    def test_existing_label_is_updated(self) -> None:
+        session = MagicMock()
+        session.post.return_value = _response(422)
+        session.patch.return_value = _response(200)
+
+        assert _upsert_label(GitHubAPI(session, "owner/repo"), "Low Risk", "0e8a16", "Small")
+        session.patch.assert_called_once_with(
+            "https://api.github.com/repos/owner/repo/labels/Low%20Risk",
+            json={"color": "0e8a16", "description": "Small"},
+            timeout=30,
+        )
+
+    def test_request_exception(self) -> None:
+        session = MagicMock()
+        session.post.side_effect = requests.Timeout()
+
+        assert _upsert_label(GitHubAPI(session, "owner/repo"), "Bug", "d73a4a", "x") is False
+
+
+class TestCreateGithubLabel:
+    """Tests for create_github_label function."""
+
+    def test_rest_success_skips_cli(self) -> None:
+        session = MagicMock()
+        session.post.return_value = _response(201)
+
+        with patch("lib.vibe.github_actions.subprocess.run") as mock_run:
+            assert create_github_label("Bug", "d73a4a", "x", api=GitHubAPI(session, "o/r"))
+        mock_run.assert_not_called()
+
+    def test_rest_failure_falls_back_to_cli(self) -> None:
+        """A failed REST call retries through gh, aimed at the session's repository."""
+        session = MagicMock()
+        session.post.side_effect = requests.ConnectionError()
+        api = GitHubAPI(session, "team/app", "ghe.example.com")
+
+        with patch(
+            "lib.vibe.github_actions.subprocess.run", return_value=_completed(0)
+        ) as mock_run:
+            assert create_github_label("Bug", "d73a4a", "x", api=api) is True
+
+        argv = mock_run.call_args.args[0]
+        assert argv[:4] == ["gh", "label", "create", "Bug"]
+        assert "--force" in argv
+        assert argv[-2:] == ["-R", "ghe.example.com/team/app"]
+
+    def test_cli_without_session(self) -> None:
+        with patch(
+            "lib.vibe.github_actions.subprocess.run", return_value=_completed(1)
+        ) as mock_run:
+            assert create_github_label("Bug", "d73a4a", "x") is False
+        assert "-R" not in mock_run.call_args.args[0]
+
+    def test_dry_run(self) -> None:
+        with patch("lib.vibe.github_actions.subprocess.run") as mock_run:
+            assert create_github_label("Bug", "d73a4a", "x", dry_run=True) is True
+        mock_run.assert_not_called()
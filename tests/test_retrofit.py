@@ -1,12 +1,15 @@
 """Tests for the retrofit module."""
 
+import io
 import json
+import os
 import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from lib.vibe.github_actions import GitHubAPI
 from lib.vibe.retrofit.analyzer import (
     ActionPriority,
     ActionType,
@@ -14,12 +17,28 @@ from lib.vibe.retrofit.analyzer import (
     RetrofitAnalyzer,
     RetrofitPlan,
 )
-from lib.vibe.retrofit.applier import RetrofitApplier
-from lib.vibe.retrofit.detector import DetectionResult, ProjectDetector, ProjectProfile
+from lib.vibe.retrofit.applier import _GITHUB_LABELS, RetrofitApplier, _gh_available
+from lib.vibe.retrofit.detector import (
+    _BRANCH_PATTERNS,
+    DetectionResult,
+    ProjectDetector,
+    ProjectProfile,
+    _classify_branch,
+    _json_loads,
+)
+
+
+def _refs(*lines: str) -> str:
+    """
+    Format refs as ProjectDetector's git for-each-ref call prints them.
+
+    Each line is "refname" or "refname\\0symref-target".
+    """
+    return "".join(f"{line}\n" if "\0" in line else f"{line}\0\n" for line in lines)
 
 
 class TestDetectionResult:
-    """Tests for DetectionResult dataclass."""
+    """Tests for DetectionResult."""
 
     def test_basic_creation(self) -> None:
         """Test creating a basic detection result."""
@@ -37,6 +56,13 @@ class TestDetectionResult:
         assert result.value is None
         assert result.details == ""
 
+    def test_immutable(self) -> None:
+        """Test results can't be changed after a detector returns them."""
+        result = DetectionResult(True, 1.0, "main")
+        with pytest.raises(AttributeError):
+            result.value = "master"
+        assert not hasattr(result, "__dict__")
+
 
 class TestProjectProfile:
     """Tests for ProjectProfile dataclass."""
@@ -47,6 +73,14 @@ class TestProjectProfile:
         assert profile.main_branch.detected is False
         assert profile.branch_pattern.detected is False
         assert profile.frontend_framework.detected is False
+        assert not hasattr(profile, "__dict__")
+
+    def test_default_results_shared(self) -> None:
+        """Test unfilled fields share one immutable default result."""
+        first, second = ProjectProfile(), ProjectProfile()
+        assert first.main_branch is second.has_vibe_config
+        first.main_branch = DetectionResult(True, 1.0, "main")
+        assert second.main_branch.detected is False
 
 
 class TestProjectDetector:
@@ -73,7 +107,14 @@ class TestProjectDetector:
         """Test detecting main branch from origin/HEAD."""
         detector = ProjectDetector(temp_project)
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="refs/remotes/origin/main\n")
+            mock_run.return_value = MagicMock(
+                returncode=0,
+                stdout=_refs(
+                    "refs/heads/main",
+                    "refs/remotes/origin/HEAD\0refs/remotes/origin/main",
+                    "refs/remotes/origin/main",
+                ),
+            )
             result = detector.detect_main_branch()
             assert result.detected is True
             assert result.value == "main"
@@ -83,11 +124,11 @@ class TestProjectDetector:
         """Test detecting main branch from remote branches."""
         detector = ProjectDetector(temp_project)
         with patch("subprocess.run") as mock_run:
-            # First call (symbolic-ref) fails, second (branch -r) succeeds
-            mock_run.side_effect = [
-                MagicMock(returncode=1, stdout=""),
-                MagicMock(returncode=0, stdout="  origin/main\n  origin/feature-1\n"),
-            ]
+            # No origin/HEAD, but an origin/main remote branch
+            mock_run.return_value = MagicMock(
+                returncode=0,
+                stdout=_refs("refs/remotes/origin/main", "refs/remotes/origin/feature-1"),
+            )
             result = detector.detect_main_branch()
             assert result.detected is True
             assert result.value == "main"
@@ -97,21 +138,37 @@ class TestProjectDetector:
         """Test detecting master as main branch."""
         detector = ProjectDetector(temp_project)
         with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = [
-                MagicMock(returncode=1, stdout=""),
-                MagicMock(returncode=0, stdout="  origin/master\n"),
-            ]
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout=_refs("refs/remotes/origin/master")
+            )
             result = detector.detect_main_branch()
             assert result.detected is True
             assert result.value == "master"
 
+    def test_detect_main_branch_matches_whole_names(self, temp_project: Path) -> None:
+        """Test a branch merely containing 'main' isn't taken as main."""
+        detector = ProjectDetector(temp_project)
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout=_refs("refs/heads/domain-fix", "refs/heads/master")
+            )
+            result = detector.detect_main_branch()
+            assert result.value == "master"
+            assert result.confidence == 0.8
+
     def test_detect_branch_pattern_proj_num(self, temp_project: Path) -> None:
         """Test detecting {PROJ}-{num} pattern."""
         detector = ProjectDetector(temp_project)
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=0,
-                stdout="  main\n  TEST-1\n  TEST-2\n  TEST-3\n  TEST-4-feature\n",
+                stdout=_refs(
+                    "refs/heads/main",
+                    "refs/heads/TEST-1",
+                    "refs/heads/TEST-2",
+                    "refs/heads/TEST-3",
+                    "refs/remotes/origin/TEST-4-feature",
+                ),
             )
             result = detector.detect_branch_pattern()
             assert result.detected is True
@@ -122,10 +179,126 @@ class TestProjectDetector:
         """Test detecting pattern with no feature branches."""
         detector = ProjectDetector(temp_project)
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="  main\n")
+            mock_run.return_value = MagicMock(returncode=0, stdout=_refs("refs/heads/main"))
             result = detector.detect_branch_pattern()
             assert result.detected is False
 
+    def test_classify_branch(self) -> None:
+        """Test branch names map to the naming pattern they follow."""
+        assert _BRANCH_PATTERNS[_classify_branch("PROJ-12")] == "{PROJ}-{num}"
+        assert _BRANCH_PATTERNS[_classify_branch("proj-12-add-login")] == "{proj}-{num}"
+        assert _BRANCH_PATTERNS[_classify_branch("feature/PROJ-12")] == "{type}/{PROJ}-{num}"
+        assert _BRANCH_PATTERNS[_classify_branch("fix/typo")] == "{type}/{description}"
+        assert _BRANCH_PATTERNS[_classify_branch("42-fix-typo")] == "{num}-{description}"
+        assert _classify_branch("Proj-12") == -1
+        assert _classify_branch("PROJ-x") == -1
+        assert _classify_branch("docs/readme") == -1
+
+    def test_branch_pattern_ties_prefer_earlier_pattern(self, temp_project: Path) -> None:
+        """Test equally common patterns resolve in _BRANCH_PATTERNS order."""
+        detector = ProjectDetector(temp_project)
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout=_refs("refs/heads/fix/typo", "refs/heads/ABC-1")
+            )
+            result = detector.detect_branch_pattern()
+        assert result.value == "{PROJ}-{num}"
+        assert result.details == "Detected pattern '{PROJ}-{num}' from 1/2 branches"
+
+    def test_detect_main_branch_from_loose_origin_head(self, temp_project: Path) -> None:
+        """Test origin/HEAD is read from its ref file without running git."""
+        origin = temp_project / ".git" / "refs" / "remotes" / "origin"
+        origin.mkdir(parents=True)
+        (origin / "HEAD").write_text("ref: refs/remotes/origin/trunk\n")
+        detector = ProjectDetector(temp_project)
+        with patch("subprocess.run") as mock_run:
+            result = detector.detect_main_branch()
+        mock_run.assert_not_called()
+        assert result.value == "trunk"
+        assert result.confidence == 1.0
+
+    def test_git_refs_read_once(self, temp_project: Path) -> None:
+        """Test main branch and branch pattern detection share one git call."""
+        detector = ProjectDetector(temp_project)
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout=_refs("refs/heads/main", "refs/heads/TEST-1")
+            )
+            detector.detect_main_branch()
+            detector.detect_branch_pattern()
+            detector.detect_linear()
+        mock_run.assert_called_once()
+
+    def test_detect_all_runs_git_once_per_command(self, temp_project: Path) -> None:
+        """Test concurrent detectors share one for-each-ref call and fill every field."""
+        (temp_project / "package.json").write_text(json.dumps({"dependencies": {"next": "14"}}))
+        (temp_project / ".env").write_text("LINEAR_API_KEY=x\nDATABASE_URL=postgres://")
+
+        def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+            if "for-each-ref" in cmd:
+                return MagicMock(returncode=0, stdout=_refs("refs/heads/main", "refs/heads/A-1"))
+            return MagicMock(returncode=0, stdout="/repo  abc123 [main]\n")
+
+        with patch("subprocess.run", side_effect=fake_run) as mock_run:
+            profile = ProjectDetector(temp_project).detect_all()
+        refs_calls = [c for c in mock_run.call_args_list if "for-each-ref" in c.args[0]]
+        assert len(refs_calls) == 1
+        assert profile.main_branch.value == "main"
+        assert profile.frontend_framework.value == "next"
+        assert profile.database_type.value == "postgres"
+        assert profile.linear_integration.value == "env"
+        assert profile.has_worktrees.detected is False
+
+    def test_lazy_profile_runs_only_read_detectors(self, temp_project: Path) -> None:
+        """Test a lazy profile runs a detector on first read and caches it."""
+        (temp_project / "uv.lock").write_text("version = 1")
+        detector = ProjectDetector(temp_project)
+        with (
+            patch.object(
+                detector, "detect_package_manager", wraps=detector.detect_package_manager
+            ) as mock_pm,
+            patch("subprocess.run") as mock_run,
+        ):
+            lazy = detector.lazy_profile()
+            assert lazy.package_manager.value == "uv"
+            assert lazy.package_manager.value == "uv"
+        mock_pm.assert_called_once()
+        mock_run.assert_not_called()
+        with pytest.raises(AttributeError):
+            lazy.not_a_field
+
+    def test_lazy_profile_to_profile_reuses_read_fields(self, temp_project: Path) -> None:
+        """Test to_profile keeps fields already read and fills in the rest."""
+        (temp_project / "fly.toml").write_text('app = "demo"')
+        lazy = ProjectDetector(temp_project).lazy_profile()
+        fly = lazy.fly_config
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            profile = lazy.to_profile()
+        assert isinstance(profile, ProjectProfile)
+        assert profile.fly_config is fly
+        assert profile.main_branch.detected is False
+
+    def test_detect_worktrees_from_git_dir(self, temp_project: Path) -> None:
+        """Test linked worktrees are counted from .git/worktrees without running git."""
+        (temp_project / ".git" / "worktrees" / "feature-1").mkdir(parents=True)
+        detector = ProjectDetector(temp_project)
+        with patch("subprocess.run") as mock_run:
+            result = detector.detect_worktrees()
+        mock_run.assert_not_called()
+        assert result.detected is True
+        assert result.value == 2
+
+    def test_detect_worktrees_falls_back_to_git(self, temp_project: Path) -> None:
+        """Test worktree detection asks git when the project has no .git directory."""
+        detector = ProjectDetector(temp_project)
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0, stdout="/repo  abc123 [main]\n/repo-wt  def456 [TEST-1]\n"
+            )
+            result = detector.detect_worktrees()
+        assert result.detected is True
+        assert result.value == 2
+
     def test_detect_package_manager_poetry(self, temp_project: Path) -> None:
         """Test detecting Poetry package manager."""
         pyproject = temp_project / "pyproject.toml"
@@ -163,6 +336,23 @@ class TestProjectDetector:
         assert result.detected is True
         assert result.value == "uv"
 
+    def test_project_files_read_once(self, temp_project: Path) -> None:
+        """Test detectors share one read of each project file."""
+        (temp_project / "pyproject.toml").write_text(
+            '[tool.poetry]\npython = "3.11"\ndependencies = ["fastapi", "pytest"]'
+        )
+        detector = ProjectDetector(temp_project)
+        read_text = Path.read_text
+        with patch.object(Path, "read_text", autospec=True, side_effect=read_text) as mock_read:
+            assert detector.detect_package_manager().value == "poetry"
+            assert detector.detect_python_version().value == "3.11"
+            assert detector.detect_backend_framework().value == "fastapi"
+            assert detector.detect_test_framework().value == "pytest"
+        pyproject_reads = [
+            c for c in mock_read.call_args_list if c.args[0].name == "pyproject.toml"
+        ]
+        assert len(pyproject_reads) == 1
+
     def test_detect_frontend_framework_next(self, temp_project: Path) -> None:
         """Test detecting Next.js."""
         package_json = temp_project / "package.json"
@@ -181,6 +371,49 @@ class TestProjectDetector:
         assert result.detected is True
         assert result.value == "react"
 
+    def test_package_json_parsed_once(self, temp_project: Path) -> None:
+        """Test package.json is parsed once and shared across detectors."""
+        (temp_project / "package.json").write_text(
+            json.dumps(
+                {
+                    "dependencies": {"next": "14.0.0", "express": "4.0.0"},
+                    "devDependencies": {"tailwindcss": "3.0.0", "vitest": "1.0.0"},
+                }
+            )
+        )
+        detector = ProjectDetector(temp_project)
+        with patch("lib.vibe.retrofit.detector._json_loads", wraps=_json_loads) as mock_loads:
+            assert detector.detect_frontend_framework().value == "next"
+            assert detector.detect_backend_framework().value == "express"
+            assert detector.detect_css_framework().value == "tailwind"
+            assert detector.detect_test_framework().value == "vitest"
+        assert mock_loads.call_count == 1
+
+    def test_package_frameworks_follow_priority(self, temp_project: Path) -> None:
+        """Test the highest-priority package wins regardless of declaration order."""
+        (temp_project / "package.json").write_text(
+            json.dumps(
+                {
+                    "dependencies": {"react": "18.0.0", "@sveltejs/kit": "2.0.0"},
+                    "devDependencies": {"cypress": "13.0.0", "jest": "29.0.0"},
+                }
+            )
+        )
+        detector = ProjectDetector(temp_project)
+        frontend = detector.detect_frontend_framework()
+        assert frontend.value == "svelte"
+        assert frontend.details == "Found Svelte in dependencies"
+        assert detector.detect_test_framework().value == "jest"
+        assert detector.detect_css_framework().detected is False
+
+    def test_invalid_package_json_ignored(self, temp_project: Path) -> None:
+        """Test malformed or non-object package.json detects nothing."""
+        package_json = temp_project / "package.json"
+        package_json.write_text("{not json")
+        assert ProjectDetector(temp_project).detect_frontend_framework().detected is False
+        package_json.write_text("[]")
+        assert ProjectDetector(temp_project).detect_test_framework().detected is False
+
     def test_detect_backend_framework_fastapi(self, temp_project: Path) -> None:
         """Test detecting FastAPI."""
         pyproject = temp_project / "pyproject.toml"
@@ -190,6 +423,13 @@ class TestProjectDetector:
         assert result.detected is True
         assert result.value == "fastapi"
 
+    def test_python_deps_do_not_span_files(self, temp_project: Path) -> None:
+        """Test a dependency name can't be formed across pyproject and requirements."""
+        (temp_project / "pyproject.toml").write_text('[project]\nkeywords = ["fast')
+        (temp_project / "requirements.txt").write_text("api-client>=1.0")
+        detector = ProjectDetector(temp_project)
+        assert detector.detect_backend_framework().detected is False
+
     def test_detect_backend_framework_django(self, temp_project: Path) -> None:
         """Test detecting Django."""
         requirements = temp_project / "requirements.txt"
@@ -235,6 +475,18 @@ class TestProjectDetector:
         assert result.detected is True
         assert "Dockerfile" in result.value
 
+    def test_top_level_probes_share_one_listing(self, temp_project: Path) -> None:
+        """Test existence checks in the project root list the directory once."""
+        (temp_project / "Dockerfile").write_text("FROM python:3.11")
+        (temp_project / ".vercel").mkdir()
+        detector = ProjectDetector(temp_project)
+        with patch("lib.vibe.retrofit.detector.os.scandir", wraps=os.scandir) as mock_scandir:
+            assert detector.detect_package_manager().detected is False
+            assert detector.detect_vercel().value == "linked"
+            assert detector.detect_fly().detected is False
+            assert detector.detect_docker().value == ["Dockerfile"]
+        mock_scandir.assert_called_once_with(temp_project)
+
     def test_detect_supabase(self, temp_project: Path) -> None:
         """Test detecting Supabase configuration."""
         supabase_dir = temp_project / "supabase"
@@ -254,6 +506,45 @@ class TestProjectDetector:
         assert result.detected is True
         assert result.value == "env"
 
+    def test_detect_supabase_from_next_public_env(self, temp_project: Path) -> None:
+        """Test Next.js-style public Supabase URLs are detected too."""
+        (temp_project / ".env.local").write_text("NEXT_PUBLIC_SUPABASE_URL=https://x.supabase.co")
+        result = ProjectDetector(temp_project).detect_supabase()
+        assert result.details == "Found Supabase config in .env.local"
+
+    def test_env_files_scanned_in_order(self, temp_project: Path) -> None:
+        """Test env detectors share the env files and report the first match."""
+        (temp_project / ".env.local").write_text("NEON_DATABASE_URL=postgres://x.neon.tech\n")
+        (temp_project / ".env.example").write_text("NEON_API_KEY=\nSHORTCUT_API_TOKEN=\n")
+        detector = ProjectDetector(temp_project)
+
+        assert detector.detect_neon().details == "Found Neon config in .env.local"
+        assert detector.detect_shortcut().details == "Found Shortcut config in .env.example"
+        assert detector.detect_database_type().value == "postgres"
+        assert detector.detect_supabase().detected is False
+        assert [name for name, _ in detector._env_hits] == [".env.local", ".env.example"]
+
+    def test_env_service_markers_are_case_sensitive(self, temp_project: Path) -> None:
+        """Test one scan keeps service markers case-sensitive and databases not."""
+        (temp_project / ".env").write_text(
+            "# nonlinear_model uses mysql\nSUPABASE_URL=x\nCLUBHOUSE_TOKEN=y\n"
+        )
+        detector = ProjectDetector(temp_project)
+        assert detector._env_hits == ((".env", frozenset({"mysql", "supabase", "shortcut"})),)
+        assert detector.detect_linear().detected is False
+        assert detector.detect_database_type().value == "mysql"
+
+    def test_detect_database_type_priority(self, temp_project: Path) -> None:
+        """Test database markers are case-insensitive and ranked, not first-seen."""
+        env = temp_project / ".env"
+        env.write_text("REDIS_URL=redis://localhost\nDATABASE_URL=PostgreSQL://db\n")
+        assert ProjectDetector(temp_project).detect_database_type().value == "postgres"
+
+        env.write_text("MONGO_URL=mongo://db\n")
+        result = ProjectDetector(temp_project).detect_database_type()
+        assert result.value == "mongodb"
+        assert result.details == "Found MongoDB in env"
+
     def test_detect_test_framework_pytest(self, temp_project: Path) -> None:
         """Test detecting pytest."""
         pyproject = temp_project / "pyproject.toml"
@@ -285,6 +576,19 @@ class TestProjectDetector:
         assert "ci" in result.value
         assert "deploy" in result.value
 
+    def test_detect_github_actions_single_listing(self, temp_project: Path) -> None:
+        """Test workflows are found in one directory read, skipping non-workflows."""
+        workflows_dir = temp_project / ".github" / "workflows"
+        (workflows_dir / "nested.yml").mkdir(parents=True)
+        (workflows_dir / "release.yaml").write_text("name: Release")
+        (workflows_dir / "README.md").write_text("docs")
+        detector = ProjectDetector(temp_project)
+        with patch("lib.vibe.retrofit.detector.os.scandir", wraps=os.scandir) as mock_scandir:
+            result = detector.detect_github_actions()
+        mock_scandir.assert_called_once()
+        assert result.value == ["release"]
+        assert result.details == "Found 1 workflow(s): release"
+
     def test_detect_pr_template(self, temp_project: Path) -> None:
         """Test detecting PR template."""
         github_dir = temp_project / ".github"
@@ -376,6 +680,44 @@ class TestRetrofitAnalyzer:
         assert pattern_action.action_type == ActionType.CONFIGURE
         assert pattern_action.auto_applicable is False
 
+    def test_analyze_deployment_detected(self) -> None:
+        """Test detected deployment targets are skipped and no fallback is added."""
+        profile = ProjectProfile()
+        profile.fly_config = DetectionResult(True, 1.0, "my-app", "Found fly.toml")
+        plan = RetrofitAnalyzer(profile).analyze()
+        names = [a.name for a in plan.actions]
+        assert "fly" in names
+        assert "vercel" not in names
+        assert "deployment" not in names
+
+    def test_analyze_database_precedence(self) -> None:
+        """Test hosted providers take precedence over the generic database type."""
+        profile = ProjectProfile()
+        profile.neon_config = DetectionResult(True, 0.9, None, "Found NEON_")
+        profile.database_type = DetectionResult(True, 0.8, "postgresql", "Found URL")
+        plan = RetrofitAnalyzer(profile).analyze()
+        db_actions = [a for a in plan.actions if a.name == "database"]
+        assert len(db_actions) == 1
+        assert db_actions[0].current_value == "neon"
+
+        profile.neon_config = DetectionResult(False, 0.0)
+        plan = RetrofitAnalyzer(profile).analyze()
+        db_action = next(a for a in plan.actions if a.name == "database")
+        assert db_action.description == "postgresql database detected"
+
+    def test_analyze_is_memoized(self) -> None:
+        """Test analyze() reuses its plan until a profile field is replaced."""
+        profile = ProjectProfile()
+        analyzer = RetrofitAnalyzer(profile)
+        plan = analyzer.analyze()
+        assert analyzer.analyze() is plan
+
+        profile.has_vibe_config = DetectionResult(True, 1.0, "1.0.0", "Found config")
+        replanned = analyzer.analyze()
+        assert replanned is not plan
+        vibe_action = next(a for a in replanned.actions if a.name == "vibe_config")
+        assert vibe_action.action_type == ActionType.SKIP
+
     def test_generate_summary(self) -> None:
         """Test generating human-readable summary."""
         profile = ProjectProfile()
@@ -388,6 +730,45 @@ class TestRetrofitAnalyzer:
         assert "Main branch: main" in summary
         assert "Frontend: next" in summary
 
+    def test_generate_summary_detected_configuration(self) -> None:
+        """Test every detected field is listed, in order, under Detected Configuration."""
+        profile = ProjectProfile()
+        profile.main_branch = DetectionResult(True, 1.0, "main")
+        profile.branch_pattern = DetectionResult(True, 0.8, "{PROJ}-{num}")
+        profile.frontend_framework = DetectionResult(True, 1.0, "next")
+        profile.backend_framework = DetectionResult(True, 1.0, "fastapi")
+        profile.package_manager = DetectionResult(True, 1.0, "pnpm")
+        profile.vercel_config = DetectionResult(True, 1.0)
+        profile.fly_config = DetectionResult(True, 1.0)
+        profile.supabase_config = DetectionResult(True, 1.0)
+        profile.test_framework = DetectionResult(True, 1.0, "pytest")
+        analyzer = RetrofitAnalyzer(profile)
+        lines = analyzer.generate_summary(analyzer.analyze()).splitlines()
+
+        start = lines.index("Detected Configuration:") + 2
+        assert lines[start : start + 10] == [
+            "  Main branch: main",
+            "  Branch pattern: {PROJ}-{num} (80% conf.)",
+            "  Frontend: next",
+            "  Backend: fastapi",
+            "  Package manager: pnpm",
+            "  Deployment: Vercel",
+            "  Deployment: Fly.io",
+            "  Database: Supabase",
+            "  Testing: pytest",
+            "",
+        ]
+
+    def test_stream_summary_matches_generate_summary(self) -> None:
+        """Test streaming writes the same text generate_summary returns."""
+        profile = ProjectProfile()
+        profile.main_branch = DetectionResult(True, 1.0, "develop", "Detected")
+        analyzer = RetrofitAnalyzer(profile)
+        plan = analyzer.analyze()
+        out = io.StringIO()
+        analyzer.stream_summary(plan, out.write)
+        assert out.getvalue() == analyzer.generate_summary(plan) + "\n"
+
 
 class TestRetrofitPlan:
     """Tests for RetrofitPlan."""
@@ -430,10 +811,65 @@ class TestRetrofitPlan:
         assert len(auto) == 1
         assert auto[0].name == "a"
 
+    def test_add_buckets_actions(self) -> None:
+        """Test add() keeps the priority/type views in sync."""
+        plan = RetrofitPlan()
+        plan.add(RetrofitAction("a", ActionType.ADOPT, ActionPriority.REQUIRED, "Required"))
+        plan.add(RetrofitAction("b", ActionType.CONFLICT, ActionPriority.RECOMMENDED, "Conflict"))
+        assert [a.name for a in plan.actions] == ["a", "b"]
+        assert [a.name for a in plan.required_actions] == ["a"]
+        assert [a.name for a in plan.recommended_actions] == ["b"]
+        assert [a.name for a in plan.conflicts] == ["b"]
+        assert [a.name for a in plan.auto_applicable_actions] == ["a"]
+
+    def test_buckets_follow_direct_changes(self) -> None:
+        """Test assigning actions rebuilds the views."""
+        plan = RetrofitPlan()
+        plan.add(RetrofitAction("a", ActionType.ADOPT, ActionPriority.REQUIRED, "Required"))
+        assert len(plan.required_actions) == 1
+        plan.actions = [RetrofitAction("c", ActionType.SKIP, ActionPriority.OPTIONAL, "Skip")]
+        assert plan.required_actions == ()
+        assert [a.name for a in plan.optional_actions] == ["c"]
+
+    def test_actions_cannot_be_edited_in_place(self) -> None:
+        """Test actions is stored as a tuple, so the buckets can't go stale."""
+        plan = RetrofitPlan()
+        plan.actions = [RetrofitAction("a", ActionType.ADOPT, ActionPriority.REQUIRED, "R")]
+        assert isinstance(plan.actions, tuple)
+        assert [a.name for a in plan.required_actions] == ["a"]
+
+    def test_views_are_cached_tuples(self) -> None:
+        """Test repeated access returns the same tuple until the plan changes."""
+        plan = RetrofitPlan()
+        plan.add(RetrofitAction("a", ActionType.ADOPT, ActionPriority.REQUIRED, "Required"))
+        view = plan.required_actions
+        assert isinstance(view, tuple)
+        assert plan.required_actions is view
+        assert plan.auto_applicable_actions is plan.auto_applicable_actions
+        plan.add(RetrofitAction("b", ActionType.ADOPT, ActionPriority.REQUIRED, "Later"))
+        assert [a.name for a in view] == ["a"]
+        assert [a.name for a in plan.required_actions] == ["a", "b"]
+
+    def test_freeze(self) -> None:
+        """Test a frozen plan keeps its views but rejects changes."""
+        plan = RetrofitPlan()
+        plan.add(RetrofitAction("a", ActionType.ADOPT, ActionPriority.REQUIRED, "Required"))
+        plan.freeze()
+        assert [a.name for a in plan.required_actions] == ["a"]
+        with pytest.raises(TypeError):
+            plan.add(RetrofitAction("b", ActionType.ADOPT, ActionPriority.REQUIRED, "Late"))
+        with pytest.raises(TypeError):
+            plan.actions = []
+
 
 class TestRetrofitApplier:
     """Tests for RetrofitApplier."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_gh_cache(self) -> None:
+        """Forget the cached gh availability between tests."""
+        _gh_available.cache_clear()
+
     @pytest.fixture
     def temp_project(self, tmp_path: Path) -> Path:
         """Create a temporary project directory."""
@@ -573,3 +1009,204 @@ class TestRetrofitApplier:
         assert workflows_dir.exists()
         assert (workflows_dir / "pr-policy.yml").exists()
         assert (workflows_dir / "security.yml").exists()
+
+    def test_apply_github_labels_shares_one_session(self, temp_project: Path) -> None:
+        """Test labels are upserted over one API session, counting existing ones."""
+        session = MagicMock()
+        applier = RetrofitApplier(project_path=temp_project)
+        action = RetrofitAction(
+            "github_labels", ActionType.ADOPT, ActionPriority.RECOMMENDED, "Create labels"
+        )
+        with (
+            patch("lib.vibe.retrofit.applier.subprocess.run"),
+            patch(
+                "lib.vibe.retrofit.applier.github_api_session",
+                return_value=GitHubAPI(session, "owner/repo"),
+            ) as mock_session,
+            patch("lib.vibe.retrofit.applier.fetch_label_names", return_value={"bug", "feature"}),
+            patch(
+                "lib.vibe.retrofit.applier.create_github_label", return_value=True
+            ) as mock_create,
+        ):
+            result = applier.apply_action(action)
+
+        assert result.success is True
+        assert result.message == "Created 12 labels, 2 already existed"
+        mock_session.assert_called_once_with(temp_project)
+        assert mock_create.call_count == 14
+        assert all(
+            call.kwargs["api"] == GitHubAPI(session, "owner/repo")
+            for call in mock_create.call_args_list
+        )
+        session.close.assert_called_once()
+
+    def test_apply_github_labels_without_api(self, temp_project: Path) -> None:
+        """Test labels fall back to the gh CLI when gh can't provide an API token."""
+        applier = RetrofitApplier(project_path=temp_project)
+        action = RetrofitAction(
+            "github_labels", ActionType.ADOPT, ActionPriority.RECOMMENDED, "Create labels"
+        )
+        with (
+            patch("subprocess.run", return_value=MagicMock(returncode=0)) as mock_run,
+            patch("lib.vibe.retrofit.applier.github_api_session", return_value=None),
+        ):
+            result = applier.apply_action(action)
+
+        label_calls = [c for c in mock_run.call_args_list if c.args[0][:2] == ["gh", "label"]]
+        assert result.success is True
+        assert result.message == f"Created {len(_GITHUB_LABELS)} labels, 0 already existed"
+        assert len(label_calls) == len(_GITHUB_LABELS)
+        assert all(c.kwargs["cwd"] == temp_project for c in label_calls)
+
+    def test_apply_plan_concurrent_keeps_order_and_config(self, temp_project: Path) -> None:
+        """Test non-interactive apply runs concurrently without losing config edits."""
+        names = ["pr_template", "main_branch", "branch_pattern", "worktrees", "vibe_config"]
+        plan = RetrofitPlan()
+        for name in names:
+            plan.add(RetrofitAction(name, ActionType.ADOPT, ActionPriority.REQUIRED, name))
+
+        applier = RetrofitApplier(project_path=temp_project)
+        results = applier.apply_plan(plan, auto_only=True, interactive=False)
+
+        assert [r.action_name for r in results] == names
+        assert all(r.success for r in results)
+        config = json.loads((temp_project / ".vibe" / "config.json").read_text())
+        assert config["branching"]["main_branch"] == "main"
+        assert config["branching"]["pattern"] == "{PROJ}-{num}"
+        assert config["worktrees"]["location"] == "sibling"
+
+    def test_apply_plan_saves_config_once(self, temp_project: Path) -> None:
+        """Test config edits from several actions are written in one save."""
+        plan = RetrofitPlan()
+        for name in ["vibe_config", "main_branch", "branch_pattern", "worktrees"]:
+            plan.add(RetrofitAction(name, ActionType.ADOPT, ActionPriority.REQUIRED, name))
+
+        applier = RetrofitApplier(project_path=temp_project)
+        with patch("lib.vibe.retrofit.applier.save_config") as mock_save:
+            applier.apply_plan(plan, auto_only=True, interactive=False)
+
+        mock_save.assert_called_once()
+        config = mock_save.call_args.args[0]
+        assert config["branching"]["main_branch"] == "main"
+        assert config["worktrees"]["auto_cleanup"] is True
+
+    def test_apply_github_actions_copies_from_boilerplate(
+        self, temp_project: Path, tmp_path: Path
+    ) -> None:
+        """Test workflows are copied from the boilerplate without overwriting."""
+        source = tmp_path / "boilerplate" / ".github" / "workflows"
+        source.mkdir(parents=True)
+        (source / "lint.yml").write_text("name: Lint\n")
+        os.utime(source / "lint.yml", ns=(1_000_000_000, 1_000_000_000))
+        (source / "tests.yml").write_text("name: Tests\n")
+        (source / "README.md").write_text("not a workflow")
+        workflows_dir = temp_project / ".github" / "workflows"
+        workflows_dir.mkdir(parents=True)
+        (workflows_dir / "tests.yml").write_text("name: Custom\n")
+
+        applier = RetrofitApplier(
+            project_path=temp_project, boilerplate_path=tmp_path / "boilerplate"
+        )
+        action = RetrofitAction(
+            "github_actions", ActionType.ADOPT, ActionPriority.RECOMMENDED, "Add workflows"
+        )
+        result = applier.apply_action(action)
+
+        assert result.success is True
+        assert result.message == "Copied workflows: lint.yml"
+        assert (workflows_dir / "lint.yml").read_text() == "name: Lint\n"
+        assert (workflows_dir / "lint.yml").stat().st_mtime_ns == 1_000_000_000
+        assert (workflows_dir / "tests.yml").read_text() == "name: Custom\n"
+        assert not (workflows_dir / "README.md").exists()
+
+    def test_fast_copy_falls_back_to_copyfile(self, tmp_path: Path) -> None:
+        """Test _fast_copy falls back when copy_file_range is unsupported."""
+        from lib.vibe.retrofit.applier import _fast_copy
+
+        src = tmp_path / "src.yml"
+        src.write_bytes(b"name: CI\n" * 1000)
+        dst = tmp_path / "dst.yml"
+        with patch(
+            "lib.vibe.retrofit.applier.os.copy_file_range",
+            side_effect=OSError("unsupported"),
+            create=True,
+        ):
+            _fast_copy(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_gh_available_is_cached(self) -> None:
+        """Test the gh --version probe runs once per process."""
+        with patch("lib.vibe.retrofit.applier.subprocess.run") as mock_run:
+            assert _gh_available() is True
+            assert _gh_available() is True
+        mock_run.assert_called_once()
+
+    def test_apply_github_labels_without_gh(self, temp_project: Path) -> None:
+        """Test labels report a missing gh CLI."""
+        applier = RetrofitApplier(project_path=temp_project)
+        action = RetrofitAction(
+            "github_labels", ActionType.ADOPT, ActionPriority.RECOMMENDED, "Create labels"
+        )
+        with patch("lib.vibe.retrofit.applier.subprocess.run", side_effect=FileNotFoundError):
+            result = applier.apply_action(action)
+
+        assert result.success is False
+        assert "gh CLI not available" in result.message
+
+    def test_apply_plan_creates_each_dir_once(self, temp_project: Path) -> None:
+        """Test shared .github directories are created once up front."""
+        plan = RetrofitPlan()
+        for name in ["github_actions", "pr_template"]:
+            plan.add(RetrofitAction(name, ActionType.ADOPT, ActionPriority.REQUIRED, name))
+
+        applier = RetrofitApplier(project_path=temp_project)
+        with patch("lib.vibe.retrofit.applier.os.makedirs", wraps=os.makedirs) as mock_makedirs:
+            results = applier.apply_plan(plan, auto_only=True, interactive=False)
+
+        assert all(r.success for r in results)
+        assert sorted(c.args[0] for c in mock_makedirs.call_args_list) == [
+            temp_project / ".github",
+            temp_project / ".github" / "workflows",
+        ]
+
+    def test_apply_plan_all_declined_leaves_tree_unchanged(self, temp_project: Path) -> None:
+        """Test declining every interactive prompt creates no directories or files."""
+        plan = RetrofitPlan()
+        for name in ["github_actions", "pr_template", "vibe_config"]:
+            plan.add(RetrofitAction(name, ActionType.ADOPT, ActionPriority.REQUIRED, name))
+        before = sorted(temp_project.rglob("*"))
+
+        applier = RetrofitApplier(project_path=temp_project)
+        with patch("lib.vibe.retrofit.applier.click.confirm", return_value=False):
+            results = applier.apply_plan(plan, auto_only=True, interactive=True)
+
+        assert [r.message for r in results] == ["Skipped by user"] * 3
+        assert sorted(temp_project.rglob("*")) == before
+        assert not (temp_project / ".github").exists()
+
+    def test_apply_plan_never_applies_skips(self, temp_project: Path) -> None:
+        """Test SKIP actions are filtered out whether or not auto_only is set."""
+        plan = RetrofitPlan()
+        plan.add(RetrofitAction("vibe_config", ActionType.SKIP, ActionPriority.REQUIRED, "Skip"))
+        plan.add(RetrofitAction("worktrees", ActionType.CONFIGURE, ActionPriority.OPTIONAL, "Wt"))
+
+        applier = RetrofitApplier(project_path=temp_project, dry_run=True)
+        for auto_only in (True, False):
+            results = applier.apply_plan(plan, auto_only=auto_only, interactive=False)
+            assert [r.action_name for r in results] == ["worktrees"]
+
+    def test_apply_github_actions_minimal_keeps_existing(self, temp_project: Path) -> None:
+        """Test minimal workflows don't overwrite ones already in the project."""
+        workflows_dir = temp_project / ".github" / "workflows"
+        workflows_dir.mkdir(parents=True)
+        (workflows_dir / "pr-policy.yml").write_text("name: Custom\n")
+
+        applier = RetrofitApplier(project_path=temp_project)
+        action = RetrofitAction(
+            "github_actions", ActionType.ADOPT, ActionPriority.RECOMMENDED, "Add workflows"
+        )
+        result = applier.apply_action(action)
+
+        assert result.message == "Created workflows: security.yml"
+        assert (workflows_dir / "pr-policy.yml").read_text() == "name: Custom\n"
@@ -1,6 +1,10 @@
 """Tests for secret providers and env file parsing."""
 
+import dataclasses
+import hashlib
 import json
+import mmap
+import os
 from pathlib import Path
 from unittest.mock import patch
 
@@ -8,12 +12,23 @@ import pytest
 
 from lib.vibe.secrets.allowlist import (
     AllowlistEntry,
+    _invalidate_allowlist_cache,
+    add_many_to_allowlist,
+    add_to_allowlist,
+    filter_allowed,
+    get_allowlist_path,
+    is_allowed_secret,
+    load_allowlist,
+    load_allowlist_indexed,
+    save_allowlist,
     validate_allowlist,
 )
 from lib.vibe.secrets.providers.base import Secret
 from lib.vibe.secrets.providers.fly import FlySecretsProvider
 from lib.vibe.secrets.providers.github import GitHubSecretsProvider
 from lib.vibe.secrets.providers.vercel import VercelSecretsProvider
+from lib.vibe.utils.fast_json import load_file
+from lib.vibe.utils.file_lock import atomic_write_json
 
 
 class TestVercelParseEnvFile:
@@ -113,6 +128,25 @@ class TestFlyParseEnvFile:
         assert len(secrets) == 1
         assert secrets["KEY"] == "value"
 
+    def test_parse_edge_cases(self, tmp_path: Path) -> None:
+        """Indented comments are skipped; '#' and '=' inside values are kept."""
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "  # KEY=commented\n"
+            "PASSWORD=abc#123\n"
+            " URL = postgres://h/db?a=b \n"
+            "no equals here\n"
+            "EMPTY=\n"
+            "PASSWORD=override\r\n"
+        )
+
+        provider = FlySecretsProvider.__new__(FlySecretsProvider)
+        provider._app_name = "test-app"
+        provider._fly_cmd = "fly"
+        secrets = provider._parse_env_file(str(env_file))
+
+        assert secrets == {"PASSWORD": "override", "URL": "postgres://h/db?a=b", "EMPTY": ""}
+
     def test_parse_missing_file_raises(self, tmp_path: Path) -> None:
         """Raises RuntimeError for missing file."""
         provider = FlySecretsProvider.__new__(FlySecretsProvider)
@@ -177,6 +211,102 @@ class TestFlyProviderProperties:
         with pytest.raises(RuntimeError, match="App name not configured"):
             provider.delete_secret("KEY", "production")
 
+    def test_commands_reuse_prebuilt_argv(self) -> None:
+        """List and set run the same argv as before, built once per provider."""
+        provider = FlySecretsProvider.__new__(FlySecretsProvider)
+        provider._app_name = "test-app"
+        provider._fly_cmd = "flyctl"
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = ""
+            provider.list_secrets()
+            provider.list_secrets()
+            provider.set_secret("KEY", "value", "production")
+
+        first, second, set_call = mock_run.call_args_list
+        assert first[0][0] == ("flyctl", "secrets", "list", "-a", "test-app", "--json")
+        assert first[0][0] is second[0][0]
+        assert set_call[0][0] == [
+            "flyctl",
+            "secrets",
+            "set",
+            "KEY=value",
+            "-a",
+            "test-app",
+            "--stage",
+        ]
+
+    def test_list_secrets_parses_json(self) -> None:
+        provider = FlySecretsProvider.__new__(FlySecretsProvider)
+        provider._app_name = "test-app"
+        provider._fly_cmd = "fly"
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = '[{"Name": "DB_URL"}, {"Name": "API_KEY"}]\n'
+            secrets = provider.list_secrets()
+
+        assert [s.name for s in secrets] == ["DB_URL", "API_KEY"]
+        assert all(s.value == "<hidden>" and s.environment == "production" for s in secrets)
+
+    def test_list_secrets_empty_output(self) -> None:
+        provider = FlySecretsProvider.__new__(FlySecretsProvider)
+        provider._app_name = "test-app"
+        provider._fly_cmd = "fly"
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = "\n"
+            assert provider.list_secrets() == []
+
+    def test_sync_from_local_sets_all_secrets_in_one_call(self, tmp_path: Path) -> None:
+        env_file = tmp_path / ".env"
+        env_file.write_text("A=1\nB='two'\n")
+        provider = FlySecretsProvider.__new__(FlySecretsProvider)
+        provider._app_name = "test-app"
+        provider._fly_cmd = "fly"
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            results = provider.sync_from_local(str(env_file), "production")
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == [
+            "fly",
+            "secrets",
+            "set",
+            "A=1",
+            "B=two",
+            "-a",
+            "test-app",
+            "--stage",
+        ]
+        assert results == {"A": True, "B": True}
+
+    def test_sync_from_local_failure_marks_every_secret(self, tmp_path: Path) -> None:
+        env_file = tmp_path / ".env"
+        env_file.write_text("A=1\nB=2\n")
+        provider = FlySecretsProvider.__new__(FlySecretsProvider)
+        provider._app_name = "test-app"
+        provider._fly_cmd = "fly"
+
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            results = provider.sync_from_local(str(env_file), "production")
+
+        assert results == {"A": False, "B": False}
+
+    def test_sync_from_local_empty_file_runs_nothing(self, tmp_path: Path) -> None:
+        env_file = tmp_path / ".env"
+        env_file.write_text("# nothing here\n")
+        provider = FlySecretsProvider.__new__(FlySecretsProvider)
+        provider._app_name = "test-app"
+        provider._fly_cmd = "fly"
+
+        with patch("subprocess.run") as mock_run:
+            assert provider.sync_from_local(str(env_file), "production") == {}
+        mock_run.assert_not_called()
+
 
 class TestGitHubProviderProperties:
     """Tests for GitHub provider initialization and properties."""
@@ -205,6 +335,40 @@ class TestGitHubProviderProperties:
         provider = GitHubSecretsProvider()
         assert provider.delete_secret("KEY", "repository") is False
 
+    def test_set_secret_command(self) -> None:
+        provider = GitHubSecretsProvider(owner="test-org", repo="test-repo")
+        with patch("subprocess.run") as mock_run:
+            assert provider.set_secret("KEY", "value", "staging") is True
+        assert mock_run.call_args[0][0] == [
+            "gh",
+            "secret",
+            "set",
+            "KEY",
+            "-R",
+            "test-org/test-repo",
+            "--env",
+            "staging",
+        ]
+
+    def test_sync_from_local_sets_each_secret(self, tmp_path: Path) -> None:
+        """Every variable is set once; results keep file order."""
+        env_file = tmp_path / ".env"
+        env_file.write_text("# comment\nB=2\nA='1'\nB=3\n")
+        provider = GitHubSecretsProvider(owner="test-org", repo="test-repo")
+
+        with patch.object(provider, "set_secret", side_effect=lambda n, v, e: n != "A") as mock_set:
+            results = provider.sync_from_local(str(env_file), "repository")
+
+        assert list(results.items()) == [("B", True), ("A", False)]
+        assert sorted(c[0] for c in mock_set.call_args_list) == [
+            ("A", "1", "repository"),
+            ("B", "3", "repository"),
+        ]
+
+    def test_sync_from_local_missing_file(self, tmp_path: Path) -> None:
+        provider = GitHubSecretsProvider(owner="test-org", repo="test-repo")
+        assert provider.sync_from_local(str(tmp_path / ".env"), "repository") == {}
+
 
 class TestSecretDataclass:
     """Tests for the Secret dataclass."""
@@ -220,6 +384,12 @@ class TestSecretDataclass:
         secret = Secret(name="KEY", value=None, environment="production", provider="github")
         assert secret.value is None
 
+    def test_secret_is_immutable_and_hashable(self) -> None:
+        secret = Secret(name="KEY", value="val", environment="production", provider="fly")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            secret.value = "other"
+        assert len({secret, Secret("KEY", "val", "production", "fly")}) == 1
+
 
 class TestAllowlistValidation:
     """Tests for allowlist validation."""
@@ -310,3 +480,309 @@ class TestAllowlistEntry:
         )
         assert entry.file_path is None
         assert entry.hash is None
+
+    def test_entry_is_immutable_and_hashable(self) -> None:
+        entry = AllowlistEntry(pattern="test", reason="Test", added_by="dev")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            entry.reason = "changed"
+        assert not hasattr(entry, "__dict__")
+        assert entry in {AllowlistEntry(pattern="test", reason="Test", added_by="dev")}
+
+
+@pytest.fixture
+def allowlist_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run a test in an empty project with a cold allowlist cache."""
+    monkeypatch.chdir(tmp_path)
+    _invalidate_allowlist_cache()
+    return tmp_path
+
+
+def _write_allowlist(entries: list[dict[str, str]]) -> None:
+    """Write an allowlist file with the given raw entries."""
+    path = Path(".vibe/secrets.allowlist.json")
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps({"version": "1.0.0", "entries": entries}))
+
+
+class TestLoadAllowlist:
+    """Tests for loading the allowlist."""
+
+    def test_missing_file(self, allowlist_project: Path) -> None:
+        """A missing allowlist loads as empty."""
+        assert load_allowlist() == []
+
+    def test_parsed_once_until_file_changes(self, allowlist_project: Path) -> None:
+        """The file is parsed again only after it changes."""
+        _write_allowlist([{"pattern": "test_*", "reason": "fixture", "added_by": "dev"}])
+        with patch("lib.vibe.secrets.allowlist.load_file", wraps=load_file) as mock_load:
+            for _ in range(3):
+                assert is_allowed_secret("test_key")[0] is True
+            assert mock_load.call_count == 1
+
+            _write_allowlist([{"pattern": "demo_*_long", "reason": "x", "added_by": "dev"}])
+            assert is_allowed_secret("test_key")[0] is False
+            assert mock_load.call_count == 2
+
+    def test_validate_reuses_loaded_parse(self, allowlist_project: Path) -> None:
+        """Validating after a load doesn't parse the file again."""
+        _write_allowlist([{"pattern": "test_*", "reason": "", "added_by": "dev"}])
+        with patch("lib.vibe.secrets.allowlist.load_file", wraps=load_file) as mock_load:
+            load_allowlist()
+            valid, issues = validate_allowlist()
+        assert mock_load.call_count == 1
+        assert valid is False
+        assert issues == ["Entry 0: missing 'reason'"]
+
+    def test_validate_reports_invalid_json(self, allowlist_project: Path) -> None:
+        path = allowlist_project / ".vibe" / "secrets.allowlist.json"
+        path.parent.mkdir()
+        path.write_text("{not json")
+        valid, issues = validate_allowlist()
+        assert valid is False
+        assert issues[0].startswith("Invalid JSON")
+
+    def test_config_read_once_for_repeated_checks(self, allowlist_project: Path) -> None:
+        """The allowlist path is resolved from config once until the config changes."""
+        _write_allowlist([{"pattern": "test_*", "reason": "fixture", "added_by": "dev"}])
+        with patch("lib.vibe.secrets.allowlist.load_config", return_value={}) as mock_config:
+            for _ in range(3):
+                assert is_allowed_secret("test_key")[0] is True
+        assert mock_config.call_count == 1
+
+    def test_custom_path_change_is_picked_up(self, allowlist_project: Path) -> None:
+        """Pointing the config at another allowlist takes effect on the next load."""
+        _write_allowlist([{"pattern": "test_*", "reason": "fixture", "added_by": "dev"}])
+        assert len(load_allowlist()) == 1
+
+        custom = allowlist_project / "custom.json"
+        custom.write_text(json.dumps({"entries": []}))
+        config = {"secrets": {"allowlist_path": str(custom)}}
+        (allowlist_project / ".vibe" / "config.json").write_text(json.dumps(config))
+        assert load_allowlist() == []
+
+    def test_same_size_replacement_in_one_mtime_tick_is_picked_up(
+        self, allowlist_project: Path
+    ) -> None:
+        """An atomic rewrite is seen even when it keeps the file's size and mtime."""
+        path = allowlist_project / ".vibe" / "secrets.allowlist.json"
+        atomic_write_json(
+            path,
+            {
+                "version": "1.0.0",
+                "entries": [{"pattern": "aaaa_*", "reason": "x", "added_by": "dev"}],
+            },
+        )
+        before = path.stat()
+        assert is_allowed_secret("aaaa_key")[0] is True
+
+        atomic_write_json(
+            path,
+            {
+                "version": "1.0.0",
+                "entries": [{"pattern": "bbbb_*", "reason": "x", "added_by": "dev"}],
+            },
+        )
+        os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+        assert path.stat().st_size == before.st_size
+
+        assert is_allowed_secret("aaaa_key")[0] is False
+        assert is_allowed_secret("bbbb_key")[0] is True
+
+    def test_config_replacement_in_one_mtime_tick_is_picked_up(
+        self, allowlist_project: Path
+    ) -> None:
+        """The resolved allowlist path follows a same-size, same-mtime config rewrite."""
+        for name in ("one.json", "two.json"):
+            (allowlist_project / name).write_text(json.dumps({"entries": []}))
+        config = allowlist_project / ".vibe" / "config.json"
+        atomic_write_json(config, {"version": 2, "secrets": {"allowlist_path": "one.json"}})
+        before = config.stat()
+        assert get_allowlist_path() == Path("one.json")
+
+        atomic_write_json(config, {"version": 2, "secrets": {"allowlist_path": "two.json"}})
+        os.utime(config, ns=(before.st_atime_ns, before.st_mtime_ns))
+        assert config.stat().st_size == before.st_size
+
+        assert get_allowlist_path() == Path("two.json")
+
+    def test_large_allowlist_is_memory_mapped(self, allowlist_project: Path) -> None:
+        """Files past the mmap threshold parse the same as small ones."""
+        _write_allowlist(
+            [{"pattern": f"fixture_{i}_*", "reason": "x", "added_by": "dev"} for i in range(200)]
+        )
+        assert (allowlist_project / ".vibe" / "secrets.allowlist.json").stat().st_size > 4096
+        with patch("lib.vibe.utils.fast_json.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+            entries = load_allowlist()
+        mock_mmap.assert_called_once()
+        assert len(entries) == 200
+        assert entries[-1].pattern == "fixture_199_*"
+
+    def test_large_allowlist_without_orjson(self, allowlist_project: Path) -> None:
+        """Without orjson the file is read normally."""
+        _write_allowlist(
+            [{"pattern": f"fixture_{i}_*", "reason": "x", "added_by": "dev"} for i in range(200)]
+        )
+        with (
+            patch("lib.vibe.utils.fast_json.orjson", None),
+            patch("lib.vibe.utils.fast_json.mmap.mmap") as mock_mmap,
+        ):
+            entries = load_allowlist()
+        mock_mmap.assert_not_called()
+        assert len(entries) == 200
+
+    def test_callers_get_their_own_list(self, allowlist_project: Path) -> None:
+        """Changing a returned list doesn't change the cached allowlist."""
+        _write_allowlist([{"pattern": "test_*", "reason": "fixture", "added_by": "dev"}])
+        load_allowlist().clear()
+        assert len(load_allowlist()) == 1
+
+    def test_add_is_seen_by_next_load(self, allowlist_project: Path) -> None:
+        """Entries added after a load show up in the next load."""
+        add_to_allowlist("first_*", "fixture", "dev")
+        load_allowlist()
+        add_to_allowlist("second_*", "fixture", "dev")
+        assert [e.pattern for e in load_allowlist()] == ["first_*", "second_*"]
+
+    def test_add_many_saves_once(self, allowlist_project: Path) -> None:
+        """A batch of entries costs one load and one write."""
+        add_to_allowlist("first_*", "fixture", "dev")
+        batch = [
+            AllowlistEntry(pattern=f"bulk_{i}_*", reason="r", added_by="dev") for i in range(5)
+        ]
+        with patch("lib.vibe.secrets.allowlist.save_allowlist", wraps=save_allowlist) as mock_save:
+            assert add_many_to_allowlist(iter(batch)) == batch
+        mock_save.assert_called_once()
+        assert [e.pattern for e in load_allowlist()] == ["first_*"] + [e.pattern for e in batch]
+
+    def test_add_many_empty_does_not_write(self, allowlist_project: Path) -> None:
+        assert add_many_to_allowlist([]) == []
+        assert not (allowlist_project / ".vibe" / "secrets.allowlist.json").exists()
+
+    def test_save_replaces_file_atomically(self, allowlist_project: Path) -> None:
+        """Saving writes a synced temp file and renames it over the allowlist."""
+        with (
+            patch("lib.vibe.utils.file_lock.os.fsync") as mock_fsync,
+            patch("lib.vibe.utils.file_lock.os.replace", wraps=os.replace) as mock_replace,
+        ):
+            add_to_allowlist("test_*", "fixture", "dev")
+        mock_fsync.assert_called_once()
+        mock_replace.assert_called_once()
+        vibe_dir = allowlist_project / ".vibe"
+        assert [p.name for p in vibe_dir.iterdir()] == ["secrets.allowlist.json"]
+
+
+class TestIsAllowedSecret:
+    """Tests for checking secrets against the allowlist."""
+
+    def test_hash_match(self, allowlist_project: Path) -> None:
+        """A secret added by value is allowed; others aren't."""
+        entry = add_to_allowlist("stripe test key", "fixture", "dev", secret_value="sk_test_1")
+        assert is_allowed_secret("sk_test_1") == (True, entry)
+        assert is_allowed_secret("sk_test_2") == (False, None)
+
+    def test_new_entries_use_blake2b(self, allowlist_project: Path) -> None:
+        """Secrets added by value are stored as BLAKE2b digests."""
+        entry = add_to_allowlist("key", "fixture", "dev", secret_value="s3cret")
+        assert entry.algo == "blake2b"
+        assert entry.hash == hashlib.blake2b(b"s3cret", digest_size=32).hexdigest()
+        data = json.loads(Path(".vibe/secrets.allowlist.json").read_text())
+        assert data["version"] == "1.1.0"
+        assert data["entries"][0]["algo"] == "blake2b"
+
+    def test_legacy_sha256_entries_still_match(self, allowlist_project: Path) -> None:
+        """Entries written without an algo are SHA-256 digests."""
+        digest = hashlib.sha256(b"old-secret").hexdigest()
+        _write_allowlist([{"pattern": "legacy", "hash": digest, "reason": "r", "added_by": "d"}])
+        allowed, entry = is_allowed_secret("old-secret")
+        assert allowed is True
+        assert entry is not None
+        assert entry.algo == "sha256"
+
+    def test_mixed_algorithms_match_non_ascii_secret(self, allowlist_project: Path) -> None:
+        """Both digests come from the same UTF-8 encoding of the secret."""
+        secret = "pässwörd-✓"
+        legacy = hashlib.sha256(secret.encode()).hexdigest()
+        _write_allowlist([{"pattern": "legacy", "hash": legacy, "reason": "r", "added_by": "d"}])
+        add_to_allowlist("new", "fixture", "dev", secret_value="other")
+        allowed, entry = is_allowed_secret(secret)
+        assert allowed is True
+        assert entry is not None and entry.pattern == "legacy"
+
+    def test_unsupported_algo_never_matches(self, allowlist_project: Path) -> None:
+        """Entries with an unknown algo are skipped and flagged by validation."""
+        _write_allowlist(
+            [{"pattern": "x", "hash": "abc", "algo": "md5", "reason": "r", "added_by": "d"}]
+        )
+        assert is_allowed_secret("anything") == (False, None)
+        valid, issues = validate_allowlist()
+        assert valid is False
+        assert issues == ["Entry 0: unsupported 'algo' 'md5'"]
+
+    def test_hash_match_ignores_file_path(self, allowlist_project: Path) -> None:
+        """Hash matches apply wherever the secret is found."""
+        add_to_allowlist("key", "fixture", "dev", file_path="a.py", secret_value="s3cret")
+        assert is_allowed_secret("s3cret", file_path="b.py")[0] is True
+
+    def test_pattern_respects_file_path(self, allowlist_project: Path) -> None:
+        """Pattern matches are limited to the entry's file."""
+        add_to_allowlist("test_*", "fixture", "dev", file_path="a.py")
+        assert is_allowed_secret("test_key", file_path="a.py")[0] is True
+        assert is_allowed_secret("test_key", file_path="b.py")[0] is False
+        assert is_allowed_secret("test_key")[0] is True
+
+    def test_pattern_skips_other_file_for_later_entry(self, allowlist_project: Path) -> None:
+        """An entry for another file doesn't hide a later match."""
+        add_to_allowlist("test_*", "first", "dev", file_path="a.py")
+        add_to_allowlist("*_key", "second", "dev")
+        allowed, entry = is_allowed_secret("test_key", file_path="b.py")
+        assert allowed is True
+        assert entry is not None and entry.reason == "second"
+
+    def test_unmatched_secret_skips_per_pattern_checks(self, allowlist_project: Path) -> None:
+        """A secret no pattern matches is rejected without per-entry fnmatch calls."""
+        for i in range(20):
+            add_to_allowlist(f"fixture_{i}_*", "fixture", "dev")
+        with patch("lib.vibe.secrets.allowlist.fnmatch.fnmatch") as mock_fnmatch:
+            assert is_allowed_secret("sk_live_real")[0] is False
+        mock_fnmatch.assert_not_called()
+        assert is_allowed_secret("fixture_7_x")[0] is True
+
+    def test_indexed_lookup(self, allowlist_project: Path) -> None:
+        """The index keeps the first entry per hash and patterned entries in order."""
+        _write_allowlist(
+            [
+                {"pattern": "", "hash": "abc", "reason": "r", "added_by": "d"},
+                {"pattern": "test_*", "hash": "abc", "reason": "r", "added_by": "d"},
+            ]
+        )
+        by_hash, with_pattern = load_allowlist_indexed()
+        assert by_hash["sha256"]["abc"].pattern == ""
+        assert [e.pattern for e in with_pattern] == ["test_*"]
+
+    def test_pattern_only_allowlist_never_hashes(self, allowlist_project: Path) -> None:
+        add_to_allowlist("test_*", "fixture", "dev")
+        with patch("lib.vibe.secrets.allowlist._hash_bytes") as mock_hash:
+            assert filter_allowed([("test_key", None), ("real", None)]) == [
+                (True, load_allowlist()[0]),
+                (False, None),
+            ]
+        mock_hash.assert_not_called()
+
+    def test_empty_allowlist_rejects_without_matching(self, allowlist_project: Path) -> None:
+        with patch("lib.vibe.secrets.allowlist._match_secret") as mock_match:
+            assert filter_allowed([("a", None), ("b", "x.py")]) == [(False, None), (False, None)]
+        mock_match.assert_not_called()
+
+    def test_filter_allowed_batch(self, allowlist_project: Path) -> None:
+        """A batch check loads the allowlist once and answers per candidate."""
+        hashed = add_to_allowlist("key", "fixture", "dev", secret_value="s3cret")
+        patterned = add_to_allowlist("test_*", "fixture", "dev", file_path="a.py")
+        with patch(
+            "lib.vibe.secrets.allowlist.get_allowlist_path",
+            wraps=lambda: Path(".vibe/secrets.allowlist.json"),
+        ) as mock_path:
+            results = filter_allowed(
+                [("s3cret", None), ("test_key", "a.py"), ("test_key", "b.py"), ("nope", None)]
+            )
+        mock_path.assert_called_once()
+        assert results == [(True, hashed), (True, patterned), (False, None), (False, None)]
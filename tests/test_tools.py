@@ -1,24 +1,44 @@
 """Tests for development tools detection and validation."""
 
+import dataclasses
+import os
+import subprocess
+import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from lib.vibe.tools import (
     TOOL_DEFINITIONS,
+    ToolDef,
     ToolInfo,
     ToolStatus,
+    _reset_tool_cache,
     check_auth,
     check_required_tools,
     check_tool,
     find_command,
+    get_default_branch,
     get_install_hint,
     get_platform,
     get_version,
     is_interactive,
+    print_tool_status,
     require_interactive,
     require_tool,
+    validate_github_owner,
+    validate_github_repo,
+    validate_linear_team_id,
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_tool_cache() -> None:
+    """Each test probes tools, the platform and git from scratch."""
+    _reset_tool_cache()
+
+
 class TestToolStatusEnum:
     """Tests for ToolStatus enum."""
 
@@ -72,6 +92,16 @@ class TestGetPlatform:
 class TestFindCommand:
     """Tests for find_command function."""
 
+    @pytest.fixture(autouse=True)
+    def bin_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """Point PATH at a directory holding python3, python and git."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        for name in ("python3", "python", "git"):
+            (bin_dir / name).touch(mode=0o755)
+        monkeypatch.setenv("PATH", str(bin_dir))
+        return bin_dir
+
     def test_find_command_first_available(self) -> None:
         with patch("lib.vibe.tools.shutil.which") as mock_which:
             mock_which.side_effect = lambda cmd: "/usr/bin/python3" if cmd == "python3" else None
@@ -89,6 +119,43 @@ class TestFindCommand:
             result = find_command(["nonexistent1", "nonexistent2"])
         assert result is None
 
+    def test_find_command_real_lookup(self, bin_dir: Path) -> None:
+        (bin_dir / "python3").chmod(0o644)
+        assert find_command(["python3", "python"]) == "python"
+
+    def test_find_command_lookups_cached(self) -> None:
+        """Each command is looked up on PATH once while PATH is unchanged."""
+        with patch("lib.vibe.tools.shutil.which", return_value="/usr/bin/git") as mock_which:
+            find_command(["git"])
+            find_command(["git"])
+        mock_which.assert_called_once_with("git")
+
+    def test_find_command_skips_names_not_on_path(self) -> None:
+        """Names absent from every PATH directory never reach shutil.which()."""
+        with patch("lib.vibe.tools.shutil.which") as mock_which:
+            assert find_command(["nonexistent1", "nonexistent2"]) is None
+        mock_which.assert_not_called()
+
+    def test_find_command_path_change_rechecks(
+        self, tmp_path: Path, bin_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        (other_dir / "fly").touch(mode=0o755)
+        assert find_command(["fly"]) is None
+
+        monkeypatch.setenv("PATH", os.pathsep.join([str(bin_dir), str(other_dir)]))
+        assert find_command(["fly"]) == "fly"
+
+    def test_find_command_empty_path_entry_not_prefiltered(
+        self, bin_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """An empty PATH entry means the current directory, so every name is checked."""
+        monkeypatch.setenv("PATH", os.pathsep.join(["", str(bin_dir)]))
+        with patch("lib.vibe.tools.shutil.which", return_value=None) as mock_which:
+            find_command(["nonexistent"])
+        mock_which.assert_called_once_with("nonexistent")
+
 
 class TestGetVersion:
     """Tests for get_version function."""
@@ -96,8 +163,8 @@ class TestGetVersion:
     def test_get_version_success(self) -> None:
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "git version 2.40.0\n"
-        mock_result.stderr = ""
+        mock_result.stdout = b"git version 2.40.0\n"
+        mock_result.stderr = b""
 
         with patch("lib.vibe.tools.subprocess.run", return_value=mock_result):
             version = get_version("git", "--version")
@@ -107,19 +174,31 @@ class TestGetVersion:
     def test_get_version_python(self) -> None:
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "Python 3.12.1\n"
-        mock_result.stderr = ""
+        mock_result.stdout = b"Python 3.12.1\n"
+        mock_result.stderr = b""
 
         with patch("lib.vibe.tools.subprocess.run", return_value=mock_result):
             version = get_version("python3", "--version")
 
         assert version == "3.12.1"
 
+    def test_get_version_closes_stdin(self) -> None:
+        """A tool waiting on stdin can't stall the probe until the timeout."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = b"Python 3.12.1\n"
+        mock_result.stderr = b""
+
+        with patch("lib.vibe.tools.subprocess.run", return_value=mock_result) as mock_run:
+            get_version("python3", "--version")
+
+        assert mock_run.call_args.kwargs["stdin"] is subprocess.DEVNULL
+
     def test_get_version_npm(self) -> None:
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "npm 10.2.0\n"
-        mock_result.stderr = ""
+        mock_result.stdout = b"npm 10.2.0\n"
+        mock_result.stderr = b""
 
         with patch("lib.vibe.tools.subprocess.run", return_value=mock_result):
             version = get_version("npm", "--version")
@@ -129,8 +208,8 @@ class TestGetVersion:
     def test_get_version_with_v_prefix(self) -> None:
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "v20.10.0\n"
-        mock_result.stderr = ""
+        mock_result.stdout = b"v20.10.0\n"
+        mock_result.stderr = b""
 
         with patch("lib.vibe.tools.subprocess.run", return_value=mock_result):
             version = get_version("node", "--version")
@@ -140,8 +219,8 @@ class TestGetVersion:
     def test_get_version_failure(self) -> None:
         mock_result = MagicMock()
         mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "error"
+        mock_result.stdout = b""
+        mock_result.stderr = b"error"
 
         with patch("lib.vibe.tools.subprocess.run", return_value=mock_result):
             version = get_version("nonexistent", "--version")
@@ -154,6 +233,29 @@ class TestGetVersion:
 
         assert version is None
 
+    def test_get_version_reads_stderr_first_line(self) -> None:
+        """Tools that print their version to stderr are handled too."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = b""
+        mock_result.stderr = b"v0.3.1 linux/amd64\nCommit: abc123\n"
+
+        with patch("lib.vibe.tools.subprocess.run", return_value=mock_result):
+            version = get_version("fly", "version")
+
+        assert version == "0.3.1"
+
+    def test_get_version_blank_first_line(self) -> None:
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = b"v \nmore\n"
+        mock_result.stderr = b""
+
+        with patch("lib.vibe.tools.subprocess.run", return_value=mock_result):
+            version = get_version("tool", "--version")
+
+        assert version is None
+
 
 class TestCheckAuth:
     """Tests for check_auth function."""
@@ -197,6 +299,34 @@ class TestCheckAuth:
 
         assert result is False
 
+    def test_check_auth_uses_resolved_command(self) -> None:
+        """A resolved command is run as-is instead of re-resolving auth_command[0]."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+
+        with (
+            patch("lib.vibe.tools.find_command") as mock_find,
+            patch("lib.vibe.tools.subprocess.run", return_value=mock_result) as mock_run,
+        ):
+            result = check_auth(["fly", "auth", "whoami"], "flyctl")
+
+        assert result is True
+        mock_find.assert_not_called()
+        assert mock_run.call_args[0][0] == ["flyctl", "auth", "whoami"]
+
+    def test_check_auth_discards_output(self) -> None:
+        """Auth probes never read stdin or capture output."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+
+        with patch("lib.vibe.tools.subprocess.run", return_value=mock_result) as mock_run:
+            check_auth(["gh", "auth", "status"], "gh")
+
+        kwargs = mock_run.call_args.kwargs
+        assert kwargs["stdin"] is subprocess.DEVNULL
+        assert kwargs["stdout"] is subprocess.DEVNULL
+        assert kwargs["stderr"] is subprocess.DEVNULL
+
 
 class TestCheckTool:
     """Tests for check_tool function."""
@@ -244,12 +374,84 @@ class TestCheckTool:
         assert info.status == ToolStatus.NOT_AUTHENTICATED
         assert "gh auth login" in info.message
 
+    def test_check_tool_passes_found_command_to_auth(self) -> None:
+        with (
+            patch("lib.vibe.tools.find_command", return_value="flyctl"),
+            patch("lib.vibe.tools.get_version", return_value="0.2.0"),
+            patch("lib.vibe.tools.check_auth", return_value=True) as mock_auth,
+        ):
+            check_tool("fly")
+
+        mock_auth.assert_called_once_with(("fly", "auth", "whoami"), "flyctl")
+
     def test_check_tool_unknown(self) -> None:
         info = check_tool("unknown_tool_xyz")
 
         assert info.status == ToolStatus.ERROR
         assert "Unknown tool" in info.message
 
+    def test_check_tool_memoized(self) -> None:
+        """Repeated checks of a tool reuse the first probe."""
+        with (
+            patch("lib.vibe.tools.find_command", return_value="npm") as mock_find,
+            patch("lib.vibe.tools.get_version", return_value="10.2.0") as mock_version,
+        ):
+            first = check_tool("npm")
+            second = check_tool("npm")
+
+        assert first is second
+        mock_find.assert_called_once()
+        mock_version.assert_called_once()
+
+
+class TestGetDefaultBranch:
+    """Tests for get_default_branch function."""
+
+    def test_remote_head(self) -> None:
+        mock_result = MagicMock(
+            returncode=0,
+            stdout=(
+                "refs/remotes/origin/HEAD refs/remotes/origin/develop\nrefs/remotes/origin/main \n"
+            ),
+        )
+        with patch("lib.vibe.tools.subprocess.run", return_value=mock_result) as mock_run:
+            assert get_default_branch() == "develop"
+        mock_run.assert_called_once()
+
+    def test_falls_back_to_main_then_master(self) -> None:
+        main_only = MagicMock(returncode=0, stdout="refs/remotes/origin/main \n")
+        with patch("lib.vibe.tools.subprocess.run", return_value=main_only):
+            assert get_default_branch() == "main"
+
+        _reset_tool_cache()
+        master_only = MagicMock(returncode=0, stdout="refs/remotes/origin/master \n")
+        with patch("lib.vibe.tools.subprocess.run", return_value=master_only):
+            assert get_default_branch() == "master"
+
+    def test_defaults_to_main(self) -> None:
+        """Outside a repository, or with no origin refs, the answer is main."""
+        for result in (MagicMock(returncode=128, stdout=""), MagicMock(returncode=0, stdout="")):
+            _reset_tool_cache()
+            with patch("lib.vibe.tools.subprocess.run", return_value=result):
+                assert get_default_branch() == "main"
+
+    def test_real_repository(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The for-each-ref output is parsed correctly against real git."""
+
+        def git(*args: str) -> None:
+            subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+        git("init", "-q")
+        git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "x")
+        git("update-ref", "refs/remotes/origin/main", "HEAD")
+        git("update-ref", "refs/remotes/origin/trunk", "HEAD")
+        monkeypatch.chdir(tmp_path)
+        assert get_default_branch() == "main"
+
+        git("symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/trunk")
+        _reset_tool_cache()
+        assert get_default_branch() == "trunk"
+
 
 class TestGetInstallHint:
     """Tests for get_install_hint function."""
@@ -317,6 +519,60 @@ class TestCheckRequiredTools:
         # npm is optional, so should still be ok
         assert all_ok is True
 
+    def test_check_required_tools_keeps_input_order(self) -> None:
+        """Tools are probed concurrently but reported in the order asked."""
+        delays = {"git": 0.05, "npm": 0.0, "gh": 0.02}
+
+        def slow_check(name: str) -> ToolInfo:
+            time.sleep(delays[name])
+            return ToolInfo(name, ToolStatus.INSTALLED)
+
+        with patch("lib.vibe.tools.check_tool", side_effect=slow_check):
+            all_ok, results = check_required_tools(["git", "npm", "gh"])
+
+        assert all_ok is True
+        assert [info.name for info in results] == ["git", "npm", "gh"]
+
+    def test_check_required_tools_empty(self) -> None:
+        assert check_required_tools([]) == (True, [])
+
+
+class TestPrintToolStatus:
+    """Tests for print_tool_status function."""
+
+    def test_prints_in_input_order(self, capsys: pytest.CaptureFixture[str]) -> None:
+        infos = {
+            "git": ToolInfo("git", ToolStatus.INSTALLED, "2.40.0"),
+            "gh": ToolInfo("gh", ToolStatus.NOT_AUTHENTICATED, "2.40.0", "Run: gh auth login"),
+            "npm": ToolInfo("npm", ToolStatus.NOT_INSTALLED, message="Install: brew install node"),
+        }
+        with patch("lib.vibe.tools.check_tool", side_effect=infos.__getitem__):
+            print_tool_status(["git", "gh", "npm"])
+
+        assert capsys.readouterr().out.splitlines() == [
+            "  \u2713 Version control: installed (2.40.0)",
+            "  \u26a0 GitHub CLI: not authenticated (2.40.0)",
+            "      \u2192 Run: gh auth login",
+            "  \u25cb Node.js package manager: not installed (optional)",
+            "      \u2192 Install: brew install node",
+        ]
+
+    def test_prints_remaining_statuses(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Authenticated, required-but-missing and unknown tools each get their line."""
+        infos = {
+            "vercel": ToolInfo("vercel", ToolStatus.AUTHENTICATED),
+            "git": ToolInfo("git", ToolStatus.NOT_INSTALLED),
+            "mystery": ToolInfo("mystery", ToolStatus.ERROR, message="Unknown tool: mystery"),
+        }
+        with patch("lib.vibe.tools.check_tool", side_effect=infos.__getitem__):
+            print_tool_status(["vercel", "git", "mystery"])
+
+        assert capsys.readouterr().out.splitlines() == [
+            "  \u2713 Vercel CLI: authenticated",
+            "  \u2717 Version control: not installed",
+            "  ? mystery: Unknown tool: mystery",
+        ]
+
 
 class TestRequireTool:
     """Tests for require_tool function."""
@@ -432,20 +688,60 @@ class TestRequireInteractive:
         assert "CI/headless" in error
 
 
+class TestInputValidation:
+    """Tests for the validate_* helpers."""
+
+    def test_github_owner(self) -> None:
+        assert validate_github_owner("my-org")[0] is True
+        assert validate_github_owner("-my-org")[0] is False
+        assert validate_github_owner("my-org-")[0] is False
+        assert validate_github_owner("a" * 40) == (False, "Owner must be 39 characters or less")
+
+    def test_github_repo(self) -> None:
+        assert validate_github_repo("vibe.code_boilerplate-2")[0] is True
+        assert validate_github_repo("bad/name")[0] is False
+        assert validate_github_repo(".hidden") == (False, "Repository name cannot start with a dot")
+
+    def test_linear_team_id(self) -> None:
+        assert validate_linear_team_id("")[0] is True
+        assert validate_linear_team_id("1A2B3C4D-0000-4000-8000-00000000ABCD")[0] is True
+        assert validate_linear_team_id("ENG")[0] is True
+        assert validate_linear_team_id("x" * 51)[0] is False
+        assert validate_linear_team_id("team id")[0] is False
+
+
 class TestToolDefinitions:
     """Tests for TOOL_DEFINITIONS structure."""
 
     def test_required_tools_have_install_instructions(self) -> None:
         for name, definition in TOOL_DEFINITIONS.items():
-            if definition.get("required", False):
-                assert "install" in definition, f"{name} missing install instructions"
+            if definition.required:
+                assert definition.install, f"{name} missing install instructions"
 
     def test_tools_with_auth_have_auth_hint(self) -> None:
         for name, definition in TOOL_DEFINITIONS.items():
-            if "auth_check" in definition:
-                assert "auth_hint" in definition, f"{name} has auth_check but no auth_hint"
+            if definition.auth_check:
+                assert definition.auth_hint, f"{name} has auth_check but no auth_hint"
 
     def test_all_tools_have_commands(self) -> None:
         for name, definition in TOOL_DEFINITIONS.items():
-            assert "commands" in definition, f"{name} missing commands"
-            assert len(definition["commands"]) > 0, f"{name} has empty commands"
+            assert len(definition.commands) > 0, f"{name} has empty commands"
+
+    def test_definitions_are_immutable(self) -> None:
+        definition = TOOL_DEFINITIONS["gh"]
+        assert isinstance(definition, ToolDef)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            definition.required = True
+
+    def test_definitions_table_is_read_only(self) -> None:
+        """Neither the table nor a tool's install hints can be changed in place."""
+        with pytest.raises(TypeError):
+            TOOL_DEFINITIONS["new"] = ToolDef(commands=("new",))
+        with pytest.raises(TypeError):
+            TOOL_DEFINITIONS["git"].install["macos"] = "other"
+
+    def test_install_hints_copied_from_caller(self) -> None:
+        install = {"all": "pip install thing"}
+        definition = ToolDef(commands=("thing",), install=install)
+        install["all"] = "changed"
+        assert definition.install["all"] == "pip install thing"